@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Benchmark: Cliche Matching Throughput as the Dictionary Grows
+
+Compares one 'in'/'replace' scan per phrase (the previous 'EtlReplaceCliches')
+with the compiled 'PhraseMatcher' on synthetic dictionaries of increasing size
+
+The phrases and texts are built from the same vocabulary, so some phrases do occur in the text
+
+Usage:
+    python drivers/cliche_matcher_benchmark.py
+    python drivers/cliche_matcher_benchmark.py 10000 /path/to/cliches.txt
+"""
+
+
+import time
+import random
+import string
+
+from openai_helper.dmo import PhraseMatcher
+
+SIZES = (10, 100, 1000, 10000)
+
+
+def vocabulary(size: int = 3000) -> list:
+    return [''.join(random.choice(string.ascii_lowercase)
+                    for _ in range(random.randint(2, 9)))
+            for _ in range(size)]
+
+
+def linear(phrases: list,
+           output_text: str) -> str:
+    for phrase in phrases:
+        if phrase in output_text:
+            output_text = output_text.replace(phrase, '')
+    return output_text
+
+
+def timed(func,
+          repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(phrases: list,
+        texts: list) -> None:
+
+    start = time.perf_counter()
+    matcher = PhraseMatcher(phrases)
+    build_time = time.perf_counter() - start
+
+    total_chars = sum(len(x) for x in texts)
+    linear_time = timed(lambda: [linear(phrases, x) for x in texts],
+                        max(1, 2000 // len(phrases)))
+    matcher_time = timed(lambda: [matcher.process(x) for x in texts], 20)
+
+    print(f'{len(phrases):>6} phrases   '
+          f'build {build_time:>6.2f}s   '
+          f'linear {total_chars / linear_time / 1e6:>7.2f} MB/s   '
+          f'matcher {total_chars / matcher_time / 1e6:>6.2f} MB/s   '
+          f'({linear_time / matcher_time:.1f}x)')
+
+
+def main(max_size: int = 10000,
+         *file_paths):
+    random.seed(42)
+
+    words = vocabulary()
+    texts = [' '.join(random.choice(words) for _ in range(300))
+             for _ in range(10)]
+
+    for size in [x for x in SIZES if x <= int(max_size)]:
+        phrases = [' '.join(random.choice(words) for _ in range(random.randint(3, 8)))
+                   for _ in range(size)]
+        # plant a few phrases so every matcher has work to do
+        run(phrases, [f'{random.choice(phrases)} {x}' for x in texts])
+
+    if file_paths:
+        print('dictionary files:')
+        run(PhraseMatcher.load(file_paths), texts)
+
+
+if __name__ == '__main__':
+    import plac
+
+    plac.call(main)
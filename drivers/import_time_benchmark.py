@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Benchmark: Cold Import Time of each Entry Point
+
+Each statement runs in a fresh interpreter; the interpreter start-up alone is subtracted
+
+Usage:
+    python drivers/import_time_benchmark.py
+    python drivers/import_time_benchmark.py 20
+"""
+
+
+import sys
+import time
+import subprocess
+
+STATEMENTS = [
+    'import openai_helper',
+    'from openai_helper import num_of_tokens',
+    'from openai_helper import InputTokenCounter',
+    'from openai_helper import OutputExtractorChat',
+    'from openai_helper import OpenAIChatCompletion',
+    'import openai_helper; openai_helper.registry.chat_completion()',
+]
+
+
+def cold_start(statement: str,
+               runs: int) -> float:
+    """ The median wall time of a fresh interpreter running the statement """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', statement])
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main(runs: int = 10):
+    runs = int(runs)
+
+    baseline = cold_start('pass', runs)
+    print(f'{"interpreter start-up":<64} {baseline * 1000:>8.1f} ms')
+
+    for statement in STATEMENTS:
+        elapsed = cold_start(statement, runs) - baseline
+        print(f'{statement:<64} {elapsed * 1000:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    import plac
+
+    plac.call(main)
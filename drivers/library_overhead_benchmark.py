@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Benchmark: Library Overhead per Call against a Synthetic Connection
+
+No network calls are made; every response comes from 'synthetic-connection'
+Token counting still needs the tiktoken encodings (downloaded on first use)
+
+Usage:
+    python drivers/library_overhead_benchmark.py
+    python drivers/library_overhead_benchmark.py 5000 256
+"""
+
+
+import os
+import time
+
+from openai_helper.dmo import SyntheticConnection
+from openai_helper.dmo import CompletionEventExtractor
+from openai_helper.dmo import ChatMessageFormatter
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import OutputExtractorChat
+from openai_helper.dmo import OutputExtractorText
+from openai_helper.bp import OpenAIChatCompletion
+from openai_helper.bp import OpenAITextCompletion
+
+INPUT_PROMPT = 'You are a helpful assistant.'
+MESSAGES = [
+    'Who won the world series in 2020?',
+    'The Los Angeles Dodgers won the World Series in 2020.',
+    'Where was it played?'
+]
+
+
+def measure(name: str,
+            fn,
+            iterations: int) -> None:
+    fn()  # warm any lazy state first
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:<32} {elapsed / iterations * 1e6:>10.1f} us/call')
+
+
+def main(iterations: int = 2000,
+         completion_tokens: int = 64):
+
+    iterations = int(iterations)
+    os.environ['USE_OPENAI'] = 'true'
+
+    conn = SyntheticConnection(completion_tokens=int(completion_tokens))
+
+    chat_result = OpenAIChatCompletion(conn=conn).run(
+        input_prompt=INPUT_PROMPT, messages=MESSAGES)
+    text_result = OpenAITextCompletion(conn=conn).run(
+        input_prompt=MESSAGES[-1])
+
+    extract_event = CompletionEventExtractor().process
+    format_messages = ChatMessageFormatter().process
+    count_tokens = InputTokenCounter().process
+    extract_chat = OutputExtractorChat().process
+    extract_text = OutputExtractorText().process
+    run_chat = OpenAIChatCompletion(conn=conn).run
+    run_text = OpenAITextCompletion(conn=conn).run
+
+    print(f'Iterations: {iterations}; Completion Tokens: {completion_tokens}')
+
+    measure('completion-event-extractor',
+            lambda: extract_event(input_prompt=MESSAGES[-1]), iterations)
+    measure('chat-message-formatter',
+            lambda: format_messages(input_prompt=INPUT_PROMPT, messages=MESSAGES), iterations)
+    measure('input-token-counter',
+            lambda: count_tokens(messages=MESSAGES), iterations)
+    measure('output-extractor-chat',
+            lambda: extract_chat(input_text=MESSAGES[-1], d_result=chat_result), iterations)
+    measure('output-extractor-text',
+            lambda: extract_text(input_text=MESSAGES[-1], d_result=text_result), iterations)
+    measure('openai-chat-completion (run)',
+            lambda: run_chat(input_prompt=INPUT_PROMPT, messages=MESSAGES), iterations)
+    measure('openai-text-completion (run)',
+            lambda: run_text(input_prompt=MESSAGES[-1]), iterations)
+
+
+if __name__ == '__main__':
+    import plac
+
+    plac.call(main)
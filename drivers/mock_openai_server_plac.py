@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Plac/Terminal: Run the Mock OpenAI Server
+
+Usage:
+    python drivers/mock_openai_server_plac.py 8080 lognormal 0.4 0.2 50 0.05 0.01
+
+Then point a load test at it:
+    export OPENAI_API_BASE=http://127.0.0.1:8080/v1
+"""
+
+
+import asyncio
+
+from openai_helper.dmo import MockOpenAIServer
+
+
+def main(port: int = 8080,
+         latency_distribution: str = 'constant',
+         latency_mean: float = 0.0,
+         latency_stdev: float = 0.0,
+         tokens_per_second: float = 0.0,
+         rate_429: float = 0.0,
+         rate_503: float = 0.0):
+
+    server = MockOpenAIServer(
+        latency_distribution=latency_distribution,
+        latency_mean=float(latency_mean),
+        latency_stdev=float(latency_stdev),
+        tokens_per_second=float(tokens_per_second),
+        rate_429=float(rate_429),
+        rate_503=float(rate_503))
+
+    async def serve():
+        print(f'Serving on {await server.astart(port=int(port))}')
+        while True:
+            await asyncio.sleep(60)
+            print(server.stats())
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    import plac
+
+    plac.call(main)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Benchmark: Approximate vs Exact Token Counting (Speed and Accuracy)
+
+Samples text chunks of several sizes from every text file under a corpus directory
+adds synthetic text the corpus lacks (digits, whitespace runs, base64, URLs, Cyrillic, CJK and emoji)
+and compares 'TokenEstimator' with tiktoken for each calibrated encoding
+
+Pass 'calibrate' to refit the weights and error bounds on this corpus;
+paste the printed values into 'CALIBRATION' in 'openai_helper/dmo/token_estimator.py'
+
+Usage:
+    python drivers/token_estimator_benchmark.py
+    python drivers/token_estimator_benchmark.py /path/to/corpus calibrate
+"""
+
+
+import os
+import time
+import base64
+import random
+import string
+import sysconfig
+
+import tiktoken
+
+from openai_helper.dmo import TokenEstimator
+
+EXTENSIONS = ('.txt', '.md', '.rst', '.py', '.json')
+CHUNK_SIZES = (50, 200, 1000, 4000, 12000)
+
+CYRILLIC = ' '.join([
+    'Машинное обучение является подразделом искусственного интеллекта, который изучает методы',
+    'построения алгоритмов, способных обучаться на данных. Москва — столица России.'])
+CJK = '机器学习是人工智能的一个分支。它研究如何让计算机从数据中学习规律，并利用规律对未知数据进行预测。北京是首都。'
+EMOJI = ''.join(chr(x) for x in range(0x1F300, 0x1F650)) + '❤️✨☀️⚡'
+ACCENTED = ('café', 'naïve', 'São Paulo', 'Zürich', 'über', 'façade', 'piñata', 'Ελλάδα', 'שלום', 'مرحبا')
+
+
+def load_samples(corpus_dir: str,
+                 max_files: int = 600,
+                 per_file: int = 6) -> list:
+    random.seed(42)
+
+    file_paths = []
+    for root, _, file_names in os.walk(corpus_dir):
+        file_paths += [os.path.join(root, x) for x in file_names
+                       if x.endswith(EXTENSIONS)]
+
+    random.shuffle(file_paths)
+
+    samples = []
+    for file_path in file_paths[:max_files]:
+        with open(file_path, encoding='utf-8', errors='ignore') as f:
+            text = f.read()
+        if len(text) < 200:
+            continue
+        for _ in range(per_file):
+            size = random.choice(CHUNK_SIZES)
+            start = random.randrange(0, max(1, len(text) - size))
+            samples.append(text[start:start + size])
+
+    return samples
+
+
+def synthetic_samples(per_kind: int = 60) -> list:
+    """ Text unlike prose or code, each kind alone and in pairs, at lengths from a few to a few thousand tokens """
+    rnd = random.Random(7)
+
+    def chars(alphabet: str, n: int) -> str:
+        return ''.join(rnd.choice(alphabet) for _ in range(n))
+
+    def code(_) -> str:
+        name = chars(string.ascii_lowercase, rnd.randint(1, 4))
+        return rnd.choice([
+            f'def {name}({name[0]}: int) -> int:\n',
+            f'{" " * rnd.choice([4, 8, 12])}if {name} < {rnd.randint(0, 99)}:\n',
+            f'{" " * rnd.choice([4, 8, 12])}return {name}({name[0]} - 1) + {name}[{rnd.randint(0, 9)}]\n',
+            f'{name} = {{{name[0]}: {name}({name[0]}) for {name[0]} in range({rnd.randint(1, 99)})}}\n',
+            f'for (int {name[0]} = 0; {name[0]} < {name}.length; {name[0]}++) {{ {name}[{name[0]}] *= 2; }}\n',
+        ])
+
+    def url(_) -> str:
+        return (f'https://{rnd.choice(["example.com", "api.github.com", "en.wikipedia.org"])}'
+                f'/{chars("0123456789abcdef", rnd.randint(2, 10))}/{chars(string.ascii_letters, rnd.randint(3, 9))}'
+                f'?id={chars(string.digits, rnd.randint(1, 8))}&q={rnd.choice(["foo", "bar%20baz", "%E2%9C%93"])}')
+
+    kinds = [
+        (lambda n: chars(string.digits, n), 3000),
+        (lambda n: ' '.join(chars(string.digits, rnd.randint(1, 12)) for _ in range(n)), 500),
+        (lambda n: ''.join(rnd.choice([' ' * rnd.randint(1, 80), '\n' * rnd.randint(1, 5), '\t' * rnd.randint(1, 8)])
+                           for _ in range(n)), 100),
+        (lambda n: base64.b64encode(bytes(rnd.getrandbits(8) for _ in range(n))).decode(), 3000),
+        (lambda n: chars('0123456789abcdef', n), 4000),
+        (lambda n: ''.join(code(x) for x in range(n)), 300),
+        (lambda n: ' '.join(url(x) for x in range(n)), 60),
+        (lambda n: ' '.join(rnd.choice(CYRILLIC.split()) for _ in range(n)), 800),
+        (lambda n: chars('абвгдеёжзийклмнопрстуфхцчшщъыьэюя ', n), 3000),
+        (lambda n: chars(CJK, n), 2000),
+        (lambda n: chars(EMOJI, n), 800),
+        (lambda n: ' '.join(chars(EMOJI, rnd.randint(1, 3)) + ' ' + rnd.choice(['great', 'job', 'thanks', 'launch', 'Party'])
+                            for _ in range(n)), 300),
+        (lambda n: ' '.join(rnd.choice(ACCENTED) for _ in range(n)), 600),
+        (lambda n: chars(string.ascii_letters, n), 3000),
+        (lambda n: ''.join(rnd.choice(['=' * rnd.randint(1, 40), '-' * rnd.randint(1, 40), rnd.choice(string.punctuation)])
+                           for _ in range(n)), 300),
+    ]
+
+    samples = []
+    for kind, longest in kinds:
+        for _ in range(per_kind):
+            samples.append(kind(max(1, int(longest ** rnd.random()))))
+
+    for _ in range(per_kind * 5):
+        (a, a_longest), (b, b_longest) = rnd.sample(kinds, 2)
+        samples.append(' '.join([a(max(1, int(a_longest * rnd.random() / 5))),
+                                 b(max(1, int(b_longest * rnd.random() / 5)))]))
+
+    return samples
+
+
+def percentile(values: list,
+               q: float) -> float:
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+
+def fit(features: list,
+        targets: list) -> list:
+    """ Weighted least squares (weights 1/y^2, i.e. minimize relative error) via the normal equations """
+    k = len(features[0])
+    a = [[0.0] * k for _ in range(k)]
+    b = [0.0] * k
+
+    for x, y in zip(features, targets):
+        w = 1 / max(y, 1) ** 2
+        for i in range(k):
+            b[i] += w * x[i] * y
+            for j in range(k):
+                a[i][j] += w * x[i] * x[j]
+
+    m = [row + [b[i]] for i, row in enumerate(a)]
+    for c in range(k):
+        pivot = max(range(c, k), key=lambda r: abs(m[r][c]))
+        m[c], m[pivot] = m[pivot], m[c]
+        for r in range(k):
+            if r != c:
+                f = m[r][c] / m[c][c]
+                m[r] = [x - f * y for x, y in zip(m[r], m[c])]
+
+    return [m[i][k] / m[i][i] for i in range(k)]
+
+
+def fit_errors(features: list,
+               residuals: list,
+               targets: list,
+               penalty: float = 200.0,
+               sweeps: int = 30) -> list:
+    """ Per-Class Error Terms: the narrowest (relative) error that covers almost every residual
+
+    Coordinate descent on sum(error / y) + penalty * sum(max(0, |residual| - error) / y)
+    where error = sum(errors * features) and every error term is >= 0
+    each coordinate is minimized exactly (the objective is piecewise linear in it)
+    """
+    k = len(features[0])
+    errors = [0.0] * k
+
+    for _ in range(sweeps):
+        for j in range(k):
+            width = 0.0
+            points = []
+            for x, r, y in zip(features, residuals, targets):
+                if not x[j]:
+                    continue
+                y = max(y, 1)
+                width += x[j] / y
+                rest = sum(a * b for a, b in zip(x, errors)) - x[j] * errors[j]
+                points.append(((r - rest) / x[j], penalty * x[j] / y))
+
+            # the slope at t is: width - the penalty of every residual still above t
+            points.sort()
+            above = sum(p for t, p in points if t > 0)
+            errors[j] = 0.0
+            for t, p in points:
+                if t <= 0:
+                    continue
+                if width >= above:
+                    break
+                errors[j] = t
+                above -= p
+
+    return errors
+
+
+def calibrate(encoding_name: str,
+              samples: list) -> None:
+    encoding = tiktoken.get_encoding(encoding_name)
+    features = [TokenEstimator.features(x) for x in samples]
+    targets = [len(encoding.encode_ordinary(x)) for x in samples]
+
+    def residuals(weights: list, indices: list) -> list:
+        return [abs(max(0.0, sum(x * w for x, w in zip(features[i], weights))) - targets[i])
+                for i in indices]
+
+    # fit on 70%, measure the error coverage on the held-out 30%
+    indices = list(range(len(samples)))
+    random.shuffle(indices)
+    split = len(indices) * 7 // 10
+    train, test = indices[:split], indices[split:]
+
+    weights = fit([features[i] for i in train], [targets[i] for i in train])
+    errors = fit_errors([features[i] for i in train], residuals(weights, train), [targets[i] for i in train])
+    covered = sum(1 for i, r in zip(test, residuals(weights, test))
+                  if r <= sum(x * e for x, e in zip(features[i], errors)))
+
+    # then refit on all samples
+    weights = fit(features, targets)
+    errors = fit_errors(features, residuals(weights, range(len(samples))), targets)
+
+    print(f'{encoding_name}: weights = {tuple(round(x, 4) for x in weights)}, '
+          f'errors = {tuple(round(x, 4) for x in errors)}, '
+          f'held-out coverage = {covered / len(test):.1%}')
+
+
+def compare(encoding_name: str,
+            samples: list) -> None:
+    encoding = tiktoken.get_encoding(encoding_name)
+
+    start = time.perf_counter()
+    exact = [len(encoding.encode_ordinary(x)) for x in samples]
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approx = [TokenEstimator.estimate(x, encoding_name) for x in samples]
+    approx_time = time.perf_counter() - start
+
+    errors = [abs(x - y) / max(y, 1) for x, y in zip(approx, exact)]
+    covered = sum(1 for x, y, z in zip(approx, exact, samples)
+                  if abs(x - y) <= TokenEstimator.error(z, encoding_name))
+
+    print(f'{encoding_name} ({len(samples)} samples)')
+    print(f'\texact:  {exact_time / len(samples) * 1e6:>8.1f} us/text')
+    print(f'\tapprox: {approx_time / len(samples) * 1e6:>8.1f} us/text '
+          f'({exact_time / approx_time:.1f}x faster)')
+    print(f'\tmean relative error: {sum(errors) / len(errors):.1%}; '
+          f'p95 (>= 100 tokens): {percentile([e for e, y in zip(errors, exact) if y >= 100], 0.95):.1%}')
+    print(f'\twithin reported error: {covered / len(samples):.1%}')
+
+
+def main(corpus_dir: str = None,
+         mode: str = 'compare'):
+
+    if not corpus_dir:
+        corpus_dir = sysconfig.get_paths()['stdlib']
+
+    samples = load_samples(corpus_dir) + synthetic_samples()
+
+    for encoding_name in ('cl100k_base', 'p50k_base'):
+        if mode == 'calibrate':
+            calibrate(encoding_name, samples)
+        else:
+            compare(encoding_name, samples)
+
+
+if __name__ == '__main__':
+    import plac
+
+    plac.call(main)
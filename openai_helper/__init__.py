@@ -1,25 +1,87 @@
+""" OpenAI Helper for Easy I/O
+
+Importing this package is cheap
+the subpackages, their dependencies (openai, tiktoken, baseblock)
+and the shared objects ('registry', 'token_counter', 'token_estimator')
+are only imported or created on first use (see '__getattr__')
+"""
+
+
+from typing import Any
 from typing import List
+from typing import Tuple
 from typing import Union
 from typing import Optional
-from baseblock import EnvIO
-from baseblock import Enforcer
-from .bp import *
-from .svc.extract_primary_topic import ExtractPrimaryTopic
-from .svc import *
-from .dmo import *
-from .bp.openai_text_completion import OpenAITextCompletion
-from .bp.openai_chat_completion import OpenAIChatCompletion
-from .dmo import OutputExtractorText
-from .dmo import OutputExtractorChat
-from .dmo import InputTokenCounter
+from typing import Callable
+from typing import Generator
+from typing import AsyncIterator
+from threading import Lock
+from importlib import import_module
+import json
 import logging
 logger = logging.getLogger(__name__)
 
-token_counter = InputTokenCounter().process
+# every public name of these subpackages is also available here
+# (on a name clash the last subpackage wins)
+_subpackages = ('bp', 'svc', 'dmo')
+
+# shared by every call; use 'registry.reset()' after rotating credentials
+_d_shared_factories = {
+    'registry': lambda: import_module('.bp.client_registry', __name__).ClientRegistry(),
+    'token_counter': lambda: import_module('.dmo.input_token_counter', __name__).InputTokenCounter().process,
+    'token_estimator': lambda: import_module('.dmo.token_estimator', __name__).TokenEstimator().process,
+}
+
+_lock = Lock()
+
+
+def _shared(name: str) -> Any:
+    """ A shared Object, created on first use """
+    if name not in globals():
+        with _lock:
+            if name not in globals():
+                globals()[name] = _d_shared_factories[name]()
+    return globals()[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _d_shared_factories:
+        return _shared(name)
+
+    if name in _subpackages:
+        return import_module(f'.{name}', __name__)
+
+    for subpackage in reversed(_subpackages):
+        module = import_module(f'.{subpackage}', __name__)
+        if name in module.__all__:
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _public_names() -> List[str]:
+    """ The names 'from openai_helper import *' exports (importing a subpackage itself is cheap) """
+    names = [
+        'num_of_tokens', 'warmup',
+        'chat', 'achat', 'chat_stream', 'achat_stream', 'chat_many',
+        'call2', 'acall2', 'call2_many',
+    ]
+    names += list(_d_shared_factories)
+    for subpackage in _subpackages:
+        names += [x for x in import_module(f'.{subpackage}', __name__).__all__
+                  if x not in names]
+    return names
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_subpackages))
 
 
 def num_of_tokens(messages: List[str] or str,
-                  model: str = 'gpt-3.5-turbo-0301') -> int:
+                  model: str = 'gpt-3.5-turbo-0301',
+                  mode: str = 'exact') -> int:
     """ Count the Number of Tokens in an Input String
 
     Counting tokens is not the same as "tokenizing a string" and counting the result
@@ -33,11 +95,129 @@ def num_of_tokens(messages: List[str] or str,
         model (str, optional): the model to use for counting tokens. Defaults to "gpt-3.5-turbo-0301".
             token counting varies between models
             however, if you don't know your OpenAI model just leave this value at the default
+        mode (str, optional): 'exact' (tiktoken) or 'approx' (byte statistics). Defaults to 'exact'.
+            'approx' is many times faster and needs no tokenizer, but is only accurate to ~25%
+            use 'TokenEstimator' directly for the expected error of an estimate
 
     Returns:
         int: the total tokens
     """
-    return token_counter(messages=messages, model=model)
+    if mode == 'approx':
+        return _shared('token_estimator')(messages=messages, model=model)['tokens']
+    if mode != 'exact':
+        raise ValueError(f'Unknown Token Counting Mode: {mode}')
+
+    return _shared('token_counter')(messages=messages, model=model)
+
+
+def warmup(models: Optional[List[str]] = None,
+           prewarm: bool = False) -> None:
+    """ Preload Token Encodings and the shared Clients before serving
+
+    Call once at startup (or in the parent process before forking workers)
+    so that no request waits on an encoding download or client construction
+
+    Args:
+        models (List[str], optional): the models to load token encodings for. Defaults to None.
+        prewarm (bool, optional): also open pooled connections; not before forking. Defaults to False.
+    """
+    _shared('registry').warmup(models=models, prewarm=prewarm)
+
+
+def _near_duplicate_namespace(input_prompt: str,
+                              messages: List[str],
+                              remove_emojis: bool,
+                              model: Optional[str]) -> str:
+    """ Everything but the last message must match exactly before a near-duplicate answer is served """
+    return json.dumps([model, input_prompt, remove_emojis, messages[:-1]])
+
+
+def _chat_preflight(input_prompt: str,
+                    messages: Optional[Union[List[str], str]],
+                    remove_emojis: bool,
+                    model: Optional[str],
+                    near_duplicates: bool = True) -> Optional[Tuple[List[str], Optional[str], Callable]]:
+    """ The Pre-Flight shared by every Chat Entry Point
+
+    Args:
+        near_duplicates (bool, optional): consult the near-duplicate cache (if configured). Defaults to True.
+            a stream is never assembled by 'output-extractor-chat', so it neither reads nor feeds this cache
+
+    Returns:
+        Optional[Tuple[List[str], Optional[str], Callable]]: None if 'USE_OPENAI' is not set; otherwise
+            the messages (as a list), a near-duplicate answer (if one is cached),
+            and a callback that remembers a fresh answer for near-duplicates of this call
+    """
+    from baseblock import EnvIO
+    from baseblock import Enforcer
+
+    if not EnvIO.exists_as_true('USE_OPENAI'):
+        return None
+
+    if messages is None:
+        messages = ['']
+    elif type(messages) == str:
+        messages = [messages]
+
+    if logger.isEnabledFor(logging.DEBUG):
+        Enforcer.is_list_of_str(messages)
+
+    cache = _shared('registry').near_duplicate_cache() if near_duplicates else None
+    if not cache:
+        return messages, None, lambda result: None
+
+    namespace = _near_duplicate_namespace(
+        input_prompt, messages, remove_emojis, model)
+
+    def remember(result: Optional[str]) -> None:
+        if result:
+            cache.put(namespace, messages[-1], result)
+
+    return messages, cache.get(namespace, messages[-1]), remember
+
+
+def _chat(input_prompt: str,
+          messages: Optional[Union[List[str], str]],
+          remove_emojis: bool,
+          model: Optional[str]) -> Optional[str]:
+    """ Call OpenAI Chat Completion and allow errors to propagate """
+
+    preflight = _chat_preflight(input_prompt, messages, remove_emojis, model)
+    if not preflight:
+        return None
+
+    messages, result, remember = preflight
+    if result:
+        return result
+
+    registry = _shared('registry')
+
+    bp = registry.chat_completion()
+
+    d_result = bp.run(
+        model=model,
+        messages=messages,
+        input_prompt=input_prompt,
+    )
+
+    if not d_result or not d_result['output']:
+        return None
+
+    result = registry.output_extractor_chat().process(
+        input_text=input_prompt,
+        d_result=d_result,
+        remove_emojis=remove_emojis)
+
+    remember(result)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logging.getLogger(__name__).debug('\n'.join([
+            'OpenAI Call Completed',
+            f'\tInput Prompt: {input_prompt}',
+            f'\tMessages: {messages}',
+            f'\tResult: {result}']))
+
+    return result
 
 
 def chat(input_prompt: str,
@@ -90,20 +270,208 @@ def chat(input_prompt: str,
     """
     try:
 
-        if not EnvIO.exists_as_true('USE_OPENAI'):
+        return _chat(input_prompt=input_prompt,
+                     messages=messages,
+                     remove_emojis=remove_emojis,
+                     model=model)
+
+    except Exception as e:
+        print(e)
+
+
+def _call2(input_prompt: str,
+           remove_emojis: Optional[bool],
+           engine: Optional[str],
+           temperature: Optional[float]) -> Optional[str]:
+    """ Call OpenAI and allow errors to propagate """
+
+    registry = _shared('registry')
+
+    bp = registry.text_completion()
+
+    d_result = bp.run(
+        input_prompt=input_prompt,
+        engine=engine,
+        temperature=temperature)
+
+    result = registry.output_extractor_text().process(
+        input_text=input_prompt,
+        d_result=d_result,
+        remove_emojis=remove_emojis)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('\n'.join([
+            'OpenAI Call Completed',
+            f'\tInput Prompt: {input_prompt}',
+            f'\tEngine: {engine}',
+            f'\tTemperature: {temperature}',
+            f'\tResult: {result}']))
+
+    return result
+
+
+def call2(input_prompt: str,
+          remove_emojis: Optional[bool] = True,
+          engine: Optional[str] = 'text-davinci-003',
+          temperature: Optional[float] = 1.0) -> Optional[str]:
+    """ Call OpenAI
+
+    Not a very creative function name, but basically 'full-auto' call
+
+    Args:
+        input_prompt (str): a defined input prompt
+        remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
+            Reference:
+                https://github.com/craigtrim/openai-helper/issues/8
+        engine (str, optional): the LLM engine. Defaults to 'text-davinci-003'.
+        temperature (float, optional): the temperature. Defaults to 1.0.
+
+    Returns:
+        Optional[str]: the result (if any)
+    """
+
+    try:
+
+        return _call2(input_prompt=input_prompt,
+                      remove_emojis=remove_emojis,
+                      engine=engine,
+                      temperature=temperature)
+
+    except Exception:
+        pass
+
+
+def _batch_items(requests: List[Union[str, dict]],
+                 key: str,
+                 defaults: dict) -> List[dict]:
+    items = []
+    for request in requests:
+        if type(request) == str:
+            request = {key: request}
+        items.append({**defaults, **request})
+    return items
+
+
+def chat_many(requests: List[dict],
+              max_concurrency: int = 8,
+              progress: Optional[Union[Callable, bool]] = None,
+              remove_emojis: bool = True,
+              model: Optional[str] = 'gpt-3.5-turbo') -> List[dict]:
+    """ Call OpenAI Chat Completion for a Batch of Requests
+
+    Args:
+        requests (List[dict]): the requests to run
+            each request holds the keyword arguments for a single 'chat' call
+
+            Sample Request:
+                {
+                    "input_prompt": "You are a helpful assistant.",
+                    "messages": ["Who won the world series in 2020?"]
+                }
+
+            values given in a request take precedence over the batch-level 'remove_emojis' and 'model'
+        max_concurrency (int, optional): the maximum number of calls in flight. Defaults to 8.
+            with 'OPENAI_ADAPTIVE_CONCURRENCY' enabled this is the ceiling
+            and the shared adaptive limiter decides how many calls are actually in flight
+        progress (Optional[Union[Callable, bool]], optional): progress reporting. Defaults to None.
+            a callable is invoked as progress(completed, total) after each request finishes
+            True will display a tqdm progress bar
+        remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
+        model (str, optional): The model name to use.  Defaults to 'gpt-3.5-turbo'
+
+    Returns:
+        List[dict]: one result per request (in input order) with three keys:
+            input: the request
+            output: the result (if any)
+            error: the exception raised by the request (if any)
+    """
+    items = _batch_items(requests, 'input_prompt', {
+        'messages': None,
+        'remove_emojis': remove_emojis,
+        'model': model})
+
+    from .dmo import BatchExecutor
+
+    return BatchExecutor(max_concurrency).process(
+        function=_chat,
+        items=items,
+        progress=progress)
+
+
+def call2_many(requests: List[Union[str, dict]],
+               max_concurrency: int = 8,
+               progress: Optional[Union[Callable, bool]] = None,
+               remove_emojis: Optional[bool] = True,
+               engine: Optional[str] = 'text-davinci-003',
+               temperature: Optional[float] = 1.0) -> List[dict]:
+    """ Call OpenAI for a Batch of Requests
+
+    Args:
+        requests (List[Union[str, dict]]): the requests to run
+            each request is either an input prompt
+            or the keyword arguments for a single 'call2' call
+        max_concurrency (int, optional): the maximum number of calls in flight. Defaults to 8.
+            with 'OPENAI_ADAPTIVE_CONCURRENCY' enabled this is the ceiling
+            and the shared adaptive limiter decides how many calls are actually in flight
+        progress (Optional[Union[Callable, bool]], optional): progress reporting. Defaults to None.
+            a callable is invoked as progress(completed, total) after each request finishes
+            True will display a tqdm progress bar
+        remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
+        engine (str, optional): the LLM engine. Defaults to 'text-davinci-003'.
+        temperature (float, optional): the temperature. Defaults to 1.0.
+
+    Returns:
+        List[dict]: one result per request (in input order) with three keys:
+            input: the request
+            output: the result (if any)
+            error: the exception raised by the request (if any)
+    """
+    items = _batch_items(requests, 'input_prompt', {
+        'remove_emojis': remove_emojis,
+        'engine': engine,
+        'temperature': temperature})
+
+    from .dmo import BatchExecutor
+
+    return BatchExecutor(max_concurrency).process(
+        function=_call2,
+        items=items,
+        progress=progress)
+
+
+async def achat(input_prompt: str,
+                messages: Optional[Union[List[str], str]] = None,
+                remove_emojis: bool = True,
+                model: Optional[str] = 'gpt-3.5-turbo') -> Optional[str]:
+    """ Call OpenAI Chat Completion without blocking the Event Loop
+
+    This is the coroutine counterpart to 'chat'
+    The parameters and return value are identical
+
+    Args:
+        input_prompt (str): a defined input prompt
+        messages (Optional[Union[List[str], str]]): The optional messages to execute the chat completion upon
+        remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
+        model (str, optional): The model name to use.  Defaults to 'gpt-3.5-turbo'
+
+    Returns:
+        Optional[str]: the result (if any)
+    """
+    try:
+
+        preflight = _chat_preflight(input_prompt, messages, remove_emojis, model)
+        if not preflight:
             return None
 
-        if messages is None:
-            messages = ['']
-        elif type(messages) == str:
-            messages = [messages]
+        messages, result, remember = preflight
+        if result:
+            return result
 
-        if logger.isEnabledFor(logging.DEBUG):
-            Enforcer.is_list_of_str(messages)
+        registry = _shared('registry')
 
-        bp = OpenAIChatCompletion()
+        bp = registry.chat_completion_async()
 
-        d_result = bp.run(
+        d_result = await bp.run(
             model=model,
             messages=messages,
             input_prompt=input_prompt,
@@ -112,13 +480,15 @@ def chat(input_prompt: str,
         if not d_result or not d_result['output']:
             return None
 
-        result = OutputExtractorChat().process(
+        result = registry.output_extractor_chat().process(
             input_text=input_prompt,
             d_result=d_result,
             remove_emojis=remove_emojis)
 
+        remember(result)
+
         if logger.isEnabledFor(logging.DEBUG):
-            logging.getLogger(__name__).debug('\n'.join([
+            logger.debug('\n'.join([
                 'OpenAI Call Completed',
                 f'\tInput Prompt: {input_prompt}',
                 f'\tMessages: {messages}',
@@ -130,19 +500,146 @@ def chat(input_prompt: str,
         print(e)
 
 
-def call2(input_prompt: str,
-          remove_emojis: Optional[bool] = True,
-          engine: Optional[str] = 'text-davinci-003',
-          temperature: Optional[float] = 1.0) -> Optional[str]:
-    """ Call OpenAI
+def chat_stream(input_prompt: str,
+                messages: Optional[Union[List[str], str]] = None,
+                remove_emojis: bool = True,
+                model: Optional[str] = 'gpt-3.5-turbo',
+                on_complete: Optional[Callable] = None) -> Generator[str, None, Optional[dict]]:
+    """ Call OpenAI Chat Completion and Stream the Response
 
-    Not a very creative function name, but basically 'full-auto' call
+    Content deltas are yielded as they arrive, so the first words can be shown
+    long before the full response is complete
+
+    The deltas are cleaned as they arrive (see 'OutputExtractorStream')
+    Cleanup that needs the full text (such as keeping only the last paragraph) is not applied
+
+    Usage:
+        for delta in chat_stream('You are a helpful assistant.', 'Tell me a story'):
+            print(delta, end='')
+
+    Args:
+        input_prompt (str): a defined input prompt
+        messages (Optional[Union[List[str], str]]): The optional messages to execute the chat completion upon
+        remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
+        model (str, optional): The model name to use.  Defaults to 'gpt-3.5-turbo'
+        on_complete (Callable, optional): called once the stream ends with the assembled result. Defaults to None.
+            the result has the same 'input' and 'output' keys as a non-streamed call
+            and the output carries locally computed usage
+
+    Yields:
+        str: each cleaned content delta
+
+    Returns:
+        Optional[dict]: the assembled (uncleaned) result (the generator return value)
+    """
+    try:
+
+        preflight = _chat_preflight(
+            input_prompt, messages, remove_emojis, model, near_duplicates=False)
+        if not preflight:
+            return None
+
+        messages = preflight[0]
+
+        bp = _shared('registry').chat_completion()
+
+        from .dmo import OutputExtractorStream
+
+        extractor = OutputExtractorStream(
+            input_text=input_prompt,
+            remove_emojis=remove_emojis)
+
+        stream = bp.stream(
+            model=model,
+            messages=messages,
+            input_prompt=input_prompt,
+            on_complete=on_complete)
+
+        while True:
+            try:
+                delta = extractor.process(next(stream))
+            except StopIteration as e:
+                delta = extractor.flush()
+                if delta:
+                    yield delta
+                return e.value
+
+            if delta:
+                yield delta
+
+    except Exception as e:
+        print(e)
+
+
+async def achat_stream(input_prompt: str,
+                       messages: Optional[Union[List[str], str]] = None,
+                       remove_emojis: bool = True,
+                       model: Optional[str] = 'gpt-3.5-turbo',
+                       on_complete: Optional[Callable] = None) -> AsyncIterator[str]:
+    """ Call OpenAI Chat Completion and Stream the Response without blocking the Event Loop
+
+    This is the async iterator counterpart to 'chat_stream'
+
+    Usage:
+        async for delta in achat_stream('You are a helpful assistant.', 'Tell me a story'):
+            print(delta, end='')
+
+    Args:
+        input_prompt (str): a defined input prompt
+        messages (Optional[Union[List[str], str]]): The optional messages to execute the chat completion upon
+        remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
+        model (str, optional): The model name to use.  Defaults to 'gpt-3.5-turbo'
+        on_complete (Callable, optional): called once the stream ends with the assembled result. Defaults to None.
+
+    Yields:
+        str: each cleaned content delta
+    """
+    try:
+
+        preflight = _chat_preflight(
+            input_prompt, messages, remove_emojis, model, near_duplicates=False)
+        if not preflight:
+            return
+
+        messages = preflight[0]
+
+        bp = _shared('registry').chat_completion_async()
+
+        from .dmo import OutputExtractorStream
+
+        extractor = OutputExtractorStream(
+            input_text=input_prompt,
+            remove_emojis=remove_emojis)
+
+        async for delta in bp.stream(
+                model=model,
+                messages=messages,
+                input_prompt=input_prompt,
+                on_complete=on_complete):
+            delta = extractor.process(delta)
+            if delta:
+                yield delta
+
+        delta = extractor.flush()
+        if delta:
+            yield delta
+
+    except Exception as e:
+        print(e)
+
+
+async def acall2(input_prompt: str,
+                 remove_emojis: Optional[bool] = True,
+                 engine: Optional[str] = 'text-davinci-003',
+                 temperature: Optional[float] = 1.0) -> Optional[str]:
+    """ Call OpenAI without blocking the Event Loop
+
+    This is the coroutine counterpart to 'call2'
+    The parameters and return value are identical
 
     Args:
         input_prompt (str): a defined input prompt
         remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
-            Reference:
-                https://github.com/craigtrim/openai-helper/issues/8
         engine (str, optional): the LLM engine. Defaults to 'text-davinci-003'.
         temperature (float, optional): the temperature. Defaults to 1.0.
 
@@ -152,14 +649,16 @@ def call2(input_prompt: str,
 
     try:
 
-        bp = OpenAITextCompletion()
+        registry = _shared('registry')
 
-        d_result = bp.run(
+        bp = registry.text_completion_async()
+
+        d_result = await bp.run(
             input_prompt=input_prompt,
             engine=engine,
             temperature=temperature)
 
-        result = OutputExtractorText().process(
+        result = registry.output_extractor_text().process(
             input_text=input_prompt,
             d_result=d_result,
             remove_emojis=remove_emojis)
@@ -176,3 +675,7 @@ def call2(input_prompt: str,
 
     except Exception:
         pass
+
+
+# a star import loads everything; 'import openai_helper' alone stays cheap
+__all__ = _public_names()
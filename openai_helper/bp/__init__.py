@@ -1,3 +1,32 @@
-from .openai_text_completion import OpenAITextCompletion
-from .openai_chat_completion import OpenAIChatCompletion
-from .openai_custom_model import OpenAICustomModel
+""" Business Processes, imported lazily on first use
+
+Importing this package is cheap; each module (and its dependencies, such as openai or tiktoken)
+is only imported when one of its names is first accessed
+"""
+
+
+from importlib import import_module
+
+_d_modules = {
+    'OpenAITextCompletion': 'openai_text_completion',
+    'OpenAIChatCompletion': 'openai_chat_completion',
+    'OpenAICustomModel': 'openai_custom_model',
+    'OpenAIChatCompletionAsync': 'openai_chat_completion_async',
+    'OpenAITextCompletionAsync': 'openai_text_completion_async',
+    'ClientRegistry': 'client_registry',
+}
+
+__all__ = list(_d_modules)
+
+
+def __getattr__(name: str):
+    if name not in _d_modules:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(f'.{_d_modules[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
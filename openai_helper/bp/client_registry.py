@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Process-Wide Registry of OpenAI Clients """
+
+
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Callable
+
+from threading import RLock
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import ResponseCacheSqlite
+from openai_helper.dmo import NearDuplicateCache
+from openai_helper.dmo import OpenAIConnector
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import OutputExtractorChat
+from openai_helper.dmo import OutputExtractorText
+from openai_helper.bp.openai_chat_completion import OpenAIChatCompletion
+from openai_helper.bp.openai_text_completion import OpenAITextCompletion
+from openai_helper.bp.openai_chat_completion_async import OpenAIChatCompletionAsync
+from openai_helper.bp.openai_text_completion_async import OpenAITextCompletionAsync
+
+
+class ClientRegistry(BaseObject):
+    """ Process-Wide Registry of OpenAI Clients
+
+    Notes:
+    -   every object is created lazily on first use and then shared by all callers
+    -   objects are cached per configuration (the keyword arguments used to build them)
+    -   the connection is created once and shared by every business process
+    -   call 'reset' after rotating the OpenAI key or org
+    -   call 'warmup' before serving so the first request does not pay for setup
+    """
+
+    def __init__(self):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   stop rebuilding the connector, runners and extractors on every 'chat' or 'call2'
+        """
+        BaseObject.__init__(self, __name__)
+        self._lock = RLock()
+        self._d_cache = {}
+
+    def _get(self,
+             name: str,
+             factory: Callable,
+             **kwargs) -> Any:
+        key = (name, tuple(sorted(kwargs.items(), key=lambda x: x[0])))
+
+        # lock-free fast path; dictionary reads are atomic
+        instance = self._d_cache.get(key)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if key not in self._d_cache:
+                self._d_cache[key] = factory(**kwargs)
+
+                if self.isEnabledForDebug:
+                    self.logger.debug('\n'.join([
+                        'Registered OpenAI Client',
+                        f'\tName: {name}',
+                        f'\tConfiguration: {kwargs}']))
+
+            return self._d_cache[key]
+
+    def conn(self) -> object:
+        """ The shared connection to OpenAI
+
+        Returns:
+            object: a connected instance of OpenAI
+        """
+        return self._get('conn', lambda: OpenAIConnector().process())
+
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """ The shared client-side rate limiter
+
+        Returns:
+            Optional[RateLimiter]: a rate limiter if 'OPENAI_RATE_LIMITS' is configured
+        """
+        def factory() -> Optional[RateLimiter]:
+            if not EnvIO.exists('OPENAI_RATE_LIMITS'):
+                return None
+            return RateLimiter()
+
+        return self._get('rate-limiter', factory)
+
+    def concurrency_limiter(self) -> Optional[AdaptiveConcurrencyLimiter]:
+        """ The shared adaptive concurrency limiter
+
+        Returns:
+            Optional[AdaptiveConcurrencyLimiter]: a limiter if 'OPENAI_ADAPTIVE_CONCURRENCY' is true
+        """
+        def factory() -> Optional[AdaptiveConcurrencyLimiter]:
+            if not EnvIO.is_true('OPENAI_ADAPTIVE_CONCURRENCY'):
+                return None
+            return AdaptiveConcurrencyLimiter()
+
+        return self._get('concurrency-limiter', factory)
+
+    def response_cache(self) -> Optional[object]:
+        """ The shared response cache
+
+        Returns:
+            Optional[object]: a cache if 'OPENAI_RESPONSE_CACHE' is true
+                a host-wide SQLite cache if 'OPENAI_RESPONSE_CACHE_DB' is also set
+                otherwise an in-memory cache
+        """
+        def factory() -> Optional[object]:
+            if not EnvIO.is_true('OPENAI_RESPONSE_CACHE'):
+                return None
+            file_path = EnvIO.str_or_default('OPENAI_RESPONSE_CACHE_DB', None)
+            if file_path:
+                return ResponseCacheSqlite(file_path)
+            return ResponseCache()
+
+        return self._get('response-cache', factory)
+
+    def near_duplicate_cache(self) -> Optional[NearDuplicateCache]:
+        """ The shared near-duplicate answer cache
+
+        Returns:
+            Optional[NearDuplicateCache]: a cache if 'OPENAI_NEAR_DUPLICATE_CACHE' is true
+        """
+        def factory() -> Optional[NearDuplicateCache]:
+            if not EnvIO.is_true('OPENAI_NEAR_DUPLICATE_CACHE'):
+                return None
+            return NearDuplicateCache()
+
+        return self._get('near-duplicate-cache', factory)
+
+    def chat_completion(self) -> OpenAIChatCompletion:
+        return self._get('chat-completion',
+                         lambda: OpenAIChatCompletion(
+                             conn=self.conn(),
+                             rate_limiter=self.rate_limiter(),
+                             concurrency_limiter=self.concurrency_limiter(),
+                             cache=self.response_cache()))
+
+    def chat_completion_async(self) -> OpenAIChatCompletionAsync:
+        return self._get('chat-completion-async',
+                         lambda: OpenAIChatCompletionAsync(
+                             conn=self.conn(),
+                             rate_limiter=self.rate_limiter(),
+                             concurrency_limiter=self.concurrency_limiter(),
+                             cache=self.response_cache()))
+
+    def text_completion(self) -> OpenAITextCompletion:
+        return self._get('text-completion',
+                         lambda: OpenAITextCompletion(
+                             conn=self.conn(),
+                             rate_limiter=self.rate_limiter(),
+                             concurrency_limiter=self.concurrency_limiter(),
+                             cache=self.response_cache()))
+
+    def text_completion_async(self) -> OpenAITextCompletionAsync:
+        return self._get('text-completion-async',
+                         lambda: OpenAITextCompletionAsync(
+                             conn=self.conn(),
+                             rate_limiter=self.rate_limiter(),
+                             concurrency_limiter=self.concurrency_limiter(),
+                             cache=self.response_cache()))
+
+    def output_extractor_chat(self) -> OutputExtractorChat:
+        return self._get('output-extractor-chat', OutputExtractorChat)
+
+    def output_extractor_text(self) -> OutputExtractorText:
+        return self._get('output-extractor-text', OutputExtractorText)
+
+    def warmup(self,
+               models: Optional[List[str]] = None,
+               prewarm: bool = False) -> None:
+        """ Load every Encoding and build every shared Object ahead of the first Request
+
+        In a pre-fork server, call this in the parent before forking workers
+        and leave 'prewarm' off; open sockets must not be shared across processes
+        the SQLite-backed cache and rate limiter are safe to build here;
+        each worker opens its own database connection on first use
+
+        Args:
+            models (List[str], optional): the models to load token encodings for. Defaults to None.
+                if None, the current GPT-3.5, GPT-4 and text-davinci models are loaded
+            prewarm (bool, optional): also open (and TLS-negotiate) pooled connections. Defaults to False.
+        """
+        encoding_names = InputTokenCounter().warmup(models)
+
+        for accessor in (self.conn,
+                         self.rate_limiter,
+                         self.concurrency_limiter,
+                         self.response_cache,
+                         self.near_duplicate_cache,
+                         self.chat_completion,
+                         self.chat_completion_async,
+                         self.text_completion,
+                         self.text_completion_async,
+                         self.output_extractor_chat,
+                         self.output_extractor_text):
+            accessor()
+
+        if prewarm:
+            OpenAIConnector().prewarm()
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'OpenAI Client Registry Warmed Up',
+                f'\tEncodings: {encoding_names}',
+                f'\tPrewarmed Connections: {prewarm}']))
+
+    def reset(self) -> None:
+        """ Discard every cached object
+
+        The next call will reconnect to OpenAI and rebuild the runners
+        Use this after rotating the OpenAI key or org
+        """
+        with self._lock:
+            self._d_cache = {}
+
+        if self.isEnabledForDebug:
+            self.logger.debug('OpenAI Client Registry Reset')
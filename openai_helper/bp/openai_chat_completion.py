@@ -4,42 +4,93 @@
 
 
 from typing import List
+from typing import Union
 from typing import Optional
 from typing import Callable
+from typing import Generator
 
 from baseblock import EnvIO
 from baseblock import Enforcer
 from baseblock import BaseObject
 
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
 from openai_helper.dmo import OpenAIConnector
 from openai_helper.svc import RunChatCompletion
 from openai_helper.dmo import NoOpenAIEvent
+from openai_helper.dmo import Conversation
 
 
 class OpenAIChatCompletion(BaseObject):
     """ Run a Chat Completion against OpenAI """
 
-    __run = None
+    __runner = None
+    __conn = None
 
-    def __init__(self):
+    def __init__(self,
+                 conn: object = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 max_prompt_tokens: Optional[int] = None):
         """ Change Log
 
         Created:
             1-Mar-2023
             craigtrim@gmail.com
             *   https://github.com/craigtrim/openai-helper/issues/9
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   allow optional conn as parameter
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'stream' yields content deltas as they arrive
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional prompt token budget; long histories keep only the newest turns that fit
+
+        Args:
+            conn (object): a connection to openAI
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache. Defaults to None.
+            max_prompt_tokens (int, optional): the prompt token budget of every call. Defaults to None.
+                the system prompt and the newest messages that fit are sent
+                if None, this is read from 'OPENAI_MAX_PROMPT_TOKENS'; if that is unset, the full history is sent
         """
         BaseObject.__init__(self, __name__)
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
+        self._max_prompt_tokens = max_prompt_tokens
+        if conn:
+            self.__conn = conn
+
+    def _conn(self) -> object:
+        if not self.__conn:
+            self.__conn = OpenAIConnector().process()
+        return self.__conn
+
+    def _runner(self) -> RunChatCompletion:
+        if not self.__runner:
+            self.__runner = RunChatCompletion(
+                self._conn(),
+                rate_limiter=self._rate_limiter,
+                concurrency_limiter=self._concurrency_limiter,
+                cache=self._cache,
+                max_prompt_tokens=self._max_prompt_tokens)
+        return self.__runner
 
     def _run(self) -> Callable:
-        if not self.__run:
-            openai = OpenAIConnector().process()
-            self.__run = RunChatCompletion(openai).process
-        return self.__run
+        return self._runner().process
 
     def run(self,
             input_prompt: str,
-            messages: List[str],
+            messages: Union[List[str], Conversation],
             model: Optional[str] = 'gpt-3.5-turbo') -> dict:
         """ Run an OpenAI event
 
@@ -49,7 +100,7 @@ class OpenAIChatCompletion(BaseObject):
                 Sample Input Prompt:
                     "You are a helpful assistant."
 
-            messages (List[str]): The messages to execute the chat completion upon
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
 
                 Sample Messages:
                     [
@@ -65,7 +116,7 @@ class OpenAIChatCompletion(BaseObject):
             model (str): the model to use
 
         Returns:
-            dict: an output dictionary with two keys:
+            dict: an output dictionary with three keys:
                 input: the input dictionary with validated parameters and default values where appropriate
                 output: the output event from OpenAI
                     Unless RateLimitError, PermissionError, AuthenticationError, ServiceUnavailableError
@@ -73,6 +124,7 @@ class OpenAIChatCompletion(BaseObject):
                     This service will not catch Exception or Error classes generally
                     -   the door is still left open for these and other error types to be thrown
                         and the consumer must plan for this eventuality
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
         """
 
         if not EnvIO.is_true('USE_OPENAI'):
@@ -88,6 +140,46 @@ class OpenAIChatCompletion(BaseObject):
         )
 
         if self.isEnabledForDebug:
-            Enforcer.keys(d_result, 'input', 'output')
+            Enforcer.keys(d_result, 'input', 'output', 'attempts')
+
+        return d_result
+
+    def stream(self,
+               input_prompt: str,
+               messages: Union[List[str], Conversation],
+               model: Optional[str] = 'gpt-3.5-turbo',
+               on_complete: Optional[Callable] = None) -> Generator[str, None, dict]:
+        """ Run an OpenAI event and Stream the Response
+
+        Args:
+            input_prompt (str): a defined input prompt
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
+            model (str): the model to use
+            on_complete (Callable, optional): called with the assembled result once the stream ends. Defaults to None.
+
+        Yields:
+            str: each content delta as it arrives
+
+        Returns:
+            dict: the same three keys as 'run', assembled once the stream ends
+        """
+
+        if not EnvIO.is_true('USE_OPENAI'):
+            d_result = NoOpenAIEvent().process(input_prompt, None)
+            if on_complete:
+                on_complete(d_result)
+            return d_result
+
+        if self.isEnabledForDebug:
+            Enforcer.is_str(input_prompt)
+
+        d_result = yield from self._runner().stream(
+            model=model,
+            messages=messages,
+            input_prompt=input_prompt,
+            on_complete=on_complete)
+
+        if self.isEnabledForDebug:
+            Enforcer.keys(d_result, 'input', 'output', 'attempts')
 
         return d_result
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Run a Chat Completion against OpenAI using asyncio """
+
+
+from typing import List
+from typing import Union
+from typing import Optional
+from typing import Callable
+from typing import AsyncIterator
+
+from baseblock import EnvIO
+from baseblock import Enforcer
+from baseblock import BaseObject
+
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import OpenAIConnector
+from openai_helper.svc import RunChatCompletionAsync
+from openai_helper.dmo import NoOpenAIEvent
+from openai_helper.dmo import Conversation
+
+
+class OpenAIChatCompletionAsync(BaseObject):
+    """ Run a Chat Completion against OpenAI using asyncio """
+
+    __runner = None
+    __conn = None
+
+    def __init__(self,
+                 conn: object = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 max_prompt_tokens: Optional[int] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   coroutine counterpart to 'openai-chat-completion'
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'stream' yields content deltas as they arrive
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional prompt token budget; long histories keep only the newest turns that fit
+
+        Args:
+            conn (object): a connection to openAI
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache. Defaults to None.
+            max_prompt_tokens (int, optional): the prompt token budget of every call. Defaults to None.
+                the system prompt and the newest messages that fit are sent
+                if None, this is read from 'OPENAI_MAX_PROMPT_TOKENS'; if that is unset, the full history is sent
+        """
+        BaseObject.__init__(self, __name__)
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
+        self._max_prompt_tokens = max_prompt_tokens
+        if conn:
+            self.__conn = conn
+
+    def _conn(self) -> object:
+        if not self.__conn:
+            self.__conn = OpenAIConnector().process()
+        return self.__conn
+
+    def _runner(self) -> RunChatCompletionAsync:
+        if not self.__runner:
+            self.__runner = RunChatCompletionAsync(
+                self._conn(),
+                rate_limiter=self._rate_limiter,
+                concurrency_limiter=self._concurrency_limiter,
+                cache=self._cache,
+                max_prompt_tokens=self._max_prompt_tokens)
+        return self.__runner
+
+    def _run(self) -> Callable:
+        return self._runner().process
+
+    async def run(self,
+                  input_prompt: str,
+                  messages: Union[List[str], Conversation],
+                  model: Optional[str] = 'gpt-3.5-turbo') -> dict:
+        """ Run an OpenAI event
+
+        Args:
+            input_prompt (str): a defined input prompt
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
+            model (str): the model to use
+
+        Returns:
+            dict: an output dictionary with three keys:
+                input: the input dictionary with validated parameters and default values where appropriate
+                output: the output event from OpenAI
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
+        """
+
+        if not EnvIO.is_true('USE_OPENAI'):
+            return NoOpenAIEvent().process(input_prompt, None)
+
+        if self.isEnabledForDebug:
+            Enforcer.is_str(input_prompt)
+
+        d_result = await self._run()(
+            model=model,
+            messages=messages,
+            input_prompt=input_prompt,
+        )
+
+        if self.isEnabledForDebug:
+            Enforcer.keys(d_result, 'input', 'output', 'attempts')
+
+        return d_result
+
+    async def stream(self,
+                     input_prompt: str,
+                     messages: Union[List[str], Conversation],
+                     model: Optional[str] = 'gpt-3.5-turbo',
+                     on_complete: Optional[Callable] = None) -> AsyncIterator[str]:
+        """ Run an OpenAI event and Stream the Response
+
+        Args:
+            input_prompt (str): a defined input prompt
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
+            model (str): the model to use
+            on_complete (Callable, optional): called with the assembled result once the stream ends. Defaults to None.
+
+        Yields:
+            str: each content delta as it arrives
+        """
+
+        if not EnvIO.is_true('USE_OPENAI'):
+            if on_complete:
+                on_complete(NoOpenAIEvent().process(input_prompt, None))
+            return
+
+        if self.isEnabledForDebug:
+            Enforcer.is_str(input_prompt)
+
+        async for delta in self._runner().stream(
+                model=model,
+                messages=messages,
+                input_prompt=input_prompt,
+                on_complete=on_complete):
+            yield delta
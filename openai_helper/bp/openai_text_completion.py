@@ -10,6 +10,9 @@ from baseblock import EnvIO
 from baseblock import Enforcer
 from baseblock import BaseObject
 
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
 from openai_helper.dmo import OpenAIConnector
 from openai_helper.svc import RunTextCompletion
 from openai_helper.dmo import NoOpenAIEvent
@@ -22,7 +25,10 @@ class OpenAITextCompletion(BaseObject):
     __conn = None
 
     def __init__(self,
-                 conn: object = None):
+                 conn: object = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
         """ Change Log
 
         Created:
@@ -44,8 +50,14 @@ class OpenAITextCompletion(BaseObject):
 
         Args:
             conn (object): a connection to openAI
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache. Defaults to None.
         """
         BaseObject.__init__(self, __name__)
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
         if conn:
             self.__conn = conn
 
@@ -56,7 +68,11 @@ class OpenAITextCompletion(BaseObject):
 
     def _run(self) -> Callable:
         if not self.__run:
-            self.__run = RunTextCompletion(self._conn()).process
+            self.__run = RunTextCompletion(
+                self._conn(),
+                rate_limiter=self._rate_limiter,
+                concurrency_limiter=self._concurrency_limiter,
+                cache=self._cache).process
         return self.__run
 
     def run(self,
@@ -96,9 +112,10 @@ class OpenAITextCompletion(BaseObject):
             presence_penalty (int, optional): Seems similar to frequency penalty. Defaults to None.
 
         Returns:
-            dict: an output dictionary with two keys:
+            dict: an output dictionary with three keys:
                 input: the input dictionary with validated parameters and default values where appropriate
                 output: the output event from OpenAI
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
         """
 
         if not EnvIO.is_true('USE_OPENAI'):
@@ -117,6 +134,6 @@ class OpenAITextCompletion(BaseObject):
                                presence_penalty=presence_penalty)
 
         if self.isEnabledForDebug:
-            Enforcer.keys(d_result, 'input', 'output')
+            Enforcer.keys(d_result, 'input', 'output', 'attempts')
 
         return d_result
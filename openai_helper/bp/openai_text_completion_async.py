@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Run a Completion against openAI using asyncio """
+
+
+from typing import Optional
+from typing import Callable
+
+from baseblock import EnvIO
+from baseblock import Enforcer
+from baseblock import BaseObject
+
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import OpenAIConnector
+from openai_helper.svc import RunTextCompletionAsync
+from openai_helper.dmo import NoOpenAIEvent
+
+
+class OpenAITextCompletionAsync(BaseObject):
+    """ Run a Text Completion against openAI using asyncio """
+
+    __run = None
+    __conn = None
+
+    def __init__(self,
+                 conn: object = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   coroutine counterpart to 'openai-text-completion'
+
+        Args:
+            conn (object): a connection to openAI
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache. Defaults to None.
+        """
+        BaseObject.__init__(self, __name__)
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
+        if conn:
+            self.__conn = conn
+
+    def _conn(self) -> object:
+        if not self.__conn:
+            self.__conn = OpenAIConnector().process()
+        return self.__conn
+
+    def _run(self) -> Callable:
+        if not self.__run:
+            self.__run = RunTextCompletionAsync(
+                self._conn(),
+                rate_limiter=self._rate_limiter,
+                concurrency_limiter=self._concurrency_limiter,
+                cache=self._cache).process
+        return self.__run
+
+    async def run(self,
+                  input_prompt: str,
+                  engine: Optional[str] = None,
+                  best_of: Optional[int] = None,
+                  temperature: Optional[float] = None,
+                  max_tokens: Optional[int] = None,
+                  top_p: Optional[float] = None,
+                  frequency_penalty: Optional[int] = None,
+                  presence_penalty: Optional[int] = None) -> dict:
+        """ Run an OpenAI event
+
+        The parameters are identical to those of 'openai-text-completion'
+
+        Returns:
+            dict: an output dictionary with three keys:
+                input: the input dictionary with validated parameters and default values where appropriate
+                output: the output event from OpenAI
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
+        """
+
+        if not EnvIO.is_true('USE_OPENAI'):
+            return NoOpenAIEvent().process(input_prompt, engine)
+
+        if self.isEnabledForDebug:
+            Enforcer.is_str(input_prompt)
+
+        d_result = await self._run()(input_prompt=input_prompt,
+                                     engine=engine,
+                                     best_of=best_of,
+                                     temperature=temperature,
+                                     max_tokens=max_tokens,
+                                     top_p=top_p,
+                                     frequency_penalty=frequency_penalty,
+                                     presence_penalty=presence_penalty)
+
+        if self.isEnabledForDebug:
+            Enforcer.keys(d_result, 'input', 'output', 'attempts')
+
+        return d_result
@@ -1,13 +1,61 @@
-from .openai_connector import OpenAIConnector
-from .completion_event_extractor import CompletionEventExtractor
-from .etl_handle_textcompletions import EtlHandleTextCompletions
-from .etl_remove_promptindicators import EtlRemovePromptIndicators
-from .etl_replace_cliches import EtlReplaceCliches
-from .etl_replace_duplicatedinput import EtlReplaceDuplicatedInput
-from .no_openai_event import NoOpenAIEvent
-from .etl_remove_listindicators import EtlRemoveListIndicators
-from .etl_remove_emojis import EtlRemoveEmojis
-from .chat_message_formatter import ChatMessageFormatter
-from .output_extractor_chat import OutputExtractorChat
-from .output_extractor_text import OutputExtractorText
-from .input_token_counter import InputTokenCounter
+""" Domain Components, imported lazily on first use
+
+Importing this package is cheap; each module (and its dependencies, such as openai or tiktoken)
+is only imported when one of its names is first accessed
+"""
+
+
+from importlib import import_module
+
+_d_modules = {
+    'OpenAIConnector': 'openai_connector',
+    'CompletionEventExtractor': 'completion_event_extractor',
+    'EtlHandleTextCompletions': 'etl_handle_textcompletions',
+    'EtlRemovePromptIndicators': 'etl_remove_promptindicators',
+    'PhraseMatcher': 'phrase_matcher',
+    'EtlReplaceCliches': 'etl_replace_cliches',
+    'EtlReplaceDuplicatedInput': 'etl_replace_duplicatedinput',
+    'NoOpenAIEvent': 'no_openai_event',
+    'EtlRemoveListIndicators': 'etl_remove_listindicators',
+    'EtlRemoveEmojis': 'etl_remove_emojis',
+    'ChatMessageFormatter': 'chat_message_formatter',
+    'OutputExtractorChat': 'output_extractor_chat',
+    'OutputExtractorText': 'output_extractor_text',
+    'InputTokenCounter': 'input_token_counter',
+    'BatchExecutor': 'batch_executor',
+    'RetryPolicy': 'retry_policy',
+    'BucketStoreMemory': 'bucket_store_memory',
+    'BucketStoreSqlite': 'bucket_store_sqlite',
+    'RateLimiter': 'rate_limiter',
+    'AdaptiveConcurrencyLimiter': 'adaptive_concurrency_limiter',
+    'ChatStreamAssembler': 'chat_stream_assembler',
+    'OutputExtractorStream': 'output_extractor_stream',
+    'ResponseCache': 'response_cache',
+    'BloomFilter': 'bloom_filter',
+    'ResponseCacheSqlite': 'response_cache_sqlite',
+    'NearDuplicateCache': 'near_duplicate_cache',
+    'Cassette': 'cassette',
+    'CassetteAdapter': 'cassette_adapter',
+    'MockOpenAIServer': 'mock_openai_server',
+    'SyntheticConnection': 'synthetic_connection',
+    'Conversation': 'conversation',
+    'TokenEstimator': 'token_estimator',
+    'ModelRegistry': 'model_registry',
+    'ChatRequestBuilder': 'chat_request_builder',
+    'TextRequestBuilder': 'text_request_builder',
+}
+
+__all__ = list(_d_modules)
+
+
+def __getattr__(name: str):
+    if name not in _d_modules:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(f'.{_d_modules[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
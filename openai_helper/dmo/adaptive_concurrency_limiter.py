@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Adaptive (AIMD) Concurrency Limiter driven by 429s and Latency """
+
+
+from typing import List
+from typing import Optional
+
+import time
+import math
+import asyncio
+from collections import deque
+from threading import Condition
+from contextlib import contextmanager
+from contextlib import asynccontextmanager
+
+from openai.error import RateLimitError
+from openai.error import ServiceUnavailableError
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+
+class AdaptiveConcurrencyLimiter(BaseObject):
+    """ Adaptive (AIMD) Concurrency Limiter driven by 429s and Latency
+
+    Notes:
+    -   additive increase: every healthy call that filled the limit raises it by 'increase / limit'
+        so the limit grows by roughly 'increase' per round of saturated calls
+        calls made while slots were still free leave it alone; otherwise a quiet period
+        would grow the limit without bound, and the next burst would arrive as a storm of 429s
+    -   multiplicative decrease: the limit is multiplied by 'decrease' when
+        a call fails with RateLimitError or ServiceUnavailableError
+        or the p95 latency of recent calls crosses the latency target
+    -   only calls that started after the last decrease can trigger another one
+        so a single burst of 429s cuts the limit once, not once per failed call
+    """
+
+    __overload_errors = (RateLimitError, ServiceUnavailableError)
+
+    def __init__(self,
+                 initial_limit: int = 4,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 increase: float = 1.0,
+                 decrease: float = 0.5,
+                 latency_target: Optional[float] = None,
+                 window: int = 50):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   static concurrency wastes quota off-peak and triggers rate-limit storms at peak
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   only increase the limit after calls that saturated it
+
+        Args:
+            initial_limit (int, optional): the starting concurrency limit. Defaults to 4.
+            min_limit (int, optional): the concurrency floor. Defaults to 1.
+            max_limit (int, optional): the concurrency ceiling. Defaults to 64.
+                override with the 'OPENAI_CONCURRENCY_MAX' environment variable
+            increase (float, optional): the additive increase per round of calls. Defaults to 1.0.
+            decrease (float, optional): the multiplicative decrease factor. Defaults to 0.5.
+            latency_target (float, optional): the p95 latency target in seconds. Defaults to None.
+                override with the 'OPENAI_CONCURRENCY_LATENCY_TARGET' environment variable
+                if None, only errors cause a decrease
+            window (int, optional): the number of recent calls used for the p95 latency. Defaults to 50.
+        """
+        BaseObject.__init__(self, __name__)
+
+        self._min_limit = min_limit
+        self._max_limit = EnvIO.int_or_default(
+            'OPENAI_CONCURRENCY_MAX', max_limit)
+        self._increase = increase
+        self._decrease = decrease
+        self._latency_target = EnvIO.float_or_default(
+            'OPENAI_CONCURRENCY_LATENCY_TARGET', latency_target)
+
+        self._limit = float(min(max(initial_limit, min_limit), self._max_limit))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+
+        self._latencies = deque(maxlen=window)
+        self._decisions = deque(maxlen=100)
+        self._d_counts = {'increase': 0, 'decrease': 0}
+
+        self._condition = Condition()
+        self._async_waiters = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _p95(self) -> Optional[float]:
+        if len(self._latencies) < min(20, self._latencies.maxlen):
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    def _decide(self,
+                action: str,
+                reason: str) -> None:
+        """ Record a Limit Change; the caller holds the lock """
+        self._d_counts[action] += 1
+
+        d_decision = {
+            'time': time.time(),
+            'action': action,
+            'reason': reason,
+            'limit': self.limit,
+        }
+
+        if action == 'decrease':
+            self._decisions.append(d_decision)
+            if self.isEnabledForInfo:
+                self.logger.info('\n'.join([
+                    'Concurrency Limit Decreased',
+                    f'\tReason: {reason}',
+                    f'\tLimit: {self.limit}']))
+
+        elif not self._decisions or self._decisions[-1]['limit'] != self.limit:
+            # fractional increases are not worth a record until the integer limit moves
+            self._decisions.append(d_decision)
+
+    def _on_complete(self,
+                     started: float,
+                     latency: float,
+                     error: Optional[Exception],
+                     saturated: bool) -> None:
+        """ Apply the AIMD Rule for a finished Call; the caller holds the lock
+
+        'saturated' is True if the call took the last free slot (in-flight reached the limit)
+        """
+        self._in_flight -= 1
+        self._latencies.append(latency)
+
+        def decrease(reason: str) -> None:
+            self._limit = max(float(self._min_limit), self._limit * self._decrease)
+            self._last_decrease = time.monotonic()
+            self._latencies.clear()
+            self._decide('decrease', reason)
+
+        if isinstance(error, self.__overload_errors):
+            if started >= self._last_decrease:
+                decrease(type(error).__name__)
+
+        elif error is None:
+            p95 = self._p95()
+            if self._latency_target and p95 and p95 > self._latency_target:
+                if started >= self._last_decrease:
+                    decrease(f'p95 latency {round(p95, 3)}s')
+
+            elif saturated and self._limit < self._max_limit:
+                self._limit = min(float(self._max_limit),
+                                  self._limit + self._increase / self._limit)
+                self._decide('increase', 'healthy')
+
+        self._condition.notify_all()
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(
+                lambda x: x.done() or x.set_result(None), future)
+
+    @contextmanager
+    def slot(self):
+        """ Hold one Concurrency Slot for the Duration of a Call
+
+        Usage:
+            with limiter.slot():
+                openai.ChatCompletion.create(...)
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            saturated = self._in_flight >= self.limit
+
+        started = time.monotonic()
+        error = None
+
+        try:
+            yield
+
+        except Exception as e:
+            error = e
+            raise
+
+        finally:
+            with self._condition:
+                self._on_complete(started,
+                                  time.monotonic() - started,
+                                  error,
+                                  saturated)
+
+    @asynccontextmanager
+    async def aslot(self):
+        """ Hold one Concurrency Slot for the Duration of a Coroutine Call
+
+        Usage:
+            async with limiter.aslot():
+                await openai.ChatCompletion.acreate(...)
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self._condition:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    saturated = self._in_flight >= self.limit
+                    break
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            await future
+
+        started = time.monotonic()
+        error = None
+
+        try:
+            yield
+
+        except Exception as e:
+            error = e
+            raise
+
+        finally:
+            with self._condition:
+                self._on_complete(started,
+                                  time.monotonic() - started,
+                                  error,
+                                  saturated)
+
+    def metrics(self) -> dict:
+        """ Current Limit and recent Decisions
+
+        Returns:
+            dict: the controller metrics
+        """
+        with self._condition:
+            decisions: List[dict] = list(self._decisions)
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'min_limit': self._min_limit,
+                'max_limit': self._max_limit,
+                'p95_latency': self._p95(),
+                'latency_target': self._latency_target,
+                'increases': self._d_counts['increase'],
+                'decreases': self._d_counts['decrease'],
+                'decisions': decisions,
+            }
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Fan out a Batch of Calls over a bounded Worker Pool """
+
+
+from typing import List
+from typing import Union
+from typing import Callable
+from typing import Optional
+
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+
+from baseblock import Stopwatch
+from baseblock import BaseObject
+
+
+class BatchExecutor(BaseObject):
+    """ Fan out a Batch of Calls over a bounded Worker Pool
+
+    Notes:
+    -   results are returned in input order, regardless of completion order
+    -   an error in one item is captured on that item and never aborts the batch
+    """
+
+    def __init__(self,
+                 max_concurrency: int = 8):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   run batches of OpenAI calls concurrently
+                wall-clock time is bounded by the slowest calls rather than the sum of all calls
+
+        Args:
+            max_concurrency (int, optional): the maximum number of calls in flight. Defaults to 8.
+        """
+        BaseObject.__init__(self, __name__)
+        if max_concurrency < 1:
+            raise ValueError(f'Invalid Max Concurrency: {max_concurrency}')
+        self._max_concurrency = max_concurrency
+
+    @staticmethod
+    def _progress_bar(total: int) -> Optional[object]:
+        try:
+            from tqdm import tqdm
+            return tqdm(total=total)
+        except ImportError:
+            return None
+
+    def process(self,
+                function: Callable,
+                items: List[dict],
+                progress: Optional[Union[Callable, bool]] = None) -> List[dict]:
+        """ Entry Point
+
+        Args:
+            function (Callable): the function to call once per item
+            items (List[dict]): the keyword arguments for each call
+            progress (Optional[Union[Callable, bool]], optional): progress reporting. Defaults to None.
+                a callable is invoked as progress(completed, total) after each item finishes
+                True will display a tqdm progress bar (if tqdm is installed)
+
+        Returns:
+            List[dict]: one result per item (in input order) with three keys:
+                input: the keyword arguments for the call
+                output: the return value of the call (None on error)
+                error: the exception raised by the call (None on success)
+        """
+
+        sw = Stopwatch()
+
+        total = len(items)
+        results = [None] * total
+
+        progress_bar = None
+        if progress is True:
+            progress_bar = self._progress_bar(total)
+
+        def invoke(d_item: dict) -> dict:
+            try:
+                return {
+                    'input': d_item,
+                    'output': function(**d_item),
+                    'error': None
+                }
+            except Exception as e:
+                return {
+                    'input': d_item,
+                    'output': None,
+                    'error': e
+                }
+
+        try:
+
+            with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+                futures = {
+                    executor.submit(invoke, items[i]): i
+                    for i in range(total)
+                }
+
+                completed = 0
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+                    completed += 1
+                    if progress_bar:
+                        progress_bar.update(1)
+                    elif callable(progress):
+                        progress(completed, total)
+
+        finally:
+            if progress_bar:
+                progress_bar.close()
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'Batch Execution Completed',
+                f'\tTotal Time: {str(sw)}',
+                f'\tTotal Items: {total}',
+                f"\tTotal Errors: {len([x for x in results if x['error']])}",
+                f'\tMax Concurrency: {self._max_concurrency}']))
+
+        return results
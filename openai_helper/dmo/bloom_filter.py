@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Bloom Filter over Hex Digest Keys """
+
+
+import math
+
+from baseblock import BaseObject
+
+
+class BloomFilter(BaseObject):
+    """ Bloom Filter over Hex Digest Keys
+
+    Notes:
+    -   a negative answer is certain, a positive answer may be false
+    -   keys are expected to be hex digests (e.g., sha256)
+        the bit positions are sliced from the digest itself, so no further hashing is needed
+    -   keys cannot be removed; rebuild the filter to forget keys
+    """
+
+    def __init__(self,
+                 capacity: int = 100000,
+                 error_rate: float = 0.01):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   answer cache misses without touching disk
+
+        Args:
+            capacity (int, optional): the number of keys the filter is sized for. Defaults to 100000.
+            error_rate (float, optional): the false-positive rate at capacity. Defaults to 0.01.
+        """
+        BaseObject.__init__(self, __name__)
+        self._capacity = max(1, capacity)
+
+        self._size = max(8, int(-self._capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._hashes = max(1, min(8, round(self._size / self._capacity * math.log(2))))
+
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self,
+                   key: str) -> list:
+        # eight hex characters (32 bits) per hash; a sha256 digest supplies eight of them
+        return [int(key[i * 8:i * 8 + 8], 16) % self._size
+                for i in range(self._hashes)]
+
+    def add(self,
+            key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self,
+                     key: str) -> bool:
+        for position in self._positions(key):
+            if not self._bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" In-Process Token Bucket State """
+
+
+from typing import Dict
+from typing import Tuple
+
+import time
+from threading import Lock
+
+from baseblock import BaseObject
+
+
+class BucketStoreMemory(BaseObject):
+    """ In-Process Token Bucket State
+
+    Notes:
+    -   every bucket holds at most one minute of budget (its capacity)
+        and refills continuously at capacity / 60 per second
+    -   state is only shared by threads within this process
+        use 'bucket-store-sqlite' to share a budget across processes
+    -   a take never waits on I/O, so coroutines may call it on the event loop
+    """
+
+    blocking = False
+
+    def __init__(self):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   client-side rate limiting for requests/min and tokens/min
+        """
+        BaseObject.__init__(self, __name__)
+        self._lock = Lock()
+        self._d_buckets = {}
+
+    def process(self,
+                d_amounts: Dict[str, Tuple[float, float]]) -> float:
+        """ Atomically take an amount from every bucket, or from none of them
+
+        Args:
+            d_amounts (Dict[str, Tuple[float, float]]): bucket name to (capacity, amount)
+
+        Returns:
+            float: 0.0 if the budget was taken, otherwise the seconds to wait before trying again
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            d_levels = {}
+            wait = 0.0
+
+            for name, (capacity, amount) in d_amounts.items():
+                level, updated = self._d_buckets.get(name, (capacity, now))
+                level = min(capacity, level + (now - updated) * capacity / 60)
+                d_levels[name] = level
+
+                if level < amount:
+                    wait = max(wait, (amount - level) * 60 / capacity)
+
+            if wait:
+                return wait
+
+            for name, (capacity, amount) in d_amounts.items():
+                self._d_buckets[name] = (d_levels[name] - amount, now)
+
+            return 0.0
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Host-Wide Token Bucket State backed by SQLite """
+
+
+from typing import Dict
+from typing import Tuple
+
+import os
+import time
+import sqlite3
+from threading import local
+
+from baseblock import BaseObject
+
+
+class BucketStoreSqlite(BaseObject):
+    """ Host-Wide Token Bucket State backed by SQLite
+
+    Notes:
+    -   every worker process on a host that points at the same file
+        draws from a single budget (e.g., a single org quota)
+    -   each take runs inside a 'BEGIN IMMEDIATE' transaction
+        so concurrent processes serialize on the database write lock
+    -   bucket timestamps use wall-clock time, since they are compared across processes
+    -   connections are opened per thread and per process, so a store may be built before forking
+    -   a take can wait on the database lock, so coroutines call it on an executor
+    """
+
+    blocking = True
+
+    def __init__(self,
+                 file_path: str):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   share the rate-limit budget across worker processes
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   open connections per process, so a store built before forking is safe in every worker
+
+        Args:
+            file_path (str): the path to the SQLite database (created if it does not exist)
+        """
+        BaseObject.__init__(self, __name__)
+        self._file_path = os.path.abspath(file_path)
+        self._local = local()
+        self._inherited = []
+
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY,
+                level REAL NOT NULL,
+                updated REAL NOT NULL
+            )""")
+
+    def _conn(self) -> sqlite3.Connection:
+        """ sqlite3 connections cannot be shared across threads or processes
+
+        A forked child never uses (or closes) a connection it inherited; it opens its own
+        """
+        conn = getattr(self._local, 'conn', None)
+        if not conn or self._local.pid != os.getpid():
+            if conn:
+                # closing an inherited handle can release locks (or checkpoint the WAL) under the parent
+                self._inherited.append(conn)
+            conn = sqlite3.connect(self._file_path,
+                                   timeout=30,
+                                   isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def process(self,
+                d_amounts: Dict[str, Tuple[float, float]]) -> float:
+        """ Atomically take an amount from every bucket, or from none of them
+
+        Args:
+            d_amounts (Dict[str, Tuple[float, float]]): bucket name to (capacity, amount)
+
+        Returns:
+            float: 0.0 if the budget was taken, otherwise the seconds to wait before trying again
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            now = time.time()
+
+            d_levels = {}
+            wait = 0.0
+
+            for name, (capacity, amount) in d_amounts.items():
+                row = conn.execute(
+                    'SELECT level, updated FROM buckets WHERE name = ?',
+                    (name,)).fetchone()
+
+                level, updated = row if row else (capacity, now)
+                level = min(capacity, level + max(0.0, now - updated) * capacity / 60)
+                d_levels[name] = level
+
+                if level < amount:
+                    wait = max(wait, (amount - level) * 60 / capacity)
+
+            if not wait:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO buckets (name, level, updated) VALUES (?, ?, ?)',
+                    [(name, d_levels[name] - amount, now)
+                     for name, (_, amount) in d_amounts.items()])
+
+            conn.execute('COMMIT')
+            return wait
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
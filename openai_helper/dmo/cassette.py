@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Append-Only Compressed Recording of HTTP Interactions """
+
+
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import os
+import json
+import zlib
+import struct
+import hashlib
+from threading import Lock
+from urllib.parse import urlsplit
+
+from baseblock import BaseObject
+
+# every frame is a 64-character hex key and the payload length, followed by the compressed payload
+FRAME_HEADER = struct.Struct('>64sI')
+
+
+class Cassette(BaseObject):
+    """ Append-Only Compressed Recording of HTTP Interactions
+
+    Notes:
+    -   each interaction is appended as a single frame and flushed
+        a crash can only ever lose (or truncate) the last frame
+    -   frame headers are not compressed, so the index is built by reading headers
+        and seeking past each payload; nothing is decompressed until it is replayed
+    -   the same request may be recorded many times
+        replay serves the recordings of a request in order, then starts again
+    """
+
+    def __init__(self,
+                 file_path: str):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   benchmark against recorded production traffic with no network access
+
+        Args:
+            file_path (str): the path to the cassette file (created if it does not exist)
+        """
+        BaseObject.__init__(self, __name__)
+        self._file_path = os.path.abspath(file_path)
+        self._lock = Lock()
+
+        self._d_index: Dict[str, List[int]] = {}
+        self._d_cursor: Dict[str, int] = {}
+        self._size = self._load_index()
+
+    @staticmethod
+    def key(method: str,
+            url: str,
+            body: Optional[bytes]) -> str:
+        """ Build the Key of a Request
+
+        The host is ignored, so a recording can be replayed against any API base
+        JSON bodies are canonicalized, so key order does not matter
+
+        Args:
+            method (str): the HTTP method
+            url (str): the request URL
+            body (bytes, optional): the request body
+
+        Returns:
+            str: the request key
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True).encode('utf-8')
+        except (TypeError, ValueError):
+            body = body or b''
+
+        parts = urlsplit(url)
+
+        digest = hashlib.sha256()
+        digest.update(f'{method.upper()} {parts.path}?{parts.query}\n'.encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def _load_index(self) -> int:
+        """ Index every complete Frame; returns the offset after the last one """
+        if not os.path.exists(self._file_path):
+            return 0
+
+        offset = 0
+        with open(self._file_path, 'rb') as f:
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    break
+
+                key, length = FRAME_HEADER.unpack(header)
+                payload_offset = offset + FRAME_HEADER.size
+
+                f.seek(length, os.SEEK_CUR)
+                if f.tell() > os.path.getsize(self._file_path):
+                    break
+
+                self._d_index.setdefault(key.decode('ascii'), []).append(payload_offset)
+                offset = payload_offset + length
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'Loaded Cassette',
+                f'\tFile Path: {self._file_path}',
+                f'\tRequests: {len(self._d_index)}']))
+
+        return offset
+
+    def __len__(self) -> int:
+        return sum(len(x) for x in self._d_index.values())
+
+    def record(self,
+               key: str,
+               d_interaction: dict) -> None:
+        """ Append an Interaction
+
+        Args:
+            key (str): the request key
+            d_interaction (dict): the recorded response (status, headers, body, elapsed)
+        """
+        payload = zlib.compress(json.dumps(
+            d_interaction, separators=(',', ':')).encode('utf-8'))
+
+        with self._lock:
+            with open(self._file_path, 'ab') as f:
+                # discard a truncated frame left by a crash
+                if f.tell() != self._size:
+                    f.truncate(self._size)
+                f.write(FRAME_HEADER.pack(key.encode('ascii'), len(payload)))
+                f.write(payload)
+                f.flush()
+
+            self._d_index.setdefault(key, []).append(self._size + FRAME_HEADER.size)
+            self._size += FRAME_HEADER.size + len(payload)
+
+    def replay(self,
+               key: str) -> Optional[dict]:
+        """ Look up the next Recording of a Request
+
+        Args:
+            key (str): the request key
+
+        Returns:
+            Optional[dict]: the recorded response, or None if the request was never recorded
+        """
+        with self._lock:
+            offsets = self._d_index.get(key)
+            if not offsets:
+                return None
+
+            cursor = self._d_cursor.get(key, 0)
+            self._d_cursor[key] = (cursor + 1) % len(offsets)
+            payload_offset = offsets[cursor]
+
+        with open(self._file_path, 'rb') as f:
+            f.seek(payload_offset - FRAME_HEADER.size)
+            _, length = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))
+            payload = f.read(length)
+
+        return json.loads(zlib.decompress(payload))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" An HTTP Adapter that Records to (or Replays from) a Cassette """
+
+
+from typing import Optional
+
+import io
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from requests.structures import CaseInsensitiveDict
+
+from openai_helper.dmo import Cassette
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class CassetteAdapter(HTTPAdapter):
+    """ An HTTP Adapter that Records to (or Replays from) a Cassette
+
+    Notes:
+    -   in 'record' mode every request is sent through the wrapped transport
+        and the response is appended to the cassette
+    -   in 'replay' mode nothing touches the network
+        the recorded response is returned after its recorded latency times 'latency_scale'
+        (0.0 replays as fast as possible)
+    -   an unrecorded request fails in replay mode with a ConnectionError
+    -   streamed responses are recorded in full, and replayed as a single burst
+        a replayed body is already read ('iter_content' and 'iter_lines' serve it from memory)
+        and is also available as 'raw' for consumers that read the raw stream
+    """
+
+    def __init__(self,
+                 cassette: Cassette,
+                 mode: str = REPLAY,
+                 latency_scale: float = 1.0,
+                 transport: Optional[HTTPAdapter] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   benchmark against recorded production traffic with no network access
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   replayed responses can be streamed ('stream=True' read an unset 'raw')
+
+        Args:
+            cassette (Cassette): the cassette to record to or replay from
+            mode (str, optional): 'record' or 'replay'. Defaults to 'replay'.
+            latency_scale (float, optional): the multiplier applied to recorded latency on replay. Defaults to 1.0.
+            transport (HTTPAdapter, optional): the adapter used to reach the network in record mode. Defaults to None.
+        """
+        super().__init__()
+
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f'Unknown Cassette Mode: {mode}')
+
+        self._cassette = cassette
+        self._mode = mode
+        self._latency_scale = latency_scale
+        self._transport = transport if transport else HTTPAdapter()
+
+    def _replay(self,
+                request: requests.PreparedRequest,
+                key: str) -> requests.Response:
+        d_interaction = self._cassette.replay(key)
+        if not d_interaction:
+            raise requests.ConnectionError(
+                f'No Recording for Request: {request.method} {request.url}',
+                request=request)
+
+        if self._latency_scale:
+            time.sleep(d_interaction['elapsed'] * self._latency_scale)
+
+        response = requests.Response()
+        response.status_code = d_interaction['status']
+        response.reason = d_interaction['reason']
+        response.headers = CaseInsensitiveDict(d_interaction['headers'])
+        response._content = d_interaction['body'].encode('latin-1')
+        response._content_consumed = True
+        response.raw = io.BytesIO(response._content)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+
+        return response
+
+    def _record(self,
+                request: requests.PreparedRequest,
+                key: str,
+                **kwargs) -> requests.Response:
+        start = time.monotonic()
+        response = self._transport.send(request, **kwargs)
+
+        # reading the content here also serves a streamed response from memory
+        body = response.content
+        elapsed = time.monotonic() - start
+
+        headers = CaseInsensitiveDict(response.headers)
+
+        # the body is stored decoded; it must not be decoded a second time on replay
+        headers.pop('Content-Encoding', None)
+        headers.pop('Transfer-Encoding', None)
+
+        self._cassette.record(key, {
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict(headers),
+            'body': body.decode('latin-1'),
+            'elapsed': elapsed,
+        })
+
+        return response
+
+    def send(self,
+             request: requests.PreparedRequest,
+             **kwargs) -> requests.Response:
+        key = Cassette.key(request.method, request.url, request.body)
+
+        if self._mode == REPLAY:
+            return self._replay(request, key)
+
+        return self._record(request, key, **kwargs)
+
+    def close(self) -> None:
+        self._transport.close()
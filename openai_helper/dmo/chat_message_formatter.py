@@ -4,10 +4,13 @@
 
 
 from typing import List
+from typing import Tuple
 
 from baseblock import Enforcer
 from baseblock import BaseObject
 
+from openai_helper.dmo import InputTokenCounter
+
 
 class ChatMessageFormatter(BaseObject):
     """ Format Chat Message Input
@@ -15,6 +18,9 @@ class ChatMessageFormatter(BaseObject):
     Notes:
     -   Roles must be ['system', 'assistant', 'user']
         custom named roles will throw an exception
+    -   'fit' keeps the system prompt and the newest messages that fit a prompt token budget
+        messages are counted newest first and counting stops at the budget, so older history is never encoded
+        the oldest messages are dropped in pairs, so the roles still alternate (user first)
     """
 
     def __init__(self):
@@ -26,9 +32,31 @@ class ChatMessageFormatter(BaseObject):
             *   https://github.com/craigtrim/openai-helper/issues/9
             *   Official Documentation:
                 https://platform.openai.com/docs/guides/chat/introduction
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   expose 'role' so 'conversation' formats messages incrementally with the same roles
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'fit' trims the history to a prompt token budget
         """
         BaseObject.__init__(self, __name__)
 
+    @staticmethod
+    def role(i: int) -> str:
+        """ The Role of the i-th Message (after the system prompt)
+
+        Args:
+            i (int): the zero-based index of the message
+
+        Returns:
+            str: 'user' for even-numbered messages, 'assistant' for odd-numbered messages
+        """
+        if i % 2 == 0:
+            return 'user'
+        return 'assistant'
+
     def process(self,
                 input_prompt: str,
                 messages: List[str]) -> List[str]:
@@ -49,14 +77,52 @@ class ChatMessageFormatter(BaseObject):
 
         for i in range(len(messages)):
 
-            def get_role() -> str:
-                if i % 2 == 0:
-                    return 'user'
-                return 'assistant'
-
             outputs.append({
-                'role': get_role(),
+                'role': self.role(i),
                 'content': messages[i]
             })
 
         return outputs
+
+    def fit(self,
+            input_prompt: str,
+            messages: List[str],
+            max_tokens: int,
+            model: str = 'gpt-3.5-turbo') -> Tuple[List[dict], int]:
+        """ Format the newest Messages that fit a Prompt Token Budget
+
+        Args:
+            input_prompt (str): the system prompt (always kept)
+            messages (List[str]): the messages (user first, then alternating)
+            max_tokens (int): the prompt token budget (system prompt included)
+            model (str, optional): the model the tokens are counted for. Defaults to 'gpt-3.5-turbo'.
+
+        Returns:
+            Tuple[List[dict], int]: the formatted messages, and their prompt tokens
+                the newest message is always kept, even when it alone exceeds the budget
+        """
+        counter = InputTokenCounter()
+        encoding = counter.encoding(model)
+        _, tokens_per_message = counter.resolve(model)
+
+        def count(content: str) -> int:
+            return tokens_per_message + len(encoding.encode_ordinary(content))
+
+        # the newest message is kept, and so is its pair when the count is even
+        n = len(messages)
+        keep_min = 2 - n % 2 if n else 0
+
+        totals = [count(input_prompt) + 3]  # the prompt tokens with the newest k messages kept
+        for content in reversed(messages):
+            totals.append(totals[-1] + count(content))
+            if totals[-1] > max_tokens and len(totals) - 1 >= keep_min:
+                break
+
+        # an even number of the oldest messages is dropped
+        kept = len(totals) - 1
+        while kept > keep_min and (totals[kept] > max_tokens or (n - kept) % 2):
+            kept -= 1
+
+        return self.process(
+            input_prompt=input_prompt,
+            messages=messages[n - kept:]), totals[kept]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Build a Chat Completion Request: everything that happens before the Network Call """
+
+
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Optional
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import ModelRegistry
+from openai_helper.dmo import ChatMessageFormatter
+from openai_helper.dmo import Conversation
+
+# without a 'max_tokens' the rate limiter budgets this many completion tokens per call
+COMPLETION_TOKENS_ESTIMATE = 256
+
+
+class ChatRequestBuilder(BaseObject):
+    """ Build a Chat Completion Request: everything that happens before the Network Call
+
+    Notes:
+    -   shared by 'run-chat-completion' and 'run-chat-completion-async'
+        each runner only owns its transport ('create' or 'acreate')
+    -   formats the messages (fitting a 'conversation' or a plain list to the prompt token budget)
+        checks the prompt and 'max_tokens' against the context window of the model
+        and derives the cache key and the rate limiter token count of the request
+    -   nothing here blocks or touches the network
+    """
+
+    def __init__(self,
+                 max_prompt_tokens: Optional[int] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   the blocking and coroutine chat runners duplicated every pre-flight step
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   check the context window against a guaranteed bound (UTF-8 length), not a token estimate
+
+        Args:
+            max_prompt_tokens (int, optional): the prompt token budget of every request. Defaults to None.
+                the system prompt and the newest messages that fit are sent (see 'chat-message-formatter')
+                if None, this is read from 'OPENAI_MAX_PROMPT_TOKENS'; if that is unset, the full history is sent
+        """
+        BaseObject.__init__(self, __name__)
+        formatter = ChatMessageFormatter()
+        self._formatter = formatter.process
+        self._fit = formatter.fit
+        self._max_prompt_tokens = max_prompt_tokens if max_prompt_tokens else EnvIO.int_or_default(
+            'OPENAI_MAX_PROMPT_TOKENS', None)
+        token_counter = InputTokenCounter()
+        self._count_tokens = token_counter.process
+        self._upper_bound = token_counter.upper_bound
+        self._registry = ModelRegistry()
+
+    def _format(self,
+                input_prompt: str,
+                messages: Union[List[str], Conversation],
+                model: str) -> Tuple[List[dict], Optional[int]]:
+        """ Format the Input Messages, and their Prompt Tokens when already known
+
+        A 'conversation' carries its own system prompt and a running token total
+        the total is only reused when the conversation was counted for the same model
+        with a prompt token budget, only the system prompt and the newest messages that fit are formatted
+        """
+        if isinstance(messages, Conversation):
+            if messages.model == model:
+                if self._max_prompt_tokens:
+                    return messages.fit(self._max_prompt_tokens)
+                return messages.formatted(), messages.total_tokens
+
+            input_prompt, messages = messages.input_prompt, messages.messages
+
+        if self._max_prompt_tokens:
+            return self._fit(
+                input_prompt=input_prompt,
+                messages=messages,
+                max_tokens=self._max_prompt_tokens,
+                model=model)
+
+        return self._formatter(
+            input_prompt=input_prompt,
+            messages=messages), None
+
+    def _budget(self,
+                input_messages: List[dict],
+                model: str,
+                prompt_tokens: Optional[int],
+                max_tokens: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        """ Check the Prompt (and 'max_tokens') against the Context Window of the Model
+
+        The prompt is bounded by its UTF-8 length, and only counted exactly when that bound could reach the context window
+        (a token estimate is not a bound: code, URLs, digits or non-latin text can exceed any calibrated error)
+
+        Raises:
+            InvalidRequestError: the prompt leaves no room for a completion
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: the prompt tokens (None unless counted), and the 'max_tokens' to send
+        """
+        d_model = self._registry.process(model)
+        if not d_model:
+            return prompt_tokens, max_tokens
+
+        if prompt_tokens is None:
+            upper = self._upper_bound(
+                messages=[x['content'] for x in input_messages],
+                model=model)
+
+            if upper + (max_tokens or 0) < d_model['context_window']:
+                return None, self._registry.budget(
+                    model=model,
+                    prompt_tokens=upper,
+                    max_tokens=max_tokens)
+
+            prompt_tokens = self._count_tokens(
+                messages=[x['content'] for x in input_messages],
+                model=model)
+
+        return prompt_tokens, self._registry.budget(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            max_tokens=max_tokens)
+
+    @staticmethod
+    def kwargs(d_request: dict) -> dict:
+        """ The Keyword Arguments of the Completion Call
+
+        Args:
+            d_request (dict): the request built by 'process'
+
+        Returns:
+            dict: 'model', 'messages' and (when set) 'max_tokens'
+        """
+        d_kwargs = {
+            'model': d_request['model'],
+            'messages': d_request['messages'],
+        }
+        if d_request['max_tokens']:
+            d_kwargs['max_tokens'] = d_request['max_tokens']
+        return d_kwargs
+
+    def cache_key(self,
+                  cache: object,
+                  d_request: dict) -> str:
+        """ The Response Cache Key of a Request
+
+        Args:
+            cache (object): either 'response-cache' or 'response-cache-sqlite' (both build keys the same way)
+            d_request (dict): the request built by 'process'
+
+        Returns:
+            str: the cache key
+        """
+        return cache.key(**self.kwargs(d_request))
+
+    def tokens(self,
+               d_request: dict) -> int:
+        """ The Tokens a Request draws from the Rate Limiter
+
+        The prompt is counted exactly (once) if it was not already counted
+
+        Args:
+            d_request (dict): the request built by 'process'
+
+        Returns:
+            int: the prompt tokens plus 'max_tokens' (or a completion estimate)
+        """
+        if d_request['prompt_tokens'] is None:
+            d_request['prompt_tokens'] = self._count_tokens(
+                messages=[x['content'] for x in d_request['messages']],
+                model=d_request['model'])
+
+        return d_request['prompt_tokens'] + (d_request['max_tokens'] or COMPLETION_TOKENS_ESTIMATE)
+
+    def process(self,
+                input_prompt: str,
+                messages: Union[List[str], Conversation],
+                model: str,
+                max_tokens: Optional[int] = None) -> dict:
+        """ Build a Chat Completion Request
+
+        Args:
+            input_prompt (str): a defined input prompt
+            messages (List[str] or Conversation): the messages to execute the chat completion upon
+                a 'conversation' supplies its own system prompt ('input_prompt' is ignored)
+            model (str): the model to use
+            max_tokens (int, optional): the maximum number of tokens to generate. Defaults to None.
+
+        Raises:
+            InvalidRequestError: the prompt alone exceeds the context window of the model
+
+        Returns:
+            dict: the request
+                messages: the formatted input messages
+                model: the model to use
+                max_tokens: the 'max_tokens' to send, trimmed to the context window (None to leave it to the model)
+                prompt_tokens: the exact prompt tokens (None unless they were counted)
+        """
+        input_messages, prompt_tokens = self._format(
+            input_prompt=input_prompt,
+            messages=messages,
+            model=model)
+
+        prompt_tokens, max_tokens = self._budget(
+            input_messages=input_messages,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            max_tokens=max_tokens)
+
+        return {
+            'messages': input_messages,
+            'model': model,
+            'max_tokens': max_tokens,
+            'prompt_tokens': prompt_tokens,
+        }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Assemble Streamed Chat Completion Chunks into a single Response """
+
+
+from typing import List
+from typing import Optional
+
+import time
+
+from baseblock import BaseObject
+
+
+class ChatStreamAssembler(BaseObject):
+    """ Assemble Streamed Chat Completion Chunks into a single Response
+
+    Notes:
+    -   one assembler is used per stream
+    -   the assembled output has the same shape as a (non-streamed) chat completion
+        so the existing 'output-extractor-chat' can be applied to it
+    -   the streaming API does not report usage
+        if a token counter is given, usage is computed locally
+    """
+
+    def __init__(self,
+                 model: str,
+                 token_counter: Optional[object] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   support 'stream=True' chat completions
+
+        Args:
+            model (str): the model the stream was requested for
+            token_counter (object, optional): an 'input-token-counter' used to compute usage. Defaults to None.
+        """
+        BaseObject.__init__(self, __name__)
+        self._model = model
+        self._token_counter = token_counter
+
+        self._id = None
+        self._created = None
+        self._role = 'assistant'
+        self._finish_reason = None
+        self._deltas = []
+
+    def process(self,
+                chunk: dict) -> Optional[str]:
+        """ Accumulate a single Chunk
+
+        Args:
+            chunk (dict): a 'chat.completion.chunk' event
+
+        Returns:
+            Optional[str]: the content delta carried by this chunk (if any)
+        """
+        if not self._id:
+            self._id = chunk.get('id')
+            self._created = chunk.get('created')
+            self._model = chunk.get('model') or self._model
+
+        choices = chunk.get('choices')
+        if not choices:
+            return None
+
+        d_choice = choices[0]
+        if d_choice.get('finish_reason'):
+            self._finish_reason = d_choice['finish_reason']
+
+        d_delta = d_choice.get('delta') or {}
+        if d_delta.get('role'):
+            self._role = d_delta['role']
+
+        content = d_delta.get('content')
+        if not content:
+            return None
+
+        self._deltas.append(content)
+        return content
+
+    def output(self,
+               input_messages: List[dict]) -> dict:
+        """ Build the Assembled Response
+
+        Args:
+            input_messages (List[dict]): the formatted messages the stream was requested for
+
+        Returns:
+            dict: the output event, in the shape of a chat completion
+        """
+        content = ''.join(self._deltas)
+
+        d_output = {
+            'id': self._id,
+            'object': 'chat.completion',
+            'created': self._created or int(time.time()),
+            'model': self._model,
+            'choices': [{
+                'index': 0,
+                'message': {
+                    'role': self._role,
+                    'content': content,
+                },
+                'finish_reason': self._finish_reason,
+            }],
+        }
+
+        if self._token_counter:
+            prompt_tokens = self._token_counter.process(
+                messages=[x['content'] for x in input_messages],
+                model=self._model)
+            completion_tokens = self._token_counter.encoded_length(
+                input_text=content,
+                model=self._model)
+
+            d_output['usage'] = {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            }
+
+        return d_output
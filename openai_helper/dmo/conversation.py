@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Chat Conversation with an Incremental Token Ledger """
+
+
+from typing import List
+from typing import Tuple
+from typing import Optional
+
+from array import array
+
+from baseblock import BaseObject
+
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import ChatMessageFormatter
+
+
+class Conversation(BaseObject):
+    """ Chat Conversation with an Incremental Token Ledger
+
+    Notes:
+    -   each message is encoded exactly once, when it is appended
+        the prompt total is kept as a running sum, so 'total-tokens' is O(1) per turn
+    -   'total-tokens' always equals 'input-token-counter' over the system prompt and every message
+        including the per-message role overhead ('tokens-per-message') of the model
+    -   roles alternate exactly as in 'chat-message-formatter' (user first)
+        and the formatted messages are also built incrementally
+    -   token ids can be kept as compact 'array("I")' buffers (4 bytes per token)
+        off by default; only the counts are needed for budgeting
+    -   pass a conversation as 'messages' to 'run-chat-completion' to skip re-counting the history
+    -   'fit' leaves out the oldest messages until the prompt fits a token budget, and 'trim' drops them
+        both walk the stored counts from the front, so the cost is O(messages dropped) with no re-encoding
+        messages are dropped in pairs (user and assistant), so the roles still alternate, user first
+        the system prompt and the newest message are always kept
+    """
+
+    def __init__(self,
+                 input_prompt: str,
+                 messages: Optional[List[str]] = None,
+                 model: str = 'gpt-3.5-turbo',
+                 keep_token_ids: bool = False):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   stop re-tokenizing the whole history on every turn of a long chat
+
+        Args:
+            input_prompt (str): the system prompt
+            messages (List[str], optional): the messages so far (user first, then alternating). Defaults to None.
+            model (str, optional): the model the tokens are counted for. Defaults to 'gpt-3.5-turbo'.
+            keep_token_ids (bool, optional): keep the token ids of every message. Defaults to False.
+        """
+        BaseObject.__init__(self, __name__)
+        self._model = model
+
+        counter = InputTokenCounter()
+        self._encoding = counter.encoding(model)
+        _, self._tokens_per_message = counter.resolve(model)
+
+        self._messages: List[str] = []
+        self._formatted: List[dict] = []
+        self._counts = array('I')
+        self._token_ids: Optional[List[array]] = [] if keep_token_ids else None
+        self._content_tokens = 0
+
+        self._add('system', input_prompt,
+                  self._encoding.encode_ordinary(input_prompt))
+
+        if messages:
+            self.extend(messages)
+
+    def _add(self,
+             role: str,
+             content: str,
+             tokens: List[int]) -> int:
+        self._formatted.append({'role': role, 'content': content})
+        self._counts.append(len(tokens))
+        self._content_tokens += len(tokens)
+
+        if self._token_ids is not None:
+            self._token_ids.append(array('I', tokens))
+
+        return len(tokens)
+
+    def append(self,
+               content: str) -> int:
+        """ Append the next Message
+
+        Args:
+            content (str): the message content
+                the role is 'user' or 'assistant' by position
+
+        Returns:
+            int: the tokens in this message (without the role overhead)
+        """
+        role = ChatMessageFormatter.role(len(self._messages))
+        self._messages.append(content)
+        return self._add(role, content, self._encoding.encode_ordinary(content))
+
+    def extend(self,
+               messages: List[str]) -> None:
+        """ Append several Messages, encoded in one Batch
+
+        Args:
+            messages (List[str]): the message contents
+        """
+        for content, tokens in zip(messages, self._encoding.encode_ordinary_batch(messages)):
+            role = ChatMessageFormatter.role(len(self._messages))
+            self._messages.append(content)
+            self._add(role, content, tokens)
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def input_prompt(self) -> str:
+        return self._formatted[0]['content']
+
+    @property
+    def messages(self) -> List[str]:
+        """ The Message Contents (without the system prompt) """
+        return list(self._messages)
+
+    @property
+    def tokens_per_message(self) -> int:
+        """ The Role Overhead the Model adds to every Message """
+        return self._tokens_per_message
+
+    @property
+    def total_tokens(self) -> int:
+        """ The Prompt Tokens of the whole Conversation (system prompt included) """
+        return self._content_tokens + self._tokens_per_message * len(self._counts) + 3
+
+    def token_counts(self) -> List[int]:
+        """ The Content Tokens of every Message (the system prompt first) """
+        return self._counts.tolist()
+
+    def token_ids(self,
+                  index: int) -> array:
+        """ The Token Ids of a Message
+
+        Args:
+            index (int): the message index (0 is the system prompt)
+
+        Raises:
+            ValueError: the conversation was created without 'keep_token_ids'
+
+        Returns:
+            array: the token ids
+        """
+        if self._token_ids is None:
+            raise ValueError('Token Ids are not kept for this Conversation')
+        return self._token_ids[index]
+
+    def _skip(self,
+              max_tokens: int) -> Tuple[int, int]:
+        """ The (even) Number of oldest Messages to leave out, and the Prompt Tokens without them """
+        total = self.total_tokens
+        limit = len(self._messages) - 1
+
+        skip = 0
+        while total > max_tokens and skip + 2 <= limit:
+            total -= self._counts[skip + 1] + self._counts[skip + 2] + 2 * self._tokens_per_message
+            skip += 2
+
+        return skip, total
+
+    def fit(self,
+            max_tokens: int) -> Tuple[List[dict], int]:
+        """ The newest Messages that fit a Prompt Token Budget
+
+        The conversation itself is not changed
+
+        Args:
+            max_tokens (int): the prompt token budget (system prompt included)
+
+        Returns:
+            Tuple[List[dict], int]: the formatted messages, and their prompt tokens
+                the prompt tokens may still exceed the budget when the system prompt and newest message do
+        """
+        skip, total = self._skip(max_tokens)
+        return [self._formatted[0]] + self._formatted[skip + 1:], total
+
+    def trim(self,
+             max_tokens: int) -> int:
+        """ Drop the oldest Messages until the Prompt fits a Token Budget
+
+        Args:
+            max_tokens (int): the prompt token budget (system prompt included)
+
+        Returns:
+            int: the number of messages dropped
+        """
+        skip, total = self._skip(max_tokens)
+        if not skip:
+            return 0
+
+        del self._messages[:skip]
+        del self._formatted[1:skip + 1]
+        del self._counts[1:skip + 1]
+        if self._token_ids is not None:
+            del self._token_ids[1:skip + 1]
+
+        self._content_tokens = total - self._tokens_per_message * len(self._counts) - 3
+        return skip
+
+    def formatted(self) -> List[dict]:
+        """ The Messages formatted for a Chat Completion
+
+        Returns:
+            List[dict]: identical to 'chat-message-formatter' over the system prompt and messages
+        """
+        return list(self._formatted)
+
+    def __len__(self) -> int:
+        return len(self._messages)
@@ -7,7 +7,11 @@ from baseblock import BaseObject
 
 
 class EtlHandleTextCompletions(BaseObject):
-    """ Handle Situations where OpenAI tries to complete a User Sentence """
+    """ Handle Situations where OpenAI tries to complete a User Sentence
+
+    Not streamable: paragraph selection and quote stripping need the complete output text
+    and are skipped by 'output-extractor-stream'
+    """
 
     def __init__(self):
         """ Change Log
@@ -3,12 +3,30 @@
 """ A Generic Service to Extract Unstructured Output from an OpenAI response """
 
 
+from typing import Dict
+from typing import Optional
+
+import re
+import json
+
+from baseblock import EnvIO
 from baseblock import BaseObject
-from baseblock import TextMatcher
 
 
 class EtlRemovePromptIndicators(BaseObject):
-    """ A Generic Service to Extract Unstructured Output from an OpenAI response """
+    """ A Generic Service to Extract Unstructured Output from an OpenAI response
+
+    Notes:
+    -   every indicator is compiled into one alternation, so the output is scanned once
+        alternatives are tried in dictionary order, so where indicators overlap the earlier one wins
+    -   matching is case-insensitive: the pattern runs over a lowercased copy of the output
+        each match starts with a literal space (the copy is prefixed with one), which the regex engine scans for quickly
+    -   an indicator only matches as a whole: bounded by a space or the start or end of the text
+        (the same boundaries as 'TextMatcher')
+    -   the text around a match keeps its case; only the indicator itself is replaced
+    -   extra indicators are read as JSON from the 'OPENAI_PROMPT_INDICATORS' environment variable
+        (indicator to replacement; these follow the built-in indicators and can override them)
+    """
 
     __d_replacements = {
         'User:': '',
@@ -25,7 +43,8 @@ class EtlRemovePromptIndicators(BaseObject):
         "I'm an AI language model": "I'm a bot",
     }
 
-    def __init__(self):
+    def __init__(self,
+                 indicators: Optional[Dict[str, str]] = None):
         """ Change Log
 
         Created:
@@ -41,9 +60,57 @@ class EtlRemovePromptIndicators(BaseObject):
             18-May-2023
             craigtrim@gmail.com
             *   move replacements into a dictionary
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   expose 'lookahead' for the streaming extractor
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   replace every indicator in a single pass of one compiled pattern
+                and accept extra indicators from configuration
+
+        Args:
+            indicators (Dict[str, str], optional): extra indicators and their replacements. Defaults to None.
+                if None, these are read from the 'OPENAI_PROMPT_INDICATORS' environment variable
         """
         BaseObject.__init__(self, __name__)
 
+        d_replacements = self._replacements(indicators)
+
+        # the first spelling of an indicator wins, as it does in the alternation
+        self._d_replacements = {}
+        for k, v in d_replacements.items():
+            self._d_replacements.setdefault(k.lower(), v)
+
+        self._pattern = re.compile(
+            ' (?:{})(?![^ ])'.format(
+                '|'.join(re.escape(x.lower()) for x in d_replacements)))
+
+    @classmethod
+    def _replacements(cls,
+                      indicators: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """ The built-in Indicators followed by any configured Indicators """
+        if indicators is None:
+            indicators = json.loads(EnvIO.str_or_default(
+                'OPENAI_PROMPT_INDICATORS', '{}'))
+
+        d_replacements = dict(cls.__d_replacements)
+        d_replacements.update(indicators)
+        return d_replacements
+
+    @classmethod
+    def lookahead(cls) -> int:
+        """ The Length of the longest Prompt Indicator
+
+        A streaming caller must hold back this many characters
+        before it can be sure no indicator straddles the next chunk
+
+        Returns:
+            int: the character count
+        """
+        return max(len(x) for x in cls._replacements())
+
     def process(self,
                 input_text: str,
                 output_text: str) -> str:
@@ -60,18 +127,24 @@ class EtlRemovePromptIndicators(BaseObject):
             str: the potentially modified output text
         """
 
-        for k in self.__d_replacements:
-            if not TextMatcher.exists(
-                    value=k,
-                    input_text=output_text,
-                    case_sensitive=False):
-                continue
-
-            output_text = TextMatcher.replace(
-                input_text=output_text,
-                old_value=k,
-                new_value=self.__d_replacements[k],
-                case_sensitive=False,
-                recursive=False)
-
-        return output_text
+        lowered = output_text.lower()
+
+        # a few characters change length when lowercased; keep those as they are so offsets line up
+        if len(lowered) != len(output_text):
+            lowered = ''.join(x.lower() if len(x.lower()) == 1 else x
+                              for x in output_text)
+
+        # offsets in the padded copy are one past the same offsets in the output
+        outputs = []
+        position = 0
+
+        for match in self._pattern.finditer(f' {lowered}'):
+            outputs.append(output_text[position:match.start()])
+            outputs.append(self._d_replacements[match.group(0)[1:]])
+            position = match.end() - 1
+
+        if not outputs:
+            return output_text
+
+        outputs.append(output_text[position:])
+        return ''.join(outputs)
@@ -3,21 +3,98 @@
 """ Replace Cliched Responses, which just add noise to the output """
 
 
+from typing import List
+from typing import Tuple
+from typing import Optional
+
+import os
+from threading import Lock
+
+from baseblock import EnvIO
 from baseblock import BaseObject
 
+from openai_helper.dmo import PhraseMatcher
+
 
 class EtlReplaceCliches(BaseObject):
-    """ A Generic Service to Extract Unstructured Output from an OpenAI response """
+    """ A Generic Service to Extract Unstructured Output from an OpenAI response
+
+    Notes:
+    -   the built-in cliches and any dictionary files are compiled into a single 'phrase-matcher'
+        every cliche is removed in one pass, and the cost barely grows with the size of the dictionaries
+    -   dictionary files are read from the 'OPENAI_CLICHE_FILES' environment variable
+        (paths separated by the path separator, e.g. ':' on Linux)
+    -   a matcher is built once per set of dictionary files and shared by every instance
+    """
+
+    __long_texts = [
+        "and that's where Loqi comes in.",
+        "If you're looking for a chatbot that will give you sassy responses to your questions",
+        'look no further than Loqi',
+        "He may not be the most helpful chatbot out there, but he's definitely the funniest",
+        'Loqi is a chatbot that reluctantly answers questions in a mocking tone',
+        'is a chatbot that responds to questions with',
+        'is a chatbot that reluctantly answers questions',
+    ]
 
-    def __init__(self):
+    __d_matchers = {}
+    __lock = Lock()
+
+    def __init__(self,
+                 file_paths: Optional[List[str]] = None):
         """ Change Log
 
         Created:
             4-Aug-2022
             craigtrim@gmail.com
             *   https://bast-ai.atlassian.net/browse/COR-56
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   move cliches into a class list and expose 'lookahead' for the streaming extractor
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   match every cliche in one pass of a compiled 'phrase-matcher'
+                and load extra cliches from dictionary files
+
+        Args:
+            file_paths (List[str], optional): dictionary files with extra cliches. Defaults to None.
+                if None, these are read from the 'OPENAI_CLICHE_FILES' environment variable
         """
         BaseObject.__init__(self, __name__)
+        self._matcher = self._cached(self._file_paths(file_paths))
+
+    @staticmethod
+    def _file_paths(file_paths: Optional[List[str]] = None) -> Tuple[str, ...]:
+        if file_paths is None:
+            file_paths = EnvIO.str_or_default(
+                'OPENAI_CLICHE_FILES', '').split(os.pathsep)
+        return tuple(x for x in file_paths if x)
+
+    @classmethod
+    def _cached(cls,
+                file_paths: Tuple[str, ...]) -> PhraseMatcher:
+        """ The (shared) Matcher for the built-in Cliches and a set of Dictionary Files """
+        if file_paths not in cls.__d_matchers:
+            with cls.__lock:
+                if file_paths not in cls.__d_matchers:
+                    cls.__d_matchers[file_paths] = PhraseMatcher(
+                        cls.__long_texts + PhraseMatcher.load(file_paths))
+
+        return cls.__d_matchers[file_paths]
+
+    @classmethod
+    def lookahead(cls) -> int:
+        """ The Length of the longest Cliche
+
+        A streaming caller must hold back this many characters
+        before it can be sure no cliche straddles the next chunk
+
+        Returns:
+            int: the character count
+        """
+        return cls._cached(cls._file_paths()).lookahead
 
     def process(self,
                 input_text: str,
@@ -31,19 +108,4 @@ class EtlReplaceCliches(BaseObject):
         Returns:
             str: the potentially modified output text
         """
-
-        long_texts = [
-            "and that's where Loqi comes in.",
-            "If you're looking for a chatbot that will give you sassy responses to your questions",
-            'look no further than Loqi',
-            "He may not be the most helpful chatbot out there, but he's definitely the funniest",
-            'Loqi is a chatbot that reluctantly answers questions in a mocking tone'
-            'is a chatbot that responds to questions with',
-            'is a chatbot that reluctantly answers questions',
-        ]
-
-        for long_text in long_texts:
-            if long_text in output_text:
-                output_text = output_text.replace(long_text, '')
-
-        return output_text
+        return self._matcher.process(output_text)
@@ -9,7 +9,11 @@ from baseblock import BaseObject
 
 
 class EtlReplaceDuplicatedInput(BaseObject):
-    """ Replace any Input that is Quoted in the Output Text """
+    """ Replace any Input that is Quoted in the Output Text
+
+    Not streamable: the decision needs the complete output text
+    and is skipped by 'output-extractor-stream'
+    """
 
     def __init__(self):
         """ Change Log
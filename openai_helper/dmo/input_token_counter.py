@@ -4,20 +4,105 @@
 
 
 from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Optional
+
+import os
+import hashlib
 
 from tiktoken.core import Encoding
-from tiktoken import encoding_for_model
+from tiktoken import get_encoding
+from tiktoken.load import load_tiktoken_bpe
+from tiktoken.load import data_gym_to_mergeable_bpe_ranks
+from tiktoken.model import encoding_name_for_model
 
+from baseblock import EnvIO
 from baseblock import BaseObject
 
+from openai_helper.dmo import ModelRegistry
+
 GPT35_TURBO_LATEST = 'gpt-3.5-turbo-0301'
 GPT4_LATEST = 'gpt-4-0314'
 
+# the models 'warmup' loads encodings for when none are given
+WARMUP_MODELS = (GPT35_TURBO_LATEST, GPT4_LATEST, 'text-davinci-003')
+
+ENDOFTEXT = '<|endoftext|>'
+FIM_PREFIX = '<|fim_prefix|>'
+FIM_MIDDLE = '<|fim_middle|>'
+FIM_SUFFIX = '<|fim_suffix|>'
+ENDOFPROMPT = '<|endofprompt|>'
+
+R50K_PATTERN = r"""'(?:[sdmt]|ll|ve|re)| ?\p{L}++| ?\p{N}++| ?[^\s\p{L}\p{N}]++|\s++$|\s+(?!\S)|\s"""
+CL100K_PATTERN = r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s"""
+O200K_PATTERN = '|'.join([
+    r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+    r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+    r"""\p{N}{1,3}""",
+    r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+    r"""\s*[\r\n]+""",
+    r"""\s+(?!\S)""",
+    r"""\s+""",
+])
+
+# the encodings that can be read from a local directory (as published in 'tiktoken_ext.openai_public')
+#   file: the published file (matched by name, or by the tiktoken cache layout)
+#   sha256: the published hash of that file
+LOCAL_ENCODINGS = {
+    'r50k_base': {
+        'file': 'https://openaipublic.blob.core.windows.net/encodings/r50k_base.tiktoken',
+        'sha256': '306cd27f03c1a714eca7108e03d66b7dc042abe8c258b44c199a7ed9838dd930',
+        'pat_str': R50K_PATTERN,
+        'special_tokens': {ENDOFTEXT: 50256},
+        'explicit_n_vocab': 50257,
+    },
+    'p50k_base': {
+        'file': 'https://openaipublic.blob.core.windows.net/encodings/p50k_base.tiktoken',
+        'sha256': '94b5ca7dff4d00767bc256fdd1b27e5b17361d7b8a5f968547f9f23eb70d2069',
+        'pat_str': R50K_PATTERN,
+        'special_tokens': {ENDOFTEXT: 50256},
+        'explicit_n_vocab': 50281,
+    },
+    'p50k_edit': {
+        'file': 'https://openaipublic.blob.core.windows.net/encodings/p50k_base.tiktoken',
+        'sha256': '94b5ca7dff4d00767bc256fdd1b27e5b17361d7b8a5f968547f9f23eb70d2069',
+        'pat_str': R50K_PATTERN,
+        'special_tokens': {ENDOFTEXT: 50256, FIM_PREFIX: 50281, FIM_MIDDLE: 50282, FIM_SUFFIX: 50283},
+        'explicit_n_vocab': None,
+    },
+    'cl100k_base': {
+        'file': 'https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken',
+        'sha256': '223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7',
+        'pat_str': CL100K_PATTERN,
+        'special_tokens': {ENDOFTEXT: 100257, FIM_PREFIX: 100258, FIM_MIDDLE: 100259,
+                           FIM_SUFFIX: 100260, ENDOFPROMPT: 100276},
+        'explicit_n_vocab': None,
+    },
+    'o200k_base': {
+        'file': 'https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken',
+        'sha256': '446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d',
+        'pat_str': O200K_PATTERN,
+        'special_tokens': {ENDOFTEXT: 199999, ENDOFPROMPT: 200018},
+        'explicit_n_vocab': None,
+    },
+}
+
+# 'gpt2' is published as a pair of GPT-2 data gym files rather than a '.tiktoken' file
+GPT2_FILES = {
+    'vocab_bpe_file': 'https://openaipublic.blob.core.windows.net/gpt-2/encodings/main/vocab.bpe',
+    'encoder_json_file': 'https://openaipublic.blob.core.windows.net/gpt-2/encodings/main/encoder.json',
+    'vocab_bpe_hash': '1ce1664773c50f3e0cc8842619a93edc4624525b728b188a9e0be33b7726adc5',
+    'encoder_json_hash': '196139668be63f3b5d6574427317ae82f612a97c5d1cdaf36ed2256dbf636783',
+}
+
 
 class InputTokenCounter(BaseObject):
     """ Count Tokens accurately with Tiktoken
 
     Encoding Name       OpenAI Models
+    o200k_base          gpt-4o
+                        gpt-4o-mini
     cl100k_base	        gpt-4
                         gpt-3.5-turbo
                         text-embedding-ada-002
@@ -25,11 +110,19 @@ class InputTokenCounter(BaseObject):
                         text-davinci-002
                         text-davinci-003
     r50k_base           GPT-3 models like davinci
+
+    Notes:
+    -   tiktoken downloads each encoding the first time it is used
+        set 'OPENAI_TIKTOKEN_DIR' (or pass 'encoding_dir') to load encodings from a local directory instead
+        the directory holds each '<encoding>.tiktoken' file (or uses the tiktoken cache layout)
+        nothing is downloaded; a missing file raises 'FileNotFoundError'
+    -   call 'warmup' before serving (or before forking workers) so no request waits on a download
     """
 
     __d_encoding = {}
 
-    def __init__(self):
+    def __init__(self,
+                 encoding_dir: Optional[str] = None):
         """ Change Log
 
         Created:
@@ -40,88 +133,315 @@ class InputTokenCounter(BaseObject):
             3-May-2023
             craigtrim@gmail.com
             *   refactor model if/else conditions
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   add 'encoded-length' for counting streamed completion text
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   encode each message once (was once per message, O(n^2) and overcounted)
+                and add 'process-many' for batched, multi-threaded counting
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   load encodings from a local directory and add 'warmup'
+            *   the unknown-model fallback passed an encoding name to 'encoding_for_model'
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   read local encodings directly instead of redirecting 'TIKTOKEN_CACHE_DIR'
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   count registered models with the encoding in 'model-registry' (e.g., 'gpt-4o' uses o200k_base)
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   build local encodings from the public tiktoken loaders, not by rebinding 'tiktoken_ext' internals
+
+        Args:
+            encoding_dir (str, optional): a local directory of tiktoken encodings. Defaults to None.
+                override with the 'OPENAI_TIKTOKEN_DIR' environment variable
         """
         BaseObject.__init__(self, __name__)
+        self._encoding_dir = EnvIO.str_or_default(
+            'OPENAI_TIKTOKEN_DIR', encoding_dir)
+        self._registry = ModelRegistry()
+
+    def _local_file(self,
+                    url: str) -> str:
+        """ The Path of a tiktoken File in the local Directory """
+        file_names = [
+            hashlib.sha1(url.encode()).hexdigest(),  # the tiktoken cache layout
+            os.path.basename(url),                   # e.g., 'cl100k_base.tiktoken'
+        ]
+
+        for file_name in file_names:
+            file_path = os.path.join(self._encoding_dir, file_name)
+            if os.path.exists(file_path):
+                return file_path
+
+        raise FileNotFoundError('\n'.join([
+            'Encoding Not Found in the Local Directory',
+            f'\tDirectory: {self._encoding_dir}',
+            f'\tExpected Files: {file_names}',
+            f'\tSource: {url}']))
+
+    def _load(self,
+              encoding_name: str) -> Encoding:
+        """ Load an Encoding (from the local directory, if one is configured)
+
+        Local files are read with the public tiktoken loaders (and checked against their published hash)
+        the pattern and special tokens of each encoding are defined here ('LOCAL_ENCODINGS')
+        so nothing is downloaded and no process-wide state (e.g., 'TIKTOKEN_CACHE_DIR') is touched
+        """
+        if not self._encoding_dir:
+            return get_encoding(encoding_name)
+
+        if encoding_name == 'gpt2':
+            mergeable_ranks = data_gym_to_mergeable_bpe_ranks(
+                self._local_file(GPT2_FILES['vocab_bpe_file']),
+                self._local_file(GPT2_FILES['encoder_json_file']),
+                GPT2_FILES['vocab_bpe_hash'],
+                GPT2_FILES['encoder_json_hash'])
+
+            return Encoding(
+                name='gpt2',
+                pat_str=R50K_PATTERN,
+                mergeable_ranks=mergeable_ranks,
+                special_tokens={ENDOFTEXT: 50256},
+                explicit_n_vocab=50257)
+
+        if encoding_name not in LOCAL_ENCODINGS:
+            raise ValueError(f'Unknown Encoding: {encoding_name}')
+
+        d_encoding = LOCAL_ENCODINGS[encoding_name]
+
+        return Encoding(
+            name=encoding_name,
+            pat_str=d_encoding['pat_str'],
+            mergeable_ranks=load_tiktoken_bpe(
+                self._local_file(d_encoding['file']),
+                expected_hash=d_encoding['sha256']),
+            special_tokens=d_encoding['special_tokens'],
+            explicit_n_vocab=d_encoding['explicit_n_vocab'])
 
     def _cached_model(self,
                       model: str) -> Encoding:
         if model not in self.__d_encoding:
 
-            try:
+            d_model = self._registry.process(model)
+            if d_model and d_model['encoding']:
+                encoding_name = d_model['encoding']
+
+            else:
+
+                try:
+
+                    encoding_name = encoding_name_for_model(model)
 
-                self.__d_encoding[model] = encoding_for_model(model)
+                except KeyError:
+                    self.logger.error('\n'.join([
+                        'Warning: model not found.',
+                        f'\tModel: {model}',
+                        f'\tUsing cl100k_base encoding.']))
+                    encoding_name = 'cl100k_base'
 
-            except KeyError:
-                self.logger.error('\n'.join([
-                    'Warning: model not found.',
-                    f'\tModel: {model}',
-                    f'\tUsing cl100k_base encoding.']))
-                self.__d_encoding[model] = encoding_for_model(
-                    'cl100k_base')
+            self.__d_encoding[model] = self._load(encoding_name)
 
         return self.__d_encoding[model]
 
-    def process(self,
-                messages: List[str],
-                model: str = 'gpt-3.5-turbo-0301') -> int:
-        """ Count the Number of Tokens in an Input String
+    def warmup(self,
+               models: Optional[List[str]] = None) -> List[str]:
+        """ Load the Encodings of every Model ahead of the first Request
 
-        Counting tokens is not the same as "tokenizing a string" and counting the result
-        OpenAI has a different technique for arriving at this count and this varies by model
+        Args:
+            models (List[str], optional): the models to load encodings for. Defaults to None.
+                if None, the current GPT-3.5, GPT-4 and text-davinci models are loaded
 
-        Reference:
-            https://github.com/openai/openai-cookbook/blob/main/examples/How_to_count_tokens_with_tiktoken.ipynb
+        Returns:
+            List[str]: the names of the loaded encodings
+        """
+        encoding_names = []
+
+        for model in models or WARMUP_MODELS:
+            encoding_name = self.encoding(model).name
+            if encoding_name not in encoding_names:
+                encoding_names.append(encoding_name)
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'Loaded Encodings',
+                f'\tEncodings: {encoding_names}',
+                f'\tDirectory: {self._encoding_dir}']))
+
+        return encoding_names
+
+    def encoded_length(self,
+                       input_text: str,
+                       model: str = 'gpt-3.5-turbo-0301') -> int:
+        """ Count the Tokens in a single Text without any Message Overhead
+
+        Use this for completion text, which is not wrapped in a chat message
+        special-token strings (e.g., '<|endoftext|>') are counted as plain text, as in 'process'
 
         Args:
-            messages (List[str] or str): a List of strings or simply an input string
+            input_text (str): the input text
             model (str, optional): the model to use for counting tokens. Defaults to "gpt-3.5-turbo-0301".
-                token counting varies between models
-                however, if you don't know your OpenAI model just leave this value at the default
 
         Returns:
             int: the total tokens
         """
-
-        if type(messages) == str:
-            messages = [messages]
-
         if not model or not len(model):
             model = GPT35_TURBO_LATEST
+        return len(self._cached_model(model).encode_ordinary(input_text))
 
-        encoding = self._cached_model(model)
+    def resolve(self,
+                model: str) -> Tuple[str, int]:
+        """ Resolve a Model to its Counting Model and Per-Message Overhead
+
+        Args:
+            model (str): the requested model
+
+        Returns:
+            Tuple[str, int]: the model to count with, and the tokens added per message
+        """
+        if not model or not len(model):
+            return GPT35_TURBO_LATEST, 4
 
         if model == GPT35_TURBO_LATEST:
-            tokens_per_message = 4
+            return model, 4
+
+        if model == GPT4_LATEST:
+            return model, 3
 
-        elif model == GPT4_LATEST:
-            tokens_per_message = 3
+        # a registered model is counted with its own encoding (see 'model-registry')
+        if self._registry.process(model):
+            return model, 3 if model.startswith('gpt-4') else 4
 
-        elif model.startswith('gpt-3.5'):
+        if model.startswith('gpt-3.5'):
             if self.isEnabledForDebug:
                 self.logger.debug('\n'.join([
                     'Model Assumption',
                     f'\tSpecified Model: {model}',
                     f'\tAssumed Model: {GPT35_TURBO_LATEST}']))
-            return self.process(messages=messages, model=GPT35_TURBO_LATEST)
+            return GPT35_TURBO_LATEST, 4
 
-        elif model.startswith('gpt-4'):
+        if model.startswith('gpt-4'):
             if self.isEnabledForDebug:
                 self.logger.debug('\n'.join([
                     'Model Assumption',
                     f'\tSpecified Model: {model}',
                     f'\tAssumed Model: {GPT4_LATEST}']))
-            return self.process(messages=messages, model=GPT4_LATEST)
+            return GPT4_LATEST, 3
+
+        # raise NotImplementedError(
+        #     f"""num_tokens_from_messages() is not implemented for model {model}. See https://github.com/openai/openai-python/blob/main/chatml.md for information on how messages are converted to tokens.""")
+        return model, 4  # just some default ...
+
+    def encoding(self,
+                 model: str) -> Encoding:
+        """ The (cached) Encoding used to count Tokens for a Model
+
+        Args:
+            model (str): the requested model
+
+        Returns:
+            Encoding: the tiktoken encoding
+        """
+        return self._cached_model(self.resolve(model)[0])
+
+    def process(self,
+                messages: List[str],
+                model: str = 'gpt-3.5-turbo-0301') -> int:
+        """ Count the Number of Tokens in an Input String
+
+        Counting tokens is not the same as "tokenizing a string" and counting the result
+        OpenAI has a different technique for arriving at this count and this varies by model
+
+        Reference:
+            https://github.com/openai/openai-cookbook/blob/main/examples/How_to_count_tokens_with_tiktoken.ipynb
+
+        Args:
+            messages (List[str] or str): a List of strings or simply an input string
+            model (str, optional): the model to use for counting tokens. Defaults to "gpt-3.5-turbo-0301".
+                token counting varies between models
+                however, if you don't know your OpenAI model just leave this value at the default
+
+        Returns:
+            int: the total tokens
+        """
+
+        if type(messages) == str:
+            messages = [messages]
 
-        else:
-            # raise NotImplementedError(
-            #     f"""num_tokens_from_messages() is not implemented for model {model}. See https://github.com/openai/openai-python/blob/main/chatml.md for information on how messages are converted to tokens.""")
-            tokens_per_message = 4  # just some default ...
+        model, tokens_per_message = self.resolve(model)
+        encoding = self._cached_model(model)
 
         num_tokens = 0
         for message in messages:
             num_tokens += tokens_per_message
-            for message in messages:
-                num_tokens += len(encoding.encode(message))
+            num_tokens += len(encoding.encode_ordinary(message))
 
         num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
         return num_tokens
+
+    def upper_bound(self,
+                    messages: List[str],
+                    model: str = 'gpt-3.5-turbo-0301') -> int:
+        """ A Guaranteed Upper Bound on 'process' without Tokenizing
+
+        Every BPE token spans at least one byte, so the UTF-8 length of a message bounds its tokens
+        whatever the text (prose, code, URLs, digits, non-latin scripts or whitespace runs)
+
+        Args:
+            messages (List[str] or str): a List of strings or simply an input string
+            model (str, optional): the model to use for counting tokens. Defaults to "gpt-3.5-turbo-0301".
+
+        Returns:
+            int: never less than 'process' for the same input
+        """
+        if type(messages) == str:
+            messages = [messages]
+
+        _, tokens_per_message = self.resolve(model)
+
+        return sum(len(x.encode('utf-8')) + tokens_per_message for x in messages) + 3
+
+    def process_many(self,
+                     conversations: List[Union[List[str], str]],
+                     model: str = 'gpt-3.5-turbo-0301',
+                     num_threads: int = 8) -> List[int]:
+        """ Count the Tokens of many Conversations in one Batch
+
+        Every message of every conversation is encoded in a single tiktoken batch
+        tiktoken releases the GIL while encoding, so the batch is spread across threads
+
+        Args:
+            conversations (List[List[str] or str]): a list of message lists (or input strings)
+            model (str, optional): the model to use for counting tokens. Defaults to "gpt-3.5-turbo-0301".
+            num_threads (int, optional): the number of encoding threads. Defaults to 8.
+
+        Returns:
+            List[int]: the total tokens of each conversation (in order); each equal to 'process'
+        """
+        conversations = [[x] if type(x) == str else x for x in conversations]
+
+        model, tokens_per_message = self.resolve(model)
+        encoding = self._cached_model(model)
+
+        encoded = encoding.encode_ordinary_batch(
+            [message for messages in conversations for message in messages],
+            num_threads=num_threads)
+
+        totals = []
+        offset = 0
+        for messages in conversations:
+            num_tokens = 3  # every reply is primed with <|start|>assistant<|message|>
+            for tokens in encoded[offset:offset + len(messages)]:
+                num_tokens += tokens_per_message + len(tokens)
+            offset += len(messages)
+            totals.append(num_tokens)
+
+        return totals
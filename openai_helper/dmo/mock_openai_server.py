@@ -0,0 +1,405 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Local Mock of the OpenAI HTTP API for Load Testing """
+
+
+from typing import Any
+from typing import List
+from typing import Optional
+
+import json
+import math
+import time
+import uuid
+import asyncio
+from random import Random
+from threading import Lock
+from threading import Thread
+
+from baseblock import BaseObject
+
+LATENCY_DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal')
+
+DEFAULT_REPLY = 'This is a mock response from the local OpenAI server.'
+
+
+class MockOpenAIServer(BaseObject):
+    """ Local Mock of the OpenAI HTTP API for Load Testing
+
+    Notes:
+    -   implements 'POST /v1/chat/completions' and 'POST /v1/completions'
+        including server-sent-event streaming ('stream': true)
+    -   every request waits for a first-token latency drawn from 'latency_distribution'
+        then for one token every 1 / 'tokens_per_second' seconds (0 for no token delay)
+    -   'rate_429' and 'rate_503' are the probabilities of answering with a rate-limit
+        or an overload error; errors carry the same bodies and headers OpenAI sends
+    -   tokens are whitespace-delimited words; the reply is truncated to 'max_tokens'
+    -   any API key is accepted
+    -   point the connector at the server with 'OPENAI_API_BASE' (see 'base_url')
+    """
+
+    def __init__(self,
+                 latency_distribution: str = 'constant',
+                 latency_mean: float = 0.0,
+                 latency_stdev: float = 0.0,
+                 tokens_per_second: float = 0.0,
+                 rate_429: float = 0.0,
+                 rate_503: float = 0.0,
+                 retry_after: float = 1.0,
+                 reply: str = DEFAULT_REPLY,
+                 seed: Optional[int] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   load-test retry, rate limiting and pooling without spending real quota
+
+        Args:
+            latency_distribution (str, optional): one of 'constant', 'uniform', 'exponential' or 'lognormal'. Defaults to 'constant'.
+            latency_mean (float, optional): the mean first-token latency in seconds. Defaults to 0.0.
+            latency_stdev (float, optional): the spread of the first-token latency in seconds. Defaults to 0.0.
+                'uniform' draws from mean +/- stdev; ignored by 'constant' and 'exponential'
+            tokens_per_second (float, optional): the token generation rate. Defaults to 0.0 (no token delay).
+            rate_429 (float, optional): the probability (0.0 - 1.0) of a 429 rate-limit error. Defaults to 0.0.
+            rate_503 (float, optional): the probability (0.0 - 1.0) of a 503 overload error. Defaults to 0.0.
+            retry_after (float, optional): the 'Retry-After' header sent with a 429. Defaults to 1.0.
+            reply (str, optional): the completion text. Defaults to a fixed sentence.
+            seed (int, optional): seed the latency and error draws for a repeatable run. Defaults to None.
+        """
+        BaseObject.__init__(self, __name__)
+
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f'Unknown Latency Distribution: {latency_distribution}')
+
+        self._latency_distribution = latency_distribution
+        self._latency_mean = latency_mean
+        self._latency_stdev = latency_stdev
+        self._tokens_per_second = tokens_per_second
+        self._rate_429 = rate_429
+        self._rate_503 = rate_503
+        self._retry_after = retry_after
+        self._reply = reply
+
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._d_counts = {
+            'requests': 0,
+            'streams': 0,
+            'status_200': 0,
+            'status_429': 0,
+            'status_503': 0,
+        }
+        self._in_flight = 0
+        self._max_in_flight = 0
+
+        self._runner = None
+        self._loop = None
+        self._thread = None
+        self._base_url = None
+
+    def _latency(self) -> float:
+        """ Draw a First-Token Latency """
+        mean = self._latency_mean
+        stdev = self._latency_stdev
+
+        if self._latency_distribution == 'uniform':
+            return max(0.0, self._random.uniform(mean - stdev, mean + stdev))
+
+        if self._latency_distribution == 'exponential':
+            return self._random.expovariate(1 / mean) if mean else 0.0
+
+        if self._latency_distribution == 'lognormal':
+            if not mean:
+                return 0.0
+
+            # choose mu and sigma so the draw has the requested mean and standard deviation
+            sigma2 = math.log(1 + (stdev / mean) ** 2)
+            mu = math.log(mean) - sigma2 / 2
+            return self._random.lognormvariate(mu, sigma2 ** 0.5)
+
+        return mean
+
+    def _error(self) -> Optional[int]:
+        """ Draw an Injected Error Status (or None) """
+        draw = self._random.random()
+        if draw < self._rate_429:
+            return 429
+        if draw < self._rate_429 + self._rate_503:
+            return 503
+        return None
+
+    def _tokens(self,
+                max_tokens: Optional[int]) -> List[str]:
+        tokens = self._reply.split(' ')
+        if max_tokens:
+            tokens = tokens[:max_tokens]
+        return [x if i == 0 else f' {x}' for i, x in enumerate(tokens)]
+
+    def _count(self,
+               name: str) -> None:
+        with self._lock:
+            self._d_counts[name] += 1
+
+    @staticmethod
+    def _prompt_tokens(d_request: dict) -> int:
+        if 'messages' in d_request:
+            return sum(len(str(x.get('content', '')).split()) + 4
+                       for x in d_request['messages'])
+
+        prompt = d_request.get('prompt', '')
+        if isinstance(prompt, list):
+            prompt = ' '.join(str(x) for x in prompt)
+        return len(str(prompt).split())
+
+    @staticmethod
+    def _body(d_request: dict,
+              chat: bool,
+              text: str,
+              completion_id: str,
+              finish_reason: Optional[str],
+              stream: bool) -> dict:
+        """ Build a Response Body (or a single Streamed Chunk) """
+        if chat:
+            if stream:
+                choice = {'index': 0, 'delta': {'content': text} if text else {}}
+            else:
+                choice = {'index': 0, 'message': {
+                    'role': 'assistant', 'content': text}}
+            obj = 'chat.completion.chunk' if stream else 'chat.completion'
+        else:
+            choice = {'index': 0, 'text': text, 'logprobs': None}
+            obj = 'text_completion'
+
+        choice['finish_reason'] = finish_reason
+
+        return {
+            'id': completion_id,
+            'object': obj,
+            'created': int(time.time()),
+            'model': d_request.get('model') or d_request.get('engine') or 'mock',
+            'choices': [choice],
+        }
+
+    async def _handle(self,
+                      request: Any,
+                      chat: bool) -> Any:
+        from aiohttp import web
+
+        self._count('requests')
+
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+        try:
+            try:
+                d_request = await request.json()
+            except ValueError:
+                return web.json_response({'error': {
+                    'message': 'We could not parse the JSON body of your request.',
+                    'type': 'invalid_request_error',
+                    'param': None,
+                    'code': None}}, status=400)
+
+            await asyncio.sleep(self._latency())
+
+            status = self._error()
+            if status == 429:
+                self._count('status_429')
+                return web.json_response({'error': {
+                    'message': 'Rate limit reached for requests (mock)',
+                    'type': 'requests',
+                    'param': None,
+                    'code': 'rate_limit_exceeded'}},
+                    status=429,
+                    headers={'Retry-After': str(self._retry_after)})
+
+            if status == 503:
+                self._count('status_503')
+                return web.json_response({'error': {
+                    'message': 'The server is overloaded or not ready yet. (mock)',
+                    'type': 'server_error',
+                    'param': None,
+                    'code': None}}, status=503)
+
+            self._count('status_200')
+
+            tokens = self._tokens(d_request.get('max_tokens'))
+            delay = 1 / self._tokens_per_second if self._tokens_per_second else 0.0
+            completion_id = f"{'chatcmpl' if chat else 'cmpl'}-{uuid.uuid4().hex[:24]}"
+            finish_reason = 'length' if len(tokens) < len(self._reply.split(' ')) else 'stop'
+
+            if d_request.get('stream'):
+                return await self._stream(request, d_request, chat, tokens, delay, completion_id, finish_reason)
+
+            await asyncio.sleep(delay * len(tokens))
+
+            d_body = self._body(d_request, chat, ''.join(tokens),
+                                completion_id, finish_reason, stream=False)
+
+            prompt_tokens = self._prompt_tokens(d_request)
+            d_body['usage'] = {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': len(tokens),
+                'total_tokens': prompt_tokens + len(tokens),
+            }
+
+            return web.json_response(d_body)
+
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def _stream(self,
+                      request: Any,
+                      d_request: dict,
+                      chat: bool,
+                      tokens: List[str],
+                      delay: float,
+                      completion_id: str,
+                      finish_reason: str) -> Any:
+        from aiohttp import web
+
+        self._count('streams')
+
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+
+        async def send(d_chunk: dict) -> None:
+            await response.write(f'data: {json.dumps(d_chunk)}\n\n'.encode('utf-8'))
+
+        if chat:
+            d_chunk = self._body(d_request, chat, '', completion_id, None, stream=True)
+            d_chunk['choices'][0]['delta'] = {'role': 'assistant'}
+            await send(d_chunk)
+
+        for token in tokens:
+            await asyncio.sleep(delay)
+            await send(self._body(d_request, chat, token, completion_id, None, stream=True))
+
+        await send(self._body(d_request, chat, '', completion_id, finish_reason, stream=True))
+        await response.write(b'data: [DONE]\n\n')
+        await response.write_eof()
+
+        return response
+
+    def app(self) -> Any:
+        """ Build the aiohttp Application
+
+        Returns:
+            aiohttp.web.Application: the mock API
+        """
+        from aiohttp import web
+
+        async def chat_completions(request):
+            return await self._handle(request, chat=True)
+
+        async def completions(request):
+            return await self._handle(request, chat=False)
+
+        app = web.Application()
+        app.router.add_post('/v1/chat/completions', chat_completions)
+        app.router.add_post('/v1/completions', completions)
+        app.router.add_post('/v1/engines/{engine}/completions', completions)
+
+        return app
+
+    @property
+    def base_url(self) -> Optional[str]:
+        """ The API Base of the running Server (e.g., 'http://127.0.0.1:8080/v1') """
+        return self._base_url
+
+    async def astart(self,
+                     host: str = '127.0.0.1',
+                     port: int = 0) -> str:
+        """ Start Serving on the running Event Loop
+
+        Args:
+            host (str, optional): the interface to bind. Defaults to '127.0.0.1'.
+            port (int, optional): the port to bind. Defaults to 0 (any free port).
+
+        Returns:
+            str: the API base of the server
+        """
+        from aiohttp import web
+
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+
+        port = site._server.sockets[0].getsockname()[1]
+        self._base_url = f'http://{host}:{port}/v1'
+
+        if self.isEnabledForInfo:
+            self.logger.info('\n'.join([
+                'Started Mock OpenAI Server',
+                f'\tAPI Base: {self._base_url}']))
+
+        return self._base_url
+
+    async def astop(self) -> None:
+        """ Stop Serving """
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+            self._base_url = None
+
+    def start(self,
+              host: str = '127.0.0.1',
+              port: int = 0) -> str:
+        """ Start Serving on a Background Thread
+
+        Args:
+            host (str, optional): the interface to bind. Defaults to '127.0.0.1'.
+            port (int, optional): the port to bind. Defaults to 0 (any free port).
+
+        Returns:
+            str: the API base of the server
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = Thread(target=self._loop.run_forever,
+                              name='mock-openai-server',
+                              daemon=True)
+        self._thread.start()
+
+        return asyncio.run_coroutine_threadsafe(
+            self.astart(host, port), self._loop).result()
+
+    def stop(self) -> None:
+        """ Stop the Background Thread started by 'start' """
+        if not self._loop:
+            return
+
+        asyncio.run_coroutine_threadsafe(self.astop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+        self._loop = None
+        self._thread = None
+
+    def __enter__(self) -> 'MockOpenAIServer':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """ Request Counters
+
+        Returns:
+            dict: the server statistics
+        """
+        with self._lock:
+            return {
+                'in_flight': self._in_flight,
+                'max_in_flight': self._max_in_flight,
+                **self._d_counts,
+            }
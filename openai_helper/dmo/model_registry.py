@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Model Capabilities: Context Window, Tokenizer and Pricing """
+
+
+from typing import Dict
+from typing import Optional
+
+import json
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+# prices are USD per 1,000 tokens
+#   'max_output_tokens' is only set where a model caps its completion below its context window
+MODELS = {
+    'gpt-4o': {
+        'context_window': 128000,
+        'max_output_tokens': 16384,
+        'encoding': 'o200k_base',
+        'prompt_price': 0.0025,
+        'completion_price': 0.01,
+    },
+    'gpt-4o-mini': {
+        'context_window': 128000,
+        'max_output_tokens': 16384,
+        'encoding': 'o200k_base',
+        'prompt_price': 0.00015,
+        'completion_price': 0.0006,
+    },
+    'gpt-4-turbo': {
+        'context_window': 128000,
+        'max_output_tokens': 4096,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.01,
+        'completion_price': 0.03,
+    },
+    'gpt-4-1106-preview': {
+        'context_window': 128000,
+        'max_output_tokens': 4096,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.01,
+        'completion_price': 0.03,
+    },
+    'gpt-4-0125-preview': {
+        'context_window': 128000,
+        'max_output_tokens': 4096,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.01,
+        'completion_price': 0.03,
+    },
+    'gpt-4-32k': {
+        'context_window': 32768,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.06,
+        'completion_price': 0.12,
+    },
+    'gpt-4': {
+        'context_window': 8192,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.03,
+        'completion_price': 0.06,
+    },
+    'gpt-3.5-turbo-instruct': {
+        'context_window': 4096,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.0015,
+        'completion_price': 0.002,
+    },
+    'gpt-3.5-turbo-16k': {
+        'context_window': 16384,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.003,
+        'completion_price': 0.004,
+    },
+    'gpt-3.5-turbo-1106': {
+        'context_window': 16385,
+        'max_output_tokens': 4096,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.001,
+        'completion_price': 0.002,
+    },
+    'gpt-3.5-turbo-0125': {
+        'context_window': 16385,
+        'max_output_tokens': 4096,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.0005,
+        'completion_price': 0.0015,
+    },
+    'gpt-3.5-turbo': {
+        'context_window': 4096,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.0015,
+        'completion_price': 0.002,
+    },
+    'text-davinci-003': {
+        'context_window': 4097,
+        'encoding': 'p50k_base',
+        'prompt_price': 0.02,
+        'completion_price': 0.02,
+    },
+    'text-davinci-002': {
+        'context_window': 4097,
+        'encoding': 'p50k_base',
+        'prompt_price': 0.02,
+        'completion_price': 0.02,
+    },
+    'code-davinci-002': {
+        'context_window': 8001,
+        'encoding': 'p50k_base',
+        'prompt_price': 0.0,
+        'completion_price': 0.0,
+    },
+    'text-curie-001': {
+        'context_window': 2049,
+        'encoding': 'r50k_base',
+        'prompt_price': 0.002,
+        'completion_price': 0.002,
+    },
+    'text-babbage-001': {
+        'context_window': 2049,
+        'encoding': 'r50k_base',
+        'prompt_price': 0.0005,
+        'completion_price': 0.0005,
+    },
+    'text-ada-001': {
+        'context_window': 2049,
+        'encoding': 'r50k_base',
+        'prompt_price': 0.0004,
+        'completion_price': 0.0004,
+    },
+    'davinci-002': {
+        'context_window': 16384,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.002,
+        'completion_price': 0.002,
+    },
+    'babbage-002': {
+        'context_window': 16384,
+        'encoding': 'cl100k_base',
+        'prompt_price': 0.0004,
+        'completion_price': 0.0004,
+    },
+    'davinci': {
+        'context_window': 2049,
+        'encoding': 'r50k_base',
+        'prompt_price': 0.02,
+        'completion_price': 0.02,
+    },
+    'curie': {
+        'context_window': 2049,
+        'encoding': 'r50k_base',
+        'prompt_price': 0.002,
+        'completion_price': 0.002,
+    },
+    'babbage': {
+        'context_window': 2049,
+        'encoding': 'r50k_base',
+        'prompt_price': 0.0005,
+        'completion_price': 0.0005,
+    },
+    'ada': {
+        'context_window': 2049,
+        'encoding': 'r50k_base',
+        'prompt_price': 0.0004,
+        'completion_price': 0.0004,
+    },
+}
+
+
+class ModelRegistry(BaseObject):
+    """ Model Capabilities: Context Window, Tokenizer and Pricing
+
+    Notes:
+    -   models are matched by the longest model prefix (e.g., 'gpt-4-0613' matches 'gpt-4')
+        fine-tuned models ('ft:gpt-3.5-turbo:...' or 'davinci:ft-...') match their base model
+    -   models without a match are unknown; they are sent as-is and never trimmed or rejected
+    -   'budget' is the pre-flight check the runners make before a request leaves the process
+        an over-length completion is trimmed to what the context window leaves after the prompt
+        a prompt that leaves no room at all is rejected with the same error OpenAI would return
+
+    Sample Overrides:
+        {
+            "my-deployment": {"context_window": 8192, "encoding": "cl100k_base",
+                              "prompt_price": 0.03, "completion_price": 0.06}
+        }
+    """
+
+    def __init__(self,
+                 models: Optional[Dict[str, dict]] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   over-length requests should fail locally, not after a network round trip
+
+        Args:
+            models (Dict[str, dict], optional): models to add or override. Defaults to None.
+                if None, these are read as JSON from the 'OPENAI_MODEL_REGISTRY' environment variable
+        """
+        BaseObject.__init__(self, __name__)
+
+        if models is None:
+            models = json.loads(EnvIO.str_or_default(
+                'OPENAI_MODEL_REGISTRY', '{}'))
+
+        self._d_models = dict(MODELS)
+        self._d_models.update(models)
+
+    def process(self,
+                model: Optional[str]) -> Optional[dict]:
+        """ Look up the Capabilities of a Model
+
+        Args:
+            model (str): the model (or engine) name
+
+        Returns:
+            Optional[dict]: the capabilities, or None if the model is unknown
+                model: the registry entry that matched
+                context_window: the prompt and completion tokens the model accepts together
+                max_output_tokens: the completion cap (None if only the context window applies)
+                encoding: the tiktoken encoding of the model
+                prompt_price: USD per 1,000 prompt tokens
+                completion_price: USD per 1,000 completion tokens
+        """
+        if not model:
+            return None
+
+        if model.startswith('ft:'):
+            model = model.split(':')[1]
+
+        matches = [x for x in self._d_models if model.startswith(x)]
+        if not matches:
+            return None
+
+        name = max(matches, key=len)
+        d_model = self._d_models[name]
+
+        return {
+            'model': name,
+            'context_window': d_model['context_window'],
+            'max_output_tokens': d_model.get('max_output_tokens'),
+            'encoding': d_model.get('encoding'),
+            'prompt_price': d_model.get('prompt_price'),
+            'completion_price': d_model.get('completion_price'),
+        }
+
+    def cost(self,
+             model: str,
+             prompt_tokens: int,
+             completion_tokens: int = 0) -> Optional[float]:
+        """ The Price of a Call in USD
+
+        Args:
+            model (str): the model (or engine) name
+            prompt_tokens (int): the prompt tokens
+            completion_tokens (int, optional): the completion tokens. Defaults to 0.
+
+        Returns:
+            Optional[float]: the price, or None if the model (or its pricing) is unknown
+        """
+        d_model = self.process(model)
+        if not d_model or d_model['prompt_price'] is None or d_model['completion_price'] is None:
+            return None
+
+        return (prompt_tokens * d_model['prompt_price'] +
+                completion_tokens * d_model['completion_price']) / 1000
+
+    def budget(self,
+               model: str,
+               prompt_tokens: int,
+               max_tokens: Optional[int] = None) -> Optional[int]:
+        """ Fit the Completion into what the Context Window leaves after the Prompt
+
+        Args:
+            model (str): the model (or engine) name
+            prompt_tokens (int): the exact prompt tokens
+            max_tokens (int, optional): the requested completion tokens. Defaults to None.
+                None leaves the completion to the model (only the prompt is checked)
+
+        Raises:
+            InvalidRequestError: the prompt leaves no room for a completion
+
+        Returns:
+            Optional[int]: 'max_tokens', trimmed where needed
+                unchanged for unknown models
+        """
+        d_model = self.process(model)
+        if not d_model:
+            return max_tokens
+
+        available = d_model['context_window'] - prompt_tokens
+        if available <= 0:
+            # imported here: 'input-token-counter' reads encodings from the registry without loading openai
+            from openai.error import InvalidRequestError
+            raise InvalidRequestError(
+                f"This model's maximum context length is {d_model['context_window']} tokens, "
+                f"however your prompt is {prompt_tokens} tokens. Please reduce the length of the prompt.",
+                None)
+
+        if d_model['max_output_tokens']:
+            available = min(available, d_model['max_output_tokens'])
+
+        if not max_tokens or max_tokens <= available:
+            return max_tokens
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'Completion Trimmed to the Context Window',
+                f'\tModel: {model}',
+                f'\tPrompt Tokens: {prompt_tokens}',
+                f'\tRequested Tokens: {max_tokens}',
+                f'\tMax Tokens: {available}']))
+
+        return available
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Near-Duplicate Cache using MinHash Signatures and an LSH Index """
+
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import re
+import time
+from array import array
+from random import Random
+from hashlib import blake2b
+from threading import Lock
+from collections import OrderedDict
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+# a Mersenne prime; the universal hash family is (a * x + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+
+NUM_PERMUTATIONS = 32
+BAND_ROWS = 4
+
+
+class NearDuplicateCache(BaseObject):
+    """ Near-Duplicate Cache using MinHash Signatures and an LSH Index
+
+    Notes:
+    -   inputs are normalized (lowercase, punctuation removed, whitespace collapsed)
+        so inputs that differ only by punctuation or casing have identical signatures
+    -   similarity is the Jaccard similarity of the word unigrams and bigrams
+    -   a 32-permutation MinHash signature and an LSH index only find candidates
+        the LSH index splits each signature into 8 bands of 4 rows
+        a lookup only considers the entries that share at least one band
+        inputs with a similarity of 0.8 share a band with probability ~0.99
+        unrelated inputs almost never do, so buckets stay small at a million entries
+    -   only the low 8 bits of each MinHash value are kept (b-bit MinHash); a signature is 32 bytes
+    -   a 32-permutation estimate is too noisy to serve on (about +/- 0.08 near 0.8)
+        so every candidate is verified against the exact feature hashes stored with it
+        and an answer is only served if the exact similarity meets the threshold
+    -   entries are scoped by an exact 'namespace' (e.g., the model and system prompt)
+        an answer is never served across namespaces
+    -   features and bands are hashed with blake2b, so signatures are stable across processes
+    -   expired entries are removed as lookups meet them; the freshest similar answer is served
+    -   'put' replaces (and refreshes) any entry with the same namespace and features
+    """
+
+    __normalize = re.compile(r'[^\w\s]+')
+
+    def __init__(self,
+                 threshold: float = 0.8,
+                 max_entries: int = 1000000,
+                 ttl: Optional[float] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   inputs that differ only by punctuation, casing or a trailing word missed the exact-key cache
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   verify candidates against exact feature hashes before serving
+                and replace the per-process salted 'hash' with blake2b
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   an expired best match no longer hides a fresh one
+                and 'put' replaces the entry for the same namespace and features
+
+        Args:
+            threshold (float, optional): the minimum similarity (0.0 - 1.0) to serve a cached answer. Defaults to 0.8.
+                override with the 'OPENAI_NEAR_DUPLICATE_THRESHOLD' environment variable
+            max_entries (int, optional): the maximum number of cached answers. Defaults to 1000000.
+                override with the 'OPENAI_NEAR_DUPLICATE_MAX_ENTRIES' environment variable
+            ttl (float, optional): the seconds an answer stays valid. Defaults to None (no expiry).
+        """
+        BaseObject.__init__(self, __name__)
+        self._threshold = EnvIO.float_or_default(
+            'OPENAI_NEAR_DUPLICATE_THRESHOLD', threshold)
+        self._max_entries = EnvIO.int_or_default(
+            'OPENAI_NEAR_DUPLICATE_MAX_ENTRIES', max_entries)
+        self._ttl = ttl
+
+        # a fixed seed keeps signatures comparable between cache instances
+        random = Random(42)
+        self._permutations = [(random.randrange(1, MERSENNE_PRIME),
+                               random.randrange(0, MERSENNE_PRIME))
+                              for _ in range(NUM_PERMUTATIONS)]
+
+        self._lock = Lock()
+        self._next_id = 0
+        self._d_entries = OrderedDict()
+        self._d_buckets: Dict[int, List[int]] = {}
+        self._d_counts = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def _hash(value: bytes) -> int:
+        """ A stable 64-bit Hash (the built-in 'hash' is salted per process) """
+        return int.from_bytes(blake2b(value, digest_size=8).digest(), 'little')
+
+    def features(self,
+                 input_text: str) -> array:
+        """ Hash the Word Unigrams and Bigrams of an Input
+
+        Args:
+            input_text (str): the input text
+
+        Returns:
+            array: the sorted, distinct 64-bit feature hashes
+        """
+        tokens = self.__normalize.sub(' ', input_text.lower()).split()
+
+        features = set(tokens)
+        features.update(f'{tokens[i]} {tokens[i + 1]}'
+                        for i in range(len(tokens) - 1))
+
+        return array('Q', sorted(set(self._hash(x.encode('utf-8')) for x in features)))
+
+    def signature(self,
+                  input_text: str,
+                  features: Optional[array] = None) -> bytes:
+        """ Compute the b-bit MinHash Signature of an Input
+
+        Args:
+            input_text (str): the input text
+            features (array, optional): the feature hashes, if already computed. Defaults to None.
+
+        Returns:
+            bytes: the 32-byte signature
+        """
+        if features is None:
+            features = self.features(input_text)
+        if not features:
+            return bytes(NUM_PERMUTATIONS)
+
+        hashes = [x & MERSENNE_PRIME for x in features]
+
+        return bytes(min((a * x + b) % MERSENNE_PRIME for x in hashes) & 0xFF
+                     for a, b in self._permutations)
+
+    @staticmethod
+    def jaccard(features_1: array,
+                features_2: array) -> float:
+        """ The exact Jaccard Similarity of two Feature Sets
+
+        Args:
+            features_1 (array): the feature hashes of an input
+            features_2 (array): the feature hashes of another input
+
+        Returns:
+            float: the similarity (0.0 - 1.0)
+        """
+        set_1, set_2 = set(features_1), set(features_2)
+        union = len(set_1 | set_2)
+        if not union:
+            return 1.0
+        return len(set_1 & set_2) / union
+
+    @staticmethod
+    def similarity(signature_1: bytes,
+                   signature_2: bytes) -> float:
+        """ Estimate the Jaccard Similarity of two Signatures
+
+        Args:
+            signature_1 (bytes): a signature
+            signature_2 (bytes): another signature
+
+        Returns:
+            float: the estimated similarity (0.0 - 1.0)
+        """
+        matches = sum(1 for x, y in zip(signature_1, signature_2) if x == y)
+
+        # unequal 8-bit values still collide 1 time in 256
+        return max(0.0, (matches / NUM_PERMUTATIONS - 1 / 256) / (1 - 1 / 256))
+
+    @classmethod
+    def _band_keys(cls,
+                   namespace: str,
+                   signature: bytes) -> List[int]:
+        namespace = namespace.encode('utf-8')
+        return [cls._hash(bytes([i]) + signature[i:i + BAND_ROWS] + namespace)
+                for i in range(0, NUM_PERMUTATIONS, BAND_ROWS)]
+
+    def _remove(self,
+                entry_id: int) -> None:
+        """ Remove an Entry; the caller holds the lock """
+        namespace, signature, _, _, _ = self._d_entries.pop(entry_id)
+        for band_key in self._band_keys(namespace, signature):
+            bucket = self._d_buckets[band_key]
+            bucket.remove(entry_id)
+            if not bucket:
+                del self._d_buckets[band_key]
+
+    def get(self,
+            namespace: str,
+            input_text: str) -> Optional[Any]:
+        """ Look up the Answer to the most similar previous Input
+
+        Args:
+            namespace (str): the exact scope of the input (e.g., model and system prompt)
+            input_text (str): the input text
+
+        Returns:
+            Optional[Any]: the cached answer, or None if no previous input is similar enough
+        """
+        features = self.features(input_text)
+        signature = self.signature(input_text, features)
+
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(namespace, signature):
+                candidates.update(self._d_buckets.get(band_key, ()))
+
+            now = time.monotonic() if self._ttl else None
+
+            best_id, best_similarity = None, 0.0
+            for entry_id in candidates:
+                if self._d_entries[entry_id][0] != namespace:
+                    continue  # a band key collision across namespaces
+                if self._ttl and self._d_entries[entry_id][4] < now:
+                    self._remove(entry_id)
+                    continue  # an expired entry must not hide a fresh one
+                similarity = self.jaccard(self._d_entries[entry_id][2], features)
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+
+            if best_id is None or best_similarity < self._threshold:
+                self._d_counts['misses'] += 1
+                return None
+
+            self._d_counts['hits'] += 1
+            return self._d_entries[best_id][3]
+
+    def put(self,
+            namespace: str,
+            input_text: str,
+            answer: Any) -> None:
+        """ Cache the Answer to an Input
+
+        Args:
+            namespace (str): the exact scope of the input (e.g., model and system prompt)
+            input_text (str): the input text
+            answer (Any): the answer to serve for similar inputs
+        """
+        features = self.features(input_text)
+        signature = self.signature(input_text, features)
+        expires = time.monotonic() + self._ttl if self._ttl else None
+
+        with self._lock:
+            # identical features give identical band keys; any one band finds a previous entry
+            band_key = self._band_keys(namespace, signature)[0]
+            for entry_id in list(self._d_buckets.get(band_key, ())):
+                if self._d_entries[entry_id][0] == namespace and self._d_entries[entry_id][2] == features:
+                    self._remove(entry_id)
+
+            entry_id = self._next_id
+            self._next_id += 1
+
+            self._d_entries[entry_id] = (namespace, signature, features, answer, expires)
+            for band_key in self._band_keys(namespace, signature):
+                self._d_buckets.setdefault(band_key, []).append(entry_id)
+
+            while len(self._d_entries) > self._max_entries:
+                self._remove(next(iter(self._d_entries)))
+                self._d_counts['evictions'] += 1
+
+    def clear(self) -> None:
+        """ Discard every Cached Answer """
+        with self._lock:
+            self._d_entries.clear()
+            self._d_buckets.clear()
+
+    def stats(self) -> dict:
+        """ Cache Size and Counters
+
+        Returns:
+            dict: the cache statistics
+        """
+        with self._lock:
+            lookups = self._d_counts['hits'] + self._d_counts['misses']
+            return {
+                'entries': len(self._d_entries),
+                'buckets': len(self._d_buckets),
+                'max_entries': self._max_entries,
+                'threshold': self._threshold,
+                'hit_rate': self._d_counts['hits'] / lookups if lookups else 0.0,
+                **self._d_counts,
+            }
@@ -6,24 +6,98 @@
 from typing import Any
 from typing import Optional
 
+import socket
+import asyncio
+from weakref import WeakKeyDictionary
+from threading import Lock
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
 import openai
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
 from baseblock import EnvIO
 from baseblock import CryptoBase
 from baseblock import BaseObject
 
 
+class KeepAliveAdapter(HTTPAdapter):
+    """ An HTTP Adapter that enables TCP keep-alive on every pooled socket """
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
 class OpenAIConnector(BaseObject):
-    """ Connect to OpenAI """
+    """ Connect to OpenAI
 
-    def __init__(self):
+    Notes:
+    -   the connector owns the HTTP transport for every OpenAI call
+        a pooled 'requests.Session' for blocking calls
+        a pooled 'aiohttp.ClientSession' (per event loop) for coroutine calls
+        the session of a loop that has since closed is closed and dropped on the next async call
+    -   both sessions are shared across all connector instances
+        so 'run-chat-completion', 'run-text-completion' and 'create-openai-answer'
+        reuse the same warm (keep-alive, already TLS-negotiated) connections
+    -   set 'OPENAI_CASSETTE' to record every blocking request to (or replay it from) a cassette file
+        'OPENAI_CASSETTE_MODE' is 'record' or 'replay' (the default)
+        'OPENAI_CASSETTE_LATENCY_SCALE' scales the recorded latency on replay (0 for none)
+        coroutine calls are not covered by the cassette
+    -   set 'OPENAI_API_BASE' (or pass 'api_base') to send every call to another server
+        (e.g., 'mock-openai-server' for load tests)
+    """
+
+    __lock = Lock()
+    __session = None
+    __aiosessions = WeakKeyDictionary()
+
+    def __init__(self,
+                 pool_size: int = 10,
+                 keepalive_timeout: int = 30,
+                 api_base: Optional[str] = None):
         """ Change Log
 
         Created:
             28-Jul-2022
             craigtrim@gmail.com
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   own pooled keep-alive sessions for sync and async transport
+                cold TLS handshakes were dominating p99 latency under burst traffic
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional record/replay cassette transport ('OPENAI_CASSETTE')
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional API base override ('OPENAI_API_BASE') for load tests against a local server
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   key async sessions by event loop; a session per loop change was leaked
+
+        Args:
+            pool_size (int, optional): the maximum number of pooled connections. Defaults to 10.
+                override with the 'OPENAI_POOL_SIZE' environment variable
+            keepalive_timeout (int, optional): seconds an idle async connection is kept open. Defaults to 30.
+                override with the 'OPENAI_KEEPALIVE_TIMEOUT' environment variable
+            api_base (str, optional): the API base URL (e.g., 'http://127.0.0.1:8080/v1'). Defaults to None.
+                override with the 'OPENAI_API_BASE' environment variable
+                if neither is set, the openai module default is used
         """
         BaseObject.__init__(self, __name__)
+        self._pool_size = EnvIO.int_or_default(
+            'OPENAI_POOL_SIZE', pool_size)
+        self._keepalive_timeout = EnvIO.int_or_default(
+            'OPENAI_KEEPALIVE_TIMEOUT', keepalive_timeout)
+        self._api_base = EnvIO.str_or_default('OPENAI_API_BASE', api_base)
 
     @classmethod
     def _openai_key(cls) -> Optional[str]:
@@ -53,6 +127,183 @@ class OpenAIConnector(BaseObject):
         except ValueError:
             return None
 
+    def _cassette_adapter(self,
+                          cassette_path: str,
+                          transport: HTTPAdapter) -> HTTPAdapter:
+        """ Wrap the Transport to Record to (or Replay from) a Cassette """
+        from openai_helper.dmo import Cassette
+        from openai_helper.dmo import CassetteAdapter
+
+        mode = EnvIO.str_or_default('OPENAI_CASSETTE_MODE', 'replay')
+        latency_scale = EnvIO.float_or_default(
+            'OPENAI_CASSETTE_LATENCY_SCALE', 1.0)
+
+        if self.isEnabledForInfo:
+            self.logger.info('\n'.join([
+                'Using HTTP Cassette',
+                f'\tFile Path: {cassette_path}',
+                f'\tMode: {mode}',
+                f'\tLatency Scale: {latency_scale}']))
+
+        return CassetteAdapter(
+            cassette=Cassette(cassette_path),
+            mode=mode,
+            latency_scale=latency_scale,
+            transport=transport)
+
+    def session(self) -> requests.Session:
+        """ The shared (blocking) HTTP Session
+
+        Returns:
+            requests.Session: a pooled keep-alive session
+        """
+        with self.__lock:
+            if not OpenAIConnector.__session:
+                adapter = KeepAliveAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self._pool_size)
+
+                cassette_path = EnvIO.str_or_default('OPENAI_CASSETTE', None)
+                if cassette_path:
+                    adapter = self._cassette_adapter(cassette_path, adapter)
+
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+
+                OpenAIConnector.__session = session
+
+                if self.isEnabledForDebug:
+                    self.logger.debug('\n'.join([
+                        'Created Pooled HTTP Session',
+                        f'\tPool Size: {self._pool_size}']))
+
+            return OpenAIConnector.__session
+
+    @classmethod
+    def _stale_sessions(cls) -> list:
+        """ Remove the Async Sessions of closed Event Loops; the caller holds the lock """
+        # a session references its loop, so the weak key alone never expires
+        return [cls.__aiosessions.pop(x) for x in list(cls.__aiosessions) if x.is_closed()]
+
+    async def aio_session(self) -> Any:
+        """ The shared (async) HTTP Session for the running Event Loop
+
+        An aiohttp session is bound to the event loop it was created on
+        Each loop has its own session; the sessions of closed loops are closed and dropped
+
+        Returns:
+            aiohttp.ClientSession: a pooled keep-alive session
+        """
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+
+        with self.__lock:
+            stale = self._stale_sessions()
+
+            session = OpenAIConnector.__aiosessions.get(loop)
+            if not session or session.closed:
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self._pool_size,
+                        keepalive_timeout=self._keepalive_timeout,
+                        ttl_dns_cache=300))
+
+                OpenAIConnector.__aiosessions[loop] = session
+
+                if self.isEnabledForDebug:
+                    self.logger.debug('\n'.join([
+                        'Created Pooled Async HTTP Session',
+                        f'\tPool Size: {self._pool_size}',
+                        f'\tKeep-Alive Timeout: {self._keepalive_timeout}',
+                        f'\tEvent Loops: {len(OpenAIConnector.__aiosessions)}']))
+
+        # the transports of a closed loop are already gone; closing only releases the session
+        for x in stale:
+            await x.close()
+
+        return session
+
+    @asynccontextmanager
+    async def aio_scope(self):
+        """ Route OpenAI coroutine calls made within this scope through the shared async session
+
+        Usage:
+            async with connector.aio_scope():
+                await openai.ChatCompletion.acreate(...)
+        """
+        token = openai.aiosession.set(await self.aio_session())
+        try:
+            yield
+        finally:
+            openai.aiosession.reset(token)
+
+    def prewarm(self,
+                connections: Optional[int] = None) -> None:
+        """ Open (and TLS-negotiate) pooled connections ahead of the first request
+
+        Args:
+            connections (int, optional): the number of connections to open. Defaults to the pool size.
+        """
+        connections = min(connections or self._pool_size, self._pool_size)
+        session = self.session()
+
+        def touch(_) -> None:
+            try:
+                session.head(openai.api_base, timeout=5)
+            except requests.RequestException as e:
+                self.logger.warning(f'Connection Prewarm Failed: {e}')
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(touch, range(connections)))
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'Prewarmed HTTP Connections',
+                f'\tConnections: {connections}',
+                f'\tAPI Base: {openai.api_base}']))
+
+    async def aprewarm(self,
+                       connections: Optional[int] = None) -> None:
+        """ Open (and TLS-negotiate) pooled async connections ahead of the first request
+
+        Args:
+            connections (int, optional): the number of connections to open. Defaults to the pool size.
+        """
+        import aiohttp
+
+        connections = min(connections or self._pool_size, self._pool_size)
+        session = await self.aio_session()
+
+        async def touch() -> None:
+            try:
+                async with session.head(openai.api_base):
+                    pass
+            except aiohttp.ClientError as e:
+                self.logger.warning(f'Connection Prewarm Failed: {e}')
+
+        await asyncio.gather(*[touch() for _ in range(connections)])
+
+    @classmethod
+    def close(cls) -> None:
+        """ Close the shared blocking session """
+        with cls.__lock:
+            if cls.__session:
+                cls.__session.close()
+                cls.__session = None
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """ Close the shared async session of the running event loop (and those of closed loops) """
+        with cls.__lock:
+            sessions = cls._stale_sessions() + [
+                cls.__aiosessions.pop(asyncio.get_running_loop(), None)]
+
+        for session in sessions:
+            if session and not session.closed:
+                await session.close()
+
     def _process(self) -> Any:
         """ Connect to OpenAI
 
@@ -62,6 +313,20 @@ class OpenAIConnector(BaseObject):
 
         openai.api_key = self._openai_key()
         openai.organization = self._openai_org()
+        openai.requestssession = self.session()
+
+        if self._api_base:
+            openai.api_base = self._api_base.rstrip('/')
+
+        # the openai module refuses to send a request without a key, even to a cassette or a local server
+        if not openai.api_key and EnvIO.exists('OPENAI_CASSETTE'):
+            if EnvIO.str_or_default('OPENAI_CASSETTE_MODE', 'replay') == 'replay':
+                openai.api_key = 'cassette-replay'
+        if not openai.api_key and self._api_base:
+            openai.api_key = 'local-api-base'
+
+        if EnvIO.is_true('OPENAI_PREWARM'):
+            self.prewarm()
 
         return openai
 
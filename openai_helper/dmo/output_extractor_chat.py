@@ -48,6 +48,11 @@ class OutputExtractorChat(BaseObject):
 
     @staticmethod
     def _output_text(d_result: dict) -> Optional[str]:
+        """ Extract the last Paragraph of the Response
+
+        Not streamable: the last paragraph is only known once the response is complete
+        'output-extractor-stream' forwards every paragraph instead
+        """
 
         if 'choices' in d_result['output']:
             choices = d_result['output']['choices']
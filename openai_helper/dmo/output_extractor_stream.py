@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Extract Unstructured Output from a Streamed OpenAI response """
+
+
+from typing import Optional
+
+import re
+
+from baseblock import BaseObject
+
+from openai_helper.dmo import EtlReplaceCliches
+from openai_helper.dmo import EtlRemoveListIndicators
+from openai_helper.dmo import EtlRemovePromptIndicators
+
+LINE_BREAK = '\n'
+
+
+class OutputExtractorStream(BaseObject):
+    """ Extract Unstructured Output from a Streamed OpenAI response
+
+    Notes:
+    -   one extractor is used per stream
+    -   cleaned text is forwarded while the model is still generating
+        the last 'lookahead' characters are held back so a prompt indicator
+        (e.g., 'As an AI language model,') or cliche that straddles two chunks is still caught
+    -   text is only released up to a whitespace boundary
+        so list indicators and emoji tokens are always seen whole
+
+    Streamable Stages:
+        'etl-remove-prompt-indicators', 'etl-replace-cliches'
+        'etl-remove-list-indicators' (applied at the start of each line)
+        emoji removal (applied per token)
+
+    Not Streamable (these need the complete output text and are skipped):
+        'etl-replace-duplicated-input'
+        'etl-handle-text-completions'
+        the last-paragraph selection in 'output-extractor-chat'
+        the stripping of surrounding quotes
+    """
+
+    __emoji = re.compile(r'(?<!\S):\S*:(?!\S)')
+
+    def __init__(self,
+                 input_text: str,
+                 remove_prompts: bool = True,
+                 replace_cliched_text: bool = True,
+                 remove_list_indicators: bool = True,
+                 remove_emojis: bool = True,
+                 lookahead: Optional[int] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   streaming without cleanup leaks prompt indicators to users
+
+        Args:
+            input_text (str): the user input text
+            remove_prompts (bool, optional): remove any generic prompt material. Defaults to True.
+            replace_cliched_text (bool, optional): removes noisy and cliched output. Defaults to True.
+            remove_list_indicators (bool, optional): remove any list indicators. Defaults to True.
+            remove_emojis (bool, optional): remove any emojis OpenAI might provide. Defaults to True.
+            lookahead (int, optional): the characters to hold back. Defaults to None.
+                if None, the length of the longest prompt indicator or cliche is used
+        """
+        BaseObject.__init__(self, __name__)
+        self._input_text = input_text
+        self._remove_emojis = remove_emojis
+
+        self._text_pipeline = []
+        if remove_prompts:
+            self._text_pipeline.append(EtlRemovePromptIndicators().process)
+        if replace_cliched_text:
+            self._text_pipeline.append(EtlReplaceCliches().process)
+
+        self._remove_list_indicators = None
+        if remove_list_indicators:
+            self._remove_list_indicators = EtlRemoveListIndicators().process
+
+        if lookahead is None:
+            lookahead = max(EtlRemovePromptIndicators.lookahead(),
+                            EtlReplaceCliches.lookahead())
+
+        # one more character so the boundary after a match is never the end of the buffer
+        self._lookahead = lookahead + 1
+
+        self._buffer = ''
+        self._at_line_start = True
+        self._last_char = None
+
+    def _clean_line_start(self,
+                          line: str) -> str:
+        """ Remove a List Indicator from the Start of a Line """
+        if not self._remove_list_indicators or not line.strip():
+            return line
+
+        # the list indicator routine only operates on multi-line text
+        return self._remove_list_indicators(
+            input_text=self._input_text,
+            output_text=f'{LINE_BREAK}{line}')
+
+    def _release(self,
+                 text: str) -> str:
+        """ Apply the per-Line and per-Token Stages to Text that is safe to forward """
+
+        lines = text.split(LINE_BREAK)
+        for i in range(len(lines)):
+            if i > 0 or self._at_line_start:
+                lines[i] = self._clean_line_start(lines[i])
+
+        self._at_line_start = text.endswith(LINE_BREAK)
+        text = LINE_BREAK.join(lines)
+
+        if self._remove_emojis and text.count(':') >= 2:
+            text = self.__emoji.sub('', text)
+
+        while '  ' in text:
+            text = text.replace('  ', ' ')
+        text = text.replace(f' {LINE_BREAK}', LINE_BREAK)
+
+        # a removal at the end of the previous release can leave a dangling space
+        if self._last_char is None:
+            text = text.lstrip()
+        elif self._last_char.isspace():
+            text = text.lstrip(' ')
+
+        if text:
+            self._last_char = text[-1]
+
+        return text
+
+    def process(self,
+                delta: str) -> str:
+        """ Accept the next Content Delta
+
+        Args:
+            delta (str): the content delta from the stream
+
+        Returns:
+            str: the cleaned text that is safe to forward (may be empty)
+        """
+        if not delta:
+            return ''
+
+        self._buffer += delta
+
+        # re-running a stage on text it has already cleaned is a no-op
+        for text_handler in self._text_pipeline:
+            self._buffer = text_handler(
+                input_text=self._input_text,
+                output_text=self._buffer)
+
+        cut = len(self._buffer) - self._lookahead
+        if cut <= 0:
+            return ''
+
+        # never split a word or emoji token
+        while cut > 0 and not self._buffer[cut].isspace():
+            cut -= 1
+
+        # never separate a list indicator from the rest of its line
+        line_start = self._buffer.rfind(LINE_BREAK, 0, cut) + 1
+        if line_start or self._at_line_start:
+            if len(self._buffer[line_start:cut].split()) < 2:
+                cut = line_start - 1
+
+        if cut <= 0:
+            return ''
+
+        text = self._buffer[:cut]
+        self._buffer = self._buffer[cut:]
+
+        return self._release(text)
+
+    def flush(self) -> str:
+        """ Release the held-back Text once the Stream has Ended
+
+        Returns:
+            str: the remaining cleaned text
+        """
+        text = self._buffer.rstrip()
+        self._buffer = ''
+
+        if not text:
+            return ''
+
+        return self._release(text)
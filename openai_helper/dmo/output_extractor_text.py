@@ -73,6 +73,10 @@ class OutputExtractorText(BaseObject):
 
     @staticmethod
     def _output_text(d_result: dict) -> Optional[str]:
+        """ Extract the last Paragraph of the Response
+
+        Not streamable: the last paragraph is only known once the response is complete
+        """
 
         if 'choices' in d_result['output']:
             choices = d_result['output']['choices']
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Find Many Phrases in a Single Pass """
+
+
+from typing import List
+from typing import Iterable
+
+import re
+
+from baseblock import BaseObject
+
+# up to this many phrases, a substring check per phrase ('str.__contains__') is cheaper than the regex
+# when none of them occur, which is the common case
+PREFILTER_LIMIT = 32
+
+
+class PhraseMatcher(BaseObject):
+    """ Find Many Phrases in a Single Pass
+
+    Notes:
+    -   the phrases are merged into a prefix tree (a trie), which is compiled into one regular expression
+        the regex engine walks the tree from each candidate position, so the cost per position
+        depends on the text and the alphabet, not on the number of phrases
+    -   at each position the longest phrase wins; the leftmost match wins overall
+    -   matching is case-sensitive
+    -   a phrase that starts with a word character only matches at the start of a word
+        (e.g., 'is a chatbot' is found in 'this is a chatbot' but not in 'this a chatbot')
+        mid-word positions are rejected cheaply, and words are never cut in half
+    -   small dictionaries (up to 'PREFILTER_LIMIT' phrases) first check for any phrase as a plain substring
+        and skip the regex entirely when none occur
+    -   build a matcher once and reuse it; compiling grows with the size of the dictionary
+        (roughly 0.1s per 1,000 phrases)
+
+    Dictionary Files:
+        UTF-8 text with one phrase per line
+        blank lines and lines starting with '#' are ignored
+    """
+
+    def __init__(self,
+                 phrases: Iterable[str]):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   scanning once per phrase does not scale to dictionaries of hundreds of phrases
+
+        Args:
+            phrases (Iterable[str]): the phrases to find
+        """
+        BaseObject.__init__(self, __name__)
+        self._phrases = sorted(set(x for x in phrases if x))
+        self._pattern = re.compile(self._compile(self._phrases))
+        self._prefilter = len(self._phrases) <= PREFILTER_LIMIT
+
+    @staticmethod
+    def load(file_paths: Iterable[str]) -> List[str]:
+        """ Read the Phrases of one or more Dictionary Files
+
+        Args:
+            file_paths (Iterable[str]): the dictionary files
+
+        Returns:
+            List[str]: the phrases, in file order
+        """
+        phrases = []
+        for file_path in file_paths:
+            with open(file_path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.rstrip('\r\n')
+                    if line and not line.startswith('#'):
+                        phrases.append(line)
+        return phrases
+
+    @staticmethod
+    def _compile(phrases: List[str]) -> str:
+        """ Build the Prefix Tree of the Phrases and render it as a Regular Expression """
+        trie = {}
+        for phrase in phrases:
+            node = trie
+            for ch in phrase:
+                node = node.setdefault(ch, {})
+            node[''] = {}  # the end of a phrase
+
+        def render(node: dict) -> str:
+            # a run of single-child nodes is a plain literal
+            literal = ''
+            while len(node) == 1 and '' not in node:
+                ch, node = next(iter(node.items()))
+                literal += re.escape(ch)
+
+            branches = [re.escape(ch) + render(child)
+                        for ch, child in node.items() if ch]
+            if not branches:
+                return literal
+
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            if '' in node:
+                body = f'(?:{body})?'  # greedy, so the longer phrase is tried first
+
+            return literal + body
+
+        word = [re.escape(ch) + render(child)
+                for ch, child in trie.items() if re.match(r'\w', ch)]
+        other = [re.escape(ch) + render(child)
+                 for ch, child in trie.items() if not re.match(r'\w', ch)]
+
+        alternatives = []
+        if word:
+            alternatives.append(f"\\b(?:{'|'.join(word)})")
+        alternatives += other
+
+        if not alternatives:
+            return '(?!)'  # no phrases; never matches
+        return '|'.join(alternatives)
+
+    @property
+    def lookahead(self) -> int:
+        """ The Length of the longest Phrase """
+        return max((len(x) for x in self._phrases), default=0)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def _absent(self,
+                input_text: str) -> bool:
+        """ True if no Phrase can occur in the Text (only checked for small dictionaries) """
+        if not self._prefilter:
+            return False
+        return not any(x in input_text for x in self._phrases)
+
+    def findall(self,
+                input_text: str) -> List[str]:
+        """ Find every (non-overlapping) Phrase in a Text
+
+        Args:
+            input_text (str): the text to search
+
+        Returns:
+            List[str]: the phrases found, in text order
+        """
+        if self._absent(input_text):
+            return []
+        return self._pattern.findall(input_text)
+
+    def process(self,
+                input_text: str,
+                replacement: str = '') -> str:
+        """ Replace every (non-overlapping) Phrase in a Text
+
+        Args:
+            input_text (str): the text to search
+            replacement (str, optional): the replacement for each phrase. Defaults to ''.
+
+        Returns:
+            str: the modified text
+        """
+        if self._absent(input_text):
+            return input_text
+        return self._pattern.sub(lambda _: replacement, input_text)
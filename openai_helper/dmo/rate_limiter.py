@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Client-Side Token Bucket Rate Limiter for Requests/Min and Tokens/Min """
+
+
+from typing import Dict
+from typing import Optional
+
+import json
+import time
+import asyncio
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+from openai_helper.dmo import BucketStoreMemory
+from openai_helper.dmo import BucketStoreSqlite
+
+
+class RateLimiter(BaseObject):
+    """ Client-Side Token Bucket Rate Limiter for Requests/Min and Tokens/Min
+
+    Notes:
+    -   each model has two buckets: requests per minute ('rpm') and tokens per minute ('tpm')
+        a call proceeds only once both buckets can cover it
+    -   limits are matched by the longest model prefix
+        a 'default' entry applies to any model without a match
+        models without any limit are never throttled
+
+    Sample Limits:
+        {
+            "gpt-3.5-turbo": {"rpm": 3500, "tpm": 90000},
+            "text-davinci-003": {"rpm": 3000, "tpm": 250000},
+            "default": {"rpm": 60, "tpm": 40000}
+        }
+    """
+
+    def __init__(self,
+                 limits: Optional[Dict[str, dict]] = None,
+                 store: Optional[object] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   wait for budget locally instead of sending requests that come back as 429s
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'aprocess' calls a blocking store on the executor instead of the event loop
+
+        Args:
+            limits (Dict[str, dict], optional): the per-model limits. Defaults to None.
+                if None, these are read as JSON from the 'OPENAI_RATE_LIMITS' environment variable
+            store (object, optional): the bucket state backend. Defaults to None.
+                a store without a false 'blocking' attribute is assumed to block
+                if None, and 'OPENAI_RATE_LIMITS_DB' is set, a host-wide SQLite store is used at that path
+                otherwise an in-process store is used
+        """
+        BaseObject.__init__(self, __name__)
+
+        if limits is None:
+            limits = json.loads(EnvIO.str_or_default(
+                'OPENAI_RATE_LIMITS', '{}'))
+        self._d_limits = limits
+
+        if not store:
+            file_path = EnvIO.str_or_default('OPENAI_RATE_LIMITS_DB', None)
+            store = BucketStoreSqlite(file_path) if file_path else BucketStoreMemory()
+        self._take = store.process
+
+        # a store that can block (e.g., on a database lock) is kept off the event loop
+        self._blocking = getattr(store, 'blocking', True)
+
+    def _amounts(self,
+                 model: str,
+                 tokens: int) -> Optional[dict]:
+        """ Build the Bucket Amounts for a single Call
+
+        Args:
+            model (str): the model (or engine) name
+            tokens (int): the estimated tokens (prompt plus completion)
+
+        Returns:
+            Optional[dict]: bucket name to (capacity, amount), or None if the model is not limited
+        """
+        model = model or 'default'
+
+        keys = [x for x in self._d_limits if model.startswith(x)]
+        key = max(keys, key=len) if keys else 'default'
+        if key not in self._d_limits:
+            return None
+
+        d_limit = self._d_limits[key]
+        d_amounts = {}
+
+        if d_limit.get('rpm'):
+            d_amounts[f'{key}:rpm'] = (d_limit['rpm'], 1)
+
+        if d_limit.get('tpm'):
+            # a single call larger than the whole bucket waits for a full bucket
+            d_amounts[f'{key}:tpm'] = (d_limit['tpm'],
+                                       min(tokens, d_limit['tpm']))
+
+        return d_amounts
+
+    def process(self,
+                model: str,
+                tokens: int) -> float:
+        """ Block until the Budget for a Call is Available
+
+        Args:
+            model (str): the model (or engine) name
+            tokens (int): the estimated tokens (prompt plus completion)
+
+        Returns:
+            float: the seconds spent waiting
+        """
+        d_amounts = self._amounts(model, tokens)
+        if not d_amounts:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            wait = self._take(d_amounts)
+            if not wait:
+                break
+            time.sleep(wait)
+            waited += wait
+
+        if waited and self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'Rate Limited',
+                f'\tModel: {model}',
+                f'\tTokens: {tokens}',
+                f'\tWaited: {round(waited, 3)}s']))
+
+        return waited
+
+    async def aprocess(self,
+                       model: str,
+                       tokens: int) -> float:
+        """ Await the Budget for a Call without blocking the Event Loop
+
+        A blocking store (e.g., 'bucket-store-sqlite') is called on the default executor
+
+        Args:
+            model (str): the model (or engine) name
+            tokens (int): the estimated tokens (prompt plus completion)
+
+        Returns:
+            float: the seconds spent waiting
+        """
+        d_amounts = self._amounts(model, tokens)
+        if not d_amounts:
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+
+        waited = 0.0
+        while True:
+            if self._blocking:
+                wait = await loop.run_in_executor(None, self._take, d_amounts)
+            else:
+                wait = self._take(d_amounts)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+
+        return waited
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" In-Memory LRU + TTL Cache of OpenAI Responses """
+
+
+from typing import Optional
+
+import json
+import time
+import hashlib
+from threading import Lock
+from collections import OrderedDict
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+
+class ResponseCache(BaseObject):
+    """ In-Memory LRU + TTL Cache of OpenAI Responses
+
+    Notes:
+    -   the key is a digest of everything that determines the response
+        (model or engine, formatted messages or prompt, and every sampling parameter)
+    -   responses are stored as JSON text
+        the byte size is exact and a caller cannot mutate a cached response
+    -   the least recently used entry is evicted once either bound is reached
+    -   only successful responses should be cached; a failure must not be replayed
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = 3600.0):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   repeated prompts should not cost a network round trip and tokens
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   per-entry TTL and explicit invalidation
+
+        Args:
+            max_entries (int, optional): the maximum number of cached responses. Defaults to 1024.
+                override with the 'OPENAI_CACHE_MAX_ENTRIES' environment variable
+            max_bytes (int, optional): the maximum total size of cached responses. Defaults to 64 MiB.
+                override with the 'OPENAI_CACHE_MAX_BYTES' environment variable
+            ttl (float, optional): the seconds a response stays valid. Defaults to 3600.0.
+                override with the 'OPENAI_CACHE_TTL' environment variable
+        """
+        BaseObject.__init__(self, __name__)
+        self._max_entries = EnvIO.int_or_default(
+            'OPENAI_CACHE_MAX_ENTRIES', max_entries)
+        self._max_bytes = EnvIO.int_or_default(
+            'OPENAI_CACHE_MAX_BYTES', max_bytes)
+        self._ttl = EnvIO.float_or_default('OPENAI_CACHE_TTL', ttl)
+
+        self._lock = Lock()
+        self._d_entries = OrderedDict()
+        self._bytes = 0
+        self._d_counts = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+        }
+
+    @staticmethod
+    def key(**kwargs) -> str:
+        """ Build a Cache Key from the Parameters of a Call
+
+        Returns:
+            str: a stable digest of the parameters
+        """
+        return hashlib.sha256(json.dumps(
+            kwargs,
+            sort_keys=True,
+            separators=(',', ':')).encode('utf-8')).hexdigest()
+
+    def _remove(self,
+                key: str) -> None:
+        """ Remove an Entry; the caller holds the lock """
+        _, value = self._d_entries.pop(key)
+        self._bytes -= len(value)
+
+    def get(self,
+            key: str) -> Optional[dict]:
+        """ Look up a Cached Response
+
+        Args:
+            key (str): the cache key
+
+        Returns:
+            Optional[dict]: a copy of the cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._d_entries.get(key)
+
+            if entry and entry[0] < time.monotonic():
+                self._remove(key)
+                self._d_counts['expirations'] += 1
+                entry = None
+
+            if not entry:
+                self._d_counts['misses'] += 1
+                return None
+
+            self._d_entries.move_to_end(key)
+            self._d_counts['hits'] += 1
+            value = entry[1]
+
+        return json.loads(value)
+
+    def put(self,
+            key: str,
+            response: dict,
+            ttl: Optional[float] = None) -> None:
+        """ Cache a Response
+
+        Args:
+            key (str): the cache key
+            response (dict): the successful OpenAI response
+            ttl (float, optional): the seconds this response stays valid. Defaults to None.
+                if None, the cache TTL is used
+        """
+        value = json.dumps(response, separators=(',', ':'))
+
+        # a single response larger than the whole cache is not worth evicting everything for
+        if len(value) > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._d_entries:
+                self._remove(key)
+
+            self._d_entries[key] = (time.monotonic() + (self._ttl if ttl is None else ttl), value)
+            self._bytes += len(value)
+
+            while len(self._d_entries) > self._max_entries or self._bytes > self._max_bytes:
+                self._remove(next(iter(self._d_entries)))
+                self._d_counts['evictions'] += 1
+
+    def invalidate(self,
+                   key: str) -> bool:
+        """ Discard a single Cached Response
+
+        Args:
+            key (str): the cache key
+
+        Returns:
+            bool: True if a response was discarded
+        """
+        with self._lock:
+            if key not in self._d_entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        """ Discard every Cached Response """
+        with self._lock:
+            self._d_entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """ Cache Size and Counters
+
+        Returns:
+            dict: the cache statistics
+        """
+        with self._lock:
+            lookups = self._d_counts['hits'] + self._d_counts['misses']
+            return {
+                'entries': len(self._d_entries),
+                'bytes': self._bytes,
+                'max_entries': self._max_entries,
+                'max_bytes': self._max_bytes,
+                'ttl': self._ttl,
+                'hit_rate': self._d_counts['hits'] / lookups if lookups else 0.0,
+                **self._d_counts,
+            }
@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Host-Wide Persistent Cache of OpenAI Responses backed by SQLite """
+
+
+from typing import Optional
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+from threading import Lock
+from threading import local
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+from openai_helper.dmo import BloomFilter
+from openai_helper.dmo import ResponseCache
+
+
+class ResponseCacheSqlite(BaseObject):
+    """ Host-Wide Persistent Cache of OpenAI Responses backed by SQLite
+
+    Notes:
+    -   every process on a host that points at the same file shares one cache
+        (e.g., gunicorn workers and cron jobs) and the cache survives restarts
+    -   keys are built exactly as in 'response-cache' so either cache can sit in front of a runner
+    -   responses are stored as zlib-compressed JSON
+    -   WAL mode lets readers proceed while another process writes
+    -   each process keeps a Bloom filter of the keys on disk
+        a miss that the filter rules out never touches disk
+        the filter picks up keys written by other processes every 'refresh_interval' seconds
+    -   once the cache exceeds 'max_bytes' (compressed), the oldest entries are evicted first
+    -   connections are opened per thread and per process, so a cache may be built before forking
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 ttl: float = 86400.0,
+                 refresh_interval: float = 5.0):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   every worker process and every restart started with a cold cache
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   per-entry TTL and explicit invalidation
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   open connections per process, so a cache built before forking is safe in every worker
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   an expired response found by 'get' is deleted and counted as an expiration
+
+        Args:
+            file_path (str): the path to the SQLite database (created if it does not exist)
+            max_bytes (int, optional): the maximum total size of compressed responses. Defaults to 256 MiB.
+                override with the 'OPENAI_CACHE_DB_MAX_BYTES' environment variable
+            ttl (float, optional): the seconds a response stays valid. Defaults to 86400.0.
+                override with the 'OPENAI_CACHE_DB_TTL' environment variable
+            refresh_interval (float, optional): the seconds between Bloom filter refreshes. Defaults to 5.0.
+        """
+        BaseObject.__init__(self, __name__)
+        self._file_path = os.path.abspath(file_path)
+        self._max_bytes = EnvIO.int_or_default(
+            'OPENAI_CACHE_DB_MAX_BYTES', max_bytes)
+        self._ttl = EnvIO.float_or_default('OPENAI_CACHE_DB_TTL', ttl)
+        self._refresh_interval = refresh_interval
+        self._local = local()
+        self._inherited = []
+
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                expires REAL NOT NULL,
+                size INTEGER NOT NULL,
+                value BLOB NOT NULL
+            )""")
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )""")
+        conn.execute(
+            "INSERT OR IGNORE INTO meta (name, value) VALUES ('bytes', 0)")
+
+        self._lock = Lock()
+        self._d_counts = {
+            'hits': 0,
+            'misses': 0,
+            'filtered': 0,
+            'evictions': 0,
+            'expirations': 0,
+        }
+
+        self._filter = None
+        self._last_id = 0
+        self._last_refresh = 0.0
+        self._refresh(rebuild=True)
+
+    def _conn(self) -> sqlite3.Connection:
+        """ sqlite3 connections cannot be shared across threads or processes
+
+        A forked child never uses (or closes) a connection it inherited; it opens its own
+        """
+        conn = getattr(self._local, 'conn', None)
+        if not conn or self._local.pid != os.getpid():
+            if conn:
+                # closing an inherited handle can release locks (or checkpoint the WAL) under the parent
+                self._inherited.append(conn)
+            conn = sqlite3.connect(self._file_path,
+                                   timeout=30,
+                                   isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    key = staticmethod(ResponseCache.key)
+
+    def _refresh(self,
+                 rebuild: bool = False) -> None:
+        """ Add Keys written since the last Refresh (by any process) to the Bloom Filter """
+        rows = self._conn().execute(
+            'SELECT id, key FROM responses WHERE id > ? ORDER BY id',
+            (0 if rebuild else self._last_id,)).fetchall()
+
+        with self._lock:
+            if rebuild or len(self._filter) + len(rows) > self._filter.capacity:
+                count = len(rows) if rebuild else len(self._filter) + len(rows)
+                self._filter = BloomFilter(capacity=max(100000, count * 2))
+                if not rebuild:
+                    rows = self._conn().execute(
+                        'SELECT id, key FROM responses ORDER BY id').fetchall()
+
+            for row_id, key in rows:
+                self._filter.add(key)
+                self._last_id = max(self._last_id, row_id)
+
+            self._last_refresh = time.monotonic()
+
+    def _expire(self,
+                key: str) -> bool:
+        """ Delete an Expired Response
+
+        The expiry is checked again inside the transaction, since another process may have replaced the response
+
+        Returns:
+            bool: True if the response was deleted
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            row = conn.execute(
+                'SELECT size FROM responses WHERE key = ? AND expires < ?',
+                (key, time.time())).fetchone()
+            if row:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                conn.execute(
+                    "UPDATE meta SET value = value - ? WHERE name = 'bytes'", (row[0],))
+            conn.execute('COMMIT')
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return bool(row)
+
+    def get(self,
+            key: str) -> Optional[dict]:
+        """ Look up a Cached Response
+
+        Args:
+            key (str): the cache key
+
+        Returns:
+            Optional[dict]: the cached response, or None on a miss
+        """
+        if time.monotonic() - self._last_refresh > self._refresh_interval:
+            self._refresh()
+
+        if key not in self._filter:
+            with self._lock:
+                self._d_counts['filtered'] += 1
+                self._d_counts['misses'] += 1
+            return None
+
+        row = self._conn().execute(
+            'SELECT expires, value FROM responses WHERE key = ?',
+            (key,)).fetchone()
+
+        expired = False
+        if row and row[0] < time.time():
+            expired = self._expire(key)
+            row = None
+
+        if not row:
+            with self._lock:
+                self._d_counts['misses'] += 1
+                if expired:
+                    self._d_counts['expirations'] += 1
+            return None
+
+        with self._lock:
+            self._d_counts['hits'] += 1
+
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self,
+            key: str,
+            response: dict,
+            ttl: Optional[float] = None) -> None:
+        """ Cache a Response
+
+        Args:
+            key (str): the cache key
+            response (dict): the successful OpenAI response
+            ttl (float, optional): the seconds this response stays valid. Defaults to None.
+                if None, the cache TTL is used
+        """
+        value = zlib.compress(json.dumps(
+            response, separators=(',', ':')).encode('utf-8'))
+
+        if len(value) > self._max_bytes:
+            return
+
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            now = time.time()
+            delta = len(value)
+
+            row = conn.execute(
+                'SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            if row:
+                delta -= row[0]
+
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, expires, size, value) VALUES (?, ?, ?, ?)',
+                (key, now + (self._ttl if ttl is None else ttl), len(value), value))
+
+            expired, expired_bytes = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses WHERE expires < ?',
+                (now,)).fetchone()
+            if expired:
+                conn.execute('DELETE FROM responses WHERE expires < ?', (now,))
+                delta -= expired_bytes
+
+            total = conn.execute(
+                "SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0] + delta
+
+            evicted = 0
+            while total > self._max_bytes:
+                rows = conn.execute(
+                    'SELECT id, size FROM responses ORDER BY id LIMIT 64').fetchall()
+                if not rows:
+                    break
+
+                ids = []
+                for row_id, size in rows:
+                    if total <= self._max_bytes:
+                        break
+                    ids.append((row_id,))
+                    total -= size
+
+                conn.executemany('DELETE FROM responses WHERE id = ?', ids)
+                evicted += len(ids)
+
+            conn.execute(
+                "UPDATE meta SET value = ? WHERE name = 'bytes'", (total,))
+
+            conn.execute('COMMIT')
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        with self._lock:
+            self._filter.add(key)
+            self._d_counts['evictions'] += evicted
+            self._d_counts['expirations'] += expired
+
+    def invalidate(self,
+                   key: str) -> bool:
+        """ Discard a single Cached Response (for every process)
+
+        Args:
+            key (str): the cache key
+
+        Returns:
+            bool: True if a response was discarded
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            row = conn.execute(
+                'SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            if row:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                conn.execute(
+                    "UPDATE meta SET value = value - ? WHERE name = 'bytes'", (row[0],))
+            conn.execute('COMMIT')
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return bool(row)
+
+    def clear(self) -> None:
+        """ Discard every Cached Response (for every process) """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('DELETE FROM responses')
+        conn.execute("UPDATE meta SET value = 0 WHERE name = 'bytes'")
+        conn.execute('COMMIT')
+        self._refresh(rebuild=True)
+
+    def stats(self) -> dict:
+        """ Cache Size and Counters
+
+        The size is shared by every process; the counters are for this process only
+
+        Returns:
+            dict: the cache statistics
+        """
+        entries, size = self._conn().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+
+        with self._lock:
+            lookups = self._d_counts['hits'] + self._d_counts['misses']
+            return {
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self._max_bytes,
+                'ttl': self._ttl,
+                'hit_rate': self._d_counts['hits'] / lookups if lookups else 0.0,
+                **self._d_counts,
+            }
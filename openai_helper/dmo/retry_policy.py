@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Retry Transient OpenAI Errors with Exponential Backoff and Full Jitter """
+
+
+from typing import Any
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+
+import time
+import asyncio
+from random import uniform
+from email.utils import parsedate_to_datetime
+
+from openai.error import Timeout
+from openai.error import RateLimitError
+from openai.error import APIConnectionError
+from openai.error import ServiceUnavailableError
+
+from baseblock import EnvIO
+from baseblock import BaseObject
+
+
+class RetryPolicy(BaseObject):
+    """ Retry Transient OpenAI Errors with Exponential Backoff and Full Jitter
+
+    Notes:
+    -   the delay before attempt n+1 is uniform(0, min(max_delay, base_delay * 2^(n-1)))
+    -   a 'Retry-After' header on the error takes precedence over the computed delay
+    -   no retry is scheduled if it would finish after the overall deadline
+    -   the final error is re-raised with an 'attempts' attribute
+        so the caller can still report the retry overhead
+    """
+
+    __retryable = (
+        RateLimitError,
+        ServiceUnavailableError,
+        APIConnectionError,
+        Timeout,
+    )
+
+    def __init__(self,
+                 max_attempts: int = 4,
+                 base_delay: float = 0.5,
+                 max_delay: float = 8.0,
+                 deadline: float = 30.0):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   retry rate-limit and service-unavailable errors
+                rather than immediately returning 'output:None'
+
+        Args:
+            max_attempts (int, optional): the total number of attempts (1 disables retries). Defaults to 4.
+                override with the 'OPENAI_RETRY_MAX_ATTEMPTS' environment variable
+            base_delay (float, optional): the backoff base in seconds. Defaults to 0.5.
+                override with the 'OPENAI_RETRY_BASE_DELAY' environment variable
+            max_delay (float, optional): the backoff ceiling in seconds. Defaults to 8.0.
+                override with the 'OPENAI_RETRY_MAX_DELAY' environment variable
+            deadline (float, optional): the overall time budget in seconds across all attempts. Defaults to 30.0.
+                override with the 'OPENAI_RETRY_DEADLINE' environment variable
+        """
+        BaseObject.__init__(self, __name__)
+        self._max_attempts = max(1, EnvIO.int_or_default(
+            'OPENAI_RETRY_MAX_ATTEMPTS', max_attempts))
+        self._base_delay = EnvIO.float_or_default(
+            'OPENAI_RETRY_BASE_DELAY', base_delay)
+        self._max_delay = EnvIO.float_or_default(
+            'OPENAI_RETRY_MAX_DELAY', max_delay)
+        self._deadline = EnvIO.float_or_default(
+            'OPENAI_RETRY_DEADLINE', deadline)
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """ Read the Retry-After Header (if any) from an OpenAI Error
+
+        Args:
+            error (Exception): the OpenAI error
+
+        Returns:
+            Optional[float]: the server-requested delay in seconds
+        """
+        headers = getattr(error, 'headers', None)
+        if not headers:
+            return None
+
+        value = headers.get('retry-after-ms')
+        if value:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+
+        value = headers.get('retry-after')
+        if not value:
+            return None
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _is_retryable(self,
+                      error: Exception) -> bool:
+        if not isinstance(error, self.__retryable):
+            return False
+
+        # an exhausted quota will not recover in a few hundred milliseconds
+        if getattr(error, 'code', None) == 'insufficient_quota':
+            return False
+
+        return True
+
+    def _delay(self,
+               attempt: int,
+               error: Exception,
+               start: float) -> Optional[float]:
+        """ Compute the Delay before the next Attempt
+
+        Args:
+            attempt (int): the attempt that just failed (1-based)
+            error (Exception): the error raised by that attempt
+            start (float): the monotonic time of the first attempt
+
+        Returns:
+            Optional[float]: the delay in seconds, or None if no further attempt should be made
+        """
+        if attempt >= self._max_attempts or not self._is_retryable(error):
+            return None
+
+        delay = self._retry_after(error)
+        if delay is None:
+            delay = uniform(0, min(self._max_delay,
+                                   self._base_delay * (2 ** (attempt - 1))))
+
+        if time.monotonic() + delay - start > self._deadline:
+            return None
+
+        if self.isEnabledForInfo:
+            self.logger.info('\n'.join([
+                'Retrying OpenAI Call',
+                f'\tError: {type(error).__name__}',
+                f'\tAttempt: {attempt} of {self._max_attempts}',
+                f'\tDelay: {round(delay, 3)}s']))
+
+        return delay
+
+    def process(self,
+                function: Callable,
+                **kwargs) -> Tuple[Any, int]:
+        """ Call a Function and Retry on Transient Errors
+
+        Args:
+            function (Callable): the function to call
+
+        Raises:
+            Exception: the final error (with an 'attempts' attribute) once retries are exhausted
+
+        Returns:
+            Tuple[Any, int]: the function result and the number of attempts made
+        """
+        start = time.monotonic()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return function(**kwargs), attempt
+
+            except Exception as e:
+                delay = self._delay(attempt, e, start)
+                if delay is None:
+                    e.attempts = attempt
+                    raise
+
+            time.sleep(delay)
+
+    async def aprocess(self,
+                       function: Callable,
+                       **kwargs) -> Tuple[Any, int]:
+        """ Await a Coroutine Function and Retry on Transient Errors
+
+        Args:
+            function (Callable): the coroutine function to await
+
+        Raises:
+            Exception: the final error (with an 'attempts' attribute) once retries are exhausted
+
+        Returns:
+            Tuple[Any, int]: the function result and the number of attempts made
+        """
+        start = time.monotonic()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await function(**kwargs), attempt
+
+            except Exception as e:
+                delay = self._delay(attempt, e, start)
+                if delay is None:
+                    e.attempts = attempt
+                    raise
+
+            await asyncio.sleep(delay)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" In-Process Synthetic Stand-In for the OpenAI Connection """
+
+
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+import time
+import asyncio
+from types import SimpleNamespace
+from threading import Lock
+
+from baseblock import BaseObject
+
+VOCABULARY = ('the', 'quick', 'brown', 'fox', 'jumps', 'over', 'a', 'lazy', 'dog.')
+
+
+class SyntheticConnection(BaseObject):
+    """ In-Process Synthetic Stand-In for the OpenAI Connection
+
+    Notes:
+    -   pass as 'conn' to any business process or runner
+        (e.g., 'OpenAITextCompletion(conn=SyntheticConnection())')
+    -   exposes 'Completion' and 'ChatCompletion' with 'create' and 'acreate'
+        exactly where the runners look for them on the openai module
+    -   responses are real 'OpenAIObject' instances, so the runners pay the same conversion costs
+    -   nothing touches the network; with 'delay=0.0' every call returns immediately
+        so a benchmark measures only the overhead of this library
+    """
+
+    def __init__(self,
+                 completion_tokens: int = 64,
+                 choices: int = 1,
+                 delay: float = 0.0,
+                 reply: Optional[str] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   isolate regressions in our own hot path from network noise
+
+        Args:
+            completion_tokens (int, optional): the number of words in each generated choice. Defaults to 64.
+                a smaller 'max_tokens' on the call truncates the choice
+            choices (int, optional): the number of choices in each response. Defaults to 1.
+            delay (float, optional): the seconds each call takes. Defaults to 0.0.
+            reply (str, optional): a fixed reply that replaces the generated text. Defaults to None.
+        """
+        BaseObject.__init__(self, __name__)
+        self._completion_tokens = completion_tokens
+        self._choices = choices
+        self._delay = delay
+        self._reply = reply
+
+        self._lock = Lock()
+        self._calls = 0
+
+        self.Completion = SimpleNamespace(
+            create=lambda **kwargs: self.create(chat=False, **kwargs),
+            acreate=lambda **kwargs: self.acreate(chat=False, **kwargs))
+        self.ChatCompletion = SimpleNamespace(
+            create=lambda **kwargs: self.create(chat=True, **kwargs),
+            acreate=lambda **kwargs: self.acreate(chat=True, **kwargs))
+
+    @property
+    def calls(self) -> int:
+        """ The number of calls made against this connection """
+        return self._calls
+
+    def _words(self,
+               max_tokens: Optional[int]) -> list:
+        if self._reply is not None:
+            words = self._reply.split(' ')
+        else:
+            words = [VOCABULARY[i % len(VOCABULARY)]
+                     for i in range(self._completion_tokens)]
+        if max_tokens:
+            words = words[:max_tokens]
+        return words
+
+    def response(self,
+                 chat: bool,
+                 **kwargs) -> Any:
+        """ Build a Synthetic Response
+
+        Args:
+            chat (bool): True for a 'chat.completion', False for a 'text_completion'
+
+        Returns:
+            openai.openai_object.OpenAIObject: the response
+        """
+        from openai.util import convert_to_openai_object
+
+        with self._lock:
+            self._calls += 1
+            completion_id = f"{'chatcmpl' if chat else 'cmpl'}-synthetic-{self._calls}"
+
+        words = self._words(kwargs.get('max_tokens'))
+        text = ' '.join(words)
+
+        if chat:
+            choices = [{
+                'index': i,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop'} for i in range(self._choices)]
+        else:
+            choices = [{
+                'index': i,
+                'text': text,
+                'logprobs': None,
+                'finish_reason': 'stop'} for i in range(self._choices)]
+
+        return convert_to_openai_object({
+            'id': completion_id,
+            'object': 'chat.completion' if chat else 'text_completion',
+            'created': int(time.time()),
+            'model': kwargs.get('model') or kwargs.get('engine') or 'synthetic',
+            'choices': choices,
+            'usage': {
+                'prompt_tokens': 0,
+                'completion_tokens': len(words) * self._choices,
+                'total_tokens': len(words) * self._choices},
+        })
+
+    def _stream(self,
+                d_response: Any) -> Iterator[Any]:
+        from openai.util import convert_to_openai_object
+
+        content = d_response['choices'][0]['message']['content']
+        words = content.split(' ')
+
+        for i, word in enumerate(words):
+            yield convert_to_openai_object({
+                'id': d_response['id'],
+                'object': 'chat.completion.chunk',
+                'model': d_response['model'],
+                'choices': [{
+                    'index': 0,
+                    'delta': {'content': word if i == 0 else f' {word}'},
+                    'finish_reason': 'stop' if i == len(words) - 1 else None}],
+            })
+
+    def create(self,
+               chat: bool,
+               **kwargs) -> Any:
+        """ Stand-In for 'Completion.create' and 'ChatCompletion.create' """
+        if self._delay:
+            time.sleep(self._delay)
+
+        d_response = self.response(chat, **kwargs)
+        if chat and kwargs.get('stream'):
+            return self._stream(d_response)
+        return d_response
+
+    async def acreate(self,
+                      chat: bool,
+                      **kwargs) -> Any:
+        """ Stand-In for 'Completion.acreate' and 'ChatCompletion.acreate' """
+        if self._delay:
+            await asyncio.sleep(self._delay)
+
+        d_response = self.response(chat, **kwargs)
+        if not (chat and kwargs.get('stream')):
+            return d_response
+
+        async def stream():
+            for chunk in self._stream(d_response):
+                yield chunk
+
+        return stream()
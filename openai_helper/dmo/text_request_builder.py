@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Build a Text Completion Request: everything that happens before the Network Call """
+
+
+from typing import Tuple
+from typing import Optional
+
+from baseblock import BaseObject
+
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import TokenEstimator
+from openai_helper.dmo import ModelRegistry
+from openai_helper.dmo import CompletionEventExtractor
+
+
+class TextRequestBuilder(BaseObject):
+    """ Build a Text Completion Request: everything that happens before the Network Call
+
+    Notes:
+    -   shared by 'run-text-completion' and 'run-text-completion-async'
+        each runner only owns its transport ('create' or 'acreate')
+    -   validates the inputs (see 'completion-event-extractor'), sizes 'max_tokens' against the context window
+        and derives the cache key and the rate limiter token count of the request
+    -   nothing here blocks or touches the network
+    """
+
+    def __init__(self):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   the blocking and coroutine text runners duplicated every pre-flight step
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   check the context window against a guaranteed bound (UTF-8 length), not a token estimate
+        """
+        BaseObject.__init__(self, __name__)
+        self._token_counter = InputTokenCounter()
+        self._estimate_tokens = TokenEstimator().process
+        self._registry = ModelRegistry()
+        self._extract_event = CompletionEventExtractor().process
+
+    def _budget(self,
+                input_prompt: str,
+                engine: str,
+                max_tokens: Optional[int]) -> Tuple[int, int]:
+        """ Size 'max_tokens' against the Context Window of the Engine
+
+        The default 'max_tokens' is sized from a token estimate
+        the context window is checked against a guaranteed bound (the UTF-8 length of the prompt)
+        and the prompt is only counted exactly when that bound could reach the context window
+
+        Raises:
+            InvalidRequestError: the prompt leaves no room for a completion
+
+        Returns:
+            Tuple[int, int]: the prompt tokens, and the 'max_tokens' to send
+        """
+        def requested(prompt_tokens: int) -> int:
+            return max_tokens if max_tokens else prompt_tokens * 3
+
+        d_estimate = self._estimate_tokens(
+            messages=[input_prompt],
+            model=engine)
+
+        prompt_tokens = upper = d_estimate['tokens']
+
+        d_model = self._registry.process(engine)
+        if d_model:
+            upper = len(input_prompt.encode('utf-8'))  # every token spans at least one byte
+            if upper + requested(prompt_tokens) >= d_model['context_window']:
+                prompt_tokens = upper = len(self._token_counter.encoding(
+                    engine).encode_ordinary(input_prompt))
+
+        return prompt_tokens, self._registry.budget(
+            model=engine,
+            prompt_tokens=upper,
+            max_tokens=requested(prompt_tokens))
+
+    @staticmethod
+    def kwargs(d_request: dict) -> dict:
+        """ The Keyword Arguments of the Completion Call
+
+        Args:
+            d_request (dict): the request built by 'process'
+
+        Returns:
+            dict: the completion parameters (the runner adds its own 'timeout')
+        """
+        d_event = d_request['event']
+        return {
+            'engine': d_event['engine'],
+            'prompt': d_event['input_prompt'],
+            'temperature': d_event['temperature'],
+            'max_tokens': d_event['max_tokens'],
+            'top_p': d_event['top_p'],
+            'best_of': d_event['best_of'],
+            'frequency_penalty': d_event['frequency_penalty'],
+            'presence_penalty': d_event['presence_penalty'],
+        }
+
+    @staticmethod
+    def cache_key(cache: object,
+                  d_request: dict) -> str:
+        """ The Response Cache Key of a Request
+
+        Args:
+            cache (object): either 'response-cache' or 'response-cache-sqlite' (both build keys the same way)
+            d_request (dict): the request built by 'process'
+
+        Returns:
+            str: the cache key
+        """
+        return cache.key(**{
+            k: v for k, v in d_request['event'].items()
+            if k != 'timeout'})
+
+    @staticmethod
+    def tokens(d_request: dict) -> int:
+        """ The Tokens a Request draws from the Rate Limiter
+
+        Args:
+            d_request (dict): the request built by 'process'
+
+        Returns:
+            int: the prompt tokens plus 'max_tokens'
+        """
+        return d_request['prompt_tokens'] + d_request['event']['max_tokens']
+
+    def process(self,
+                input_prompt: str,
+                engine: str = None,
+                best_of: int = None,
+                temperature: float = None,
+                max_tokens: int = None,
+                top_p: float = None,
+                frequency_penalty: int = None,
+                presence_penalty: int = None) -> dict:
+        """ Build a Text Completion Request
+
+        The parameters are identical to those of 'run-text-completion'
+
+        Raises:
+            InvalidRequestError: the prompt alone exceeds the context window of the engine
+
+        Returns:
+            dict: the request
+                event: the validated parameters with default values where appropriate
+                    'max_tokens' is trimmed to the context window of the engine
+                prompt_tokens: the prompt tokens (estimated unless near the context window)
+        """
+        d_event = self._extract_event(
+            input_prompt=input_prompt,
+            engine=engine,
+            best_of=best_of,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            frequency_penalty=frequency_penalty,
+            presence_penalty=presence_penalty)
+
+        prompt_tokens, d_event['max_tokens'] = self._budget(
+            input_prompt=d_event['input_prompt'],
+            engine=d_event['engine'],
+            max_tokens=max_tokens)
+
+        return {
+            'event': d_event,
+            'prompt_tokens': prompt_tokens,
+        }
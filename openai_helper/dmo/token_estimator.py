@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Estimate Tokens from Byte Statistics without Tokenizing """
+
+
+from typing import List
+from typing import Tuple
+from typing import Union
+
+import math
+import string
+
+from baseblock import BaseObject
+
+from openai_helper.dmo import InputTokenCounter
+
+LOWERCASE = string.ascii_lowercase.encode('ascii')
+UPPERCASE = string.ascii_uppercase.encode('ascii')
+WHITESPACE = b' \t\r\n'
+PUNCTUATION = string.punctuation.encode('ascii')
+DIGITS = string.digits.encode('ascii')
+
+# the UTF-8 lead bytes of 2-byte (e.g., Latin, Greek, Cyrillic), 3-byte (e.g., CJK) and 4-byte (e.g., emoji) characters
+LEAD_2 = bytes(range(0xC0, 0xE0))
+LEAD_3 = bytes(range(0xE0, 0xF0))
+LEAD_4 = bytes(range(0xF0, 0xF8))
+
+# calibrated against tiktoken with 'drivers/token_estimator_benchmark.py'
+#   on a mixed corpus: prose and code, plus digits, whitespace runs, base64, URLs, Cyrillic, CJK and emoji
+#   weights and errors apply to: lowercase, uppercase, whitespace, punctuation, digits,
+#       2-byte, 3-byte and 4-byte characters, and a constant
+#   each character class has its own error term; ~99% of held-out samples were within the error of the exact count
+CALIBRATION = {
+    'cl100k_base': {
+        'weights': (0.3327, 0.5828, 0.0404, 0.0669, 0.4650, 0.5831, 1.1696, 2.5951, 0.3448),
+        'errors': (0.0650, 0.5239, 0.2035, 0.6069, 0.4928, 0.3893, 1.0481, 0.3692, 1.0138),
+    },
+    'p50k_base': {
+        'weights': (0.3713, 0.7637, 0.1659, 0.0780, 0.5044, 1.2638, 1.9883, 2.5760, 0.1376),
+        'errors': (0.0619, 0.4543, 0.3052, 0.4940, 0.3170, 0.2800, 0.8108, 0.3042, 2.7399),
+    },
+}
+
+# 'r50k_base' shares its vocabulary with 'p50k_base' (less the whitespace tokens used for code)
+CALIBRATION['r50k_base'] = CALIBRATION['p50k_base']
+
+
+class TokenEstimator(BaseObject):
+    """ Estimate Tokens from Byte Statistics without Tokenizing
+
+    Notes:
+    -   the estimate is a linear function of a few byte counts
+        each count is a single C-level pass ('bytes.translate'), so no tokenizer is loaded or run
+    -   weights are calibrated per encoding against tiktoken
+        and every estimate is reported with its expected error (a ~99% bound)
+    -   the error is a sum over character classes, so text unlike prose (digits, whitespace runs,
+        base64, URLs, non-latin scripts or emoji) carries the wider error its classes need
+    -   message overhead ('tokens-per-message' and reply priming) is added exactly as in 'input-token-counter'
+    -   use the estimate for sizing and budgeting, never as a hard limit
+        the context window is checked against 'input-token-counter.upper-bound' (or an exact count)
+    """
+
+    def __init__(self):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   most prompts do not need an exact count just to size 'max_tokens'
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   calibrate on a mixed corpus with an error term per character class
+                the single relative error only held for English prose
+        """
+        BaseObject.__init__(self, __name__)
+        self._resolve = InputTokenCounter().resolve
+
+    @staticmethod
+    def features(input_text: str) -> Tuple[int, ...]:
+        """ The Byte Statistics the Estimate is built from
+
+        Args:
+            input_text (str): the input text
+
+        Returns:
+            Tuple[int, ...]: lowercase, uppercase, whitespace, punctuation, digits,
+                2-byte, 3-byte and 4-byte characters, and 1
+        """
+        encoded = input_text.encode('utf-8')
+        total = len(encoded)
+
+        def count(byte_class: bytes) -> int:
+            return total - len(encoded.translate(None, byte_class))
+
+        return (count(LOWERCASE),
+                count(UPPERCASE),
+                count(WHITESPACE),
+                count(PUNCTUATION),
+                count(DIGITS),
+                count(LEAD_2),
+                count(LEAD_3),
+                count(LEAD_4),
+                1)
+
+    @staticmethod
+    def encoding_name(model: str) -> str:
+        """ The Encoding a Model uses (cl100k_base if unknown) """
+        from tiktoken.model import encoding_name_for_model
+
+        try:
+            encoding_name = encoding_name_for_model(model)
+        except KeyError:
+            return 'cl100k_base'
+
+        if encoding_name not in CALIBRATION:
+            return 'cl100k_base'
+        return encoding_name
+
+    @staticmethod
+    def estimate(input_text: str,
+                 encoding_name: str = 'cl100k_base') -> float:
+        """ Estimate the Tokens in a single Text without any Message Overhead
+
+        Args:
+            input_text (str): the input text
+            encoding_name (str, optional): the encoding to estimate for. Defaults to 'cl100k_base'.
+
+        Returns:
+            float: the (unrounded) estimate
+        """
+        if not input_text:
+            return 0.0
+
+        weights = CALIBRATION[encoding_name]['weights']
+        return max(0.0, sum(x * w for x, w in zip(
+            TokenEstimator.features(input_text), weights)))
+
+    @staticmethod
+    def error(input_text: str,
+              encoding_name: str = 'cl100k_base') -> float:
+        """ The Expected Error of 'estimate' for a single Text
+
+        Args:
+            input_text (str): the input text
+            encoding_name (str, optional): the encoding to estimate for. Defaults to 'cl100k_base'.
+
+        Returns:
+            float: the (unrounded) error; ~99% of exact counts fall within estimate +/- error
+        """
+        if not input_text:
+            return 0.0
+
+        errors = CALIBRATION[encoding_name]['errors']
+        return sum(x * e for x, e in zip(
+            TokenEstimator.features(input_text), errors))
+
+    def process(self,
+                messages: Union[List[str], str],
+                model: str = 'gpt-3.5-turbo-0301') -> dict:
+        """ Estimate the Number of Tokens in an Input
+
+        Args:
+            messages (List[str] or str): a List of strings or simply an input string
+            model (str, optional): the model to estimate tokens for. Defaults to "gpt-3.5-turbo-0301".
+
+        Returns:
+            dict: the estimate
+                tokens: the estimated total (comparable to 'input-token-counter')
+                error: the expected error; ~99% of exact counts fall within tokens +/- error
+                encoding: the encoding the estimate was calibrated for
+        """
+        if type(messages) == str:
+            messages = [messages]
+
+        model, tokens_per_message = self._resolve(model)
+        encoding_name = self.encoding_name(model)
+
+        weights = CALIBRATION[encoding_name]['weights']
+        errors = CALIBRATION[encoding_name]['errors']
+
+        content_tokens = error = 0.0
+        for features in [self.features(x) for x in messages if x]:
+            content_tokens += max(0.0, sum(x * w for x, w in zip(features, weights)))
+            error += sum(x * e for x, e in zip(features, errors))
+
+        return {
+            'tokens': round(content_tokens) + tokens_per_message * len(messages) + 3,
+            'error': math.ceil(error),
+            'encoding': encoding_name,
+        }
@@ -1,5 +1,33 @@
-from .run_chat_completion import RunChatCompletion
-from .run_text_completion import RunTextCompletion
-from .extract_top_response import ExtractTopResponse
-from .create_openai_answer import CreateOpenAIAnswer
-from .extract_primary_topic import ExtractPrimaryTopic
+""" Services, imported lazily on first use
+
+Importing this package is cheap; each module (and its dependencies, such as openai or tiktoken)
+is only imported when one of its names is first accessed
+"""
+
+
+from importlib import import_module
+
+_d_modules = {
+    'RunChatCompletion': 'run_chat_completion',
+    'RunTextCompletion': 'run_text_completion',
+    'ExtractTopResponse': 'extract_top_response',
+    'CreateOpenAIAnswer': 'create_openai_answer',
+    'ExtractPrimaryTopic': 'extract_primary_topic',
+    'RunChatCompletionAsync': 'run_chat_completion_async',
+    'RunTextCompletionAsync': 'run_text_completion_async',
+}
+
+__all__ = list(_d_modules)
+
+
+def __getattr__(name: str):
+    if name not in _d_modules:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(f'.{_d_modules[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -16,7 +16,8 @@ class CreateOpenAIAnswer(BaseObject):
     """ Craft an Answer from OpenAI """
 
     def __init__(self,
-                 model_name: str):
+                 model_name: str,
+                 conn: object = None):
         """ Change Log
 
         Created:
@@ -24,14 +25,19 @@ class CreateOpenAIAnswer(BaseObject):
             craigtrim@gmail.com
             *   refactored out of 'openai-custom-model' in pursuit of
                 https://bast-ai.atlassian.net/browse/COR-94
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   allow optional conn as parameter
+                so the pooled connector session can be shared
 
         Args:
-            openai (object): an instantiation of openAI
             model_name (str): the name of the custom model to query
+            conn (object): a connection to openAI
         """
         BaseObject.__init__(self, __name__)
         self._model_name = model_name
-        self._conn = OpenAIConnector().process()
+        self._conn = conn if conn else OpenAIConnector().process()
         self._generate_event = ServiceEventGenerator().process
 
     def _process(self,
@@ -4,12 +4,25 @@
 
 
 from typing import Optional
-from functools import lru_cache
+
+from threading import Lock
+
+from baseblock import EnvIO
 from baseblock import BaseObject
 
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import ResponseCacheSqlite
+
 
 class ExtractPrimaryTopic(BaseObject):
-    """ Find and Extract a Primary Topic from an Input Sentence """
+    """ Find and Extract a Primary Topic from an Input Sentence
+
+    Notes:
+    -   extractions are cached, and the default cache is shared by every instance
+    -   a failed extraction (None) is cached for a short 'negative_ttl' only
+        so a transient API failure is retried soon rather than poisoning the cache
+    -   set 'OPENAI_TOPIC_CACHE_DB' to persist the default cache in a host-wide SQLite file
+    """
 
     __invalid_responses = [
         'the input is incomplete',
@@ -22,7 +35,13 @@ class ExtractPrimaryTopic(BaseObject):
         'please provide a complete input',
     ]
 
-    def __init__(self):
+    __lock = Lock()
+    __shared_cache = None
+
+    def __init__(self,
+                 cache: Optional[object] = None,
+                 ttl: float = 86400.0,
+                 negative_ttl: float = 60.0):
         """ Change Log
 
         Created:
@@ -30,12 +49,55 @@ class ExtractPrimaryTopic(BaseObject):
             craigtrim@gmail.com
             #   TODO:   this should likely go into a service called openai-usage
                         that consumes openai-helper and provides custom prompts and extractions like this
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   replace the unbounded 'lru_cache' with a bounded TTL cache
+                and stop caching failed extractions forever
+
+        Args:
+            cache (object, optional): a 'response-cache' or 'response-cache-sqlite'. Defaults to None.
+                if None, a bounded cache shared by every instance is used
+            ttl (float, optional): the seconds an extracted topic stays cached. Defaults to 86400.0.
+            negative_ttl (float, optional): the seconds a failed extraction stays cached. Defaults to 60.0.
+                override with the 'OPENAI_TOPIC_NEGATIVE_TTL' environment variable
         """
         BaseObject.__init__(self, __name__)
+        self._cache = cache if cache else self._default_cache()
+        self._ttl = ttl
+        self._negative_ttl = EnvIO.float_or_default(
+            'OPENAI_TOPIC_NEGATIVE_TTL', negative_ttl)
+
+    @classmethod
+    def _default_cache(cls) -> object:
+        with cls.__lock:
+            if not cls.__shared_cache:
+                file_path = EnvIO.str_or_default('OPENAI_TOPIC_CACHE_DB', None)
+                if file_path:
+                    cls.__shared_cache = ResponseCacheSqlite(file_path)
+                else:
+                    cls.__shared_cache = ResponseCache(max_entries=10000)
+            return cls.__shared_cache
+
+    def _extract(self,
+                 input_text: str) -> Optional[str]:
+        key = self._cache.key(service='extract-primary-topic',
+                              input_text=input_text)
+
+        d_cached = self._cache.get(key)
+        if d_cached:
+            return d_cached['topic']
+
+        result = self._extract_topic(input_text)
+
+        self._cache.put(key,
+                        {'topic': result},
+                        ttl=self._ttl if result else self._negative_ttl)
+
+        return result
 
     @staticmethod
-    @lru_cache
-    def _extract(input_text: str) -> Optional[str]:
+    def _extract_topic(input_text: str) -> Optional[str]:
         from openai_helper import chat
 
         input_prompt = "Extract the primary topic. Only respond with the topic and no other text.  If you can't find a topic, don't print anything."
@@ -46,6 +108,30 @@ class ExtractPrimaryTopic(BaseObject):
 
         return result
 
+    def invalidate(self,
+                   input_text: Optional[str] = None) -> None:
+        """ Discard a Cached Extraction
+
+        Args:
+            input_text (str, optional): the input to forget. Defaults to None.
+                if None, every cached extraction is discarded
+        """
+        if input_text is None:
+            self._cache.clear()
+            return
+
+        self._cache.invalidate(self._cache.key(
+            service='extract-primary-topic',
+            input_text=input_text))
+
+    def stats(self) -> dict:
+        """ Cache Size and Counters
+
+        Returns:
+            dict: the cache statistics
+        """
+        return self._cache.stats()
+
     def process(self,
                 input_text: str) -> Optional[str]:
 
@@ -5,9 +5,14 @@
 
 from typing import Any
 from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Callable
 from typing import Optional
+from typing import Generator
 
 from pprint import pformat
+from contextlib import contextmanager
 
 from baseblock import Enforcer
 from baseblock import Stopwatch
@@ -18,14 +23,26 @@ from openai.error import PermissionError
 from openai.error import AuthenticationError
 from openai.error import ServiceUnavailableError
 
-from openai_helper.dmo import ChatMessageFormatter
+from openai_helper.dmo import RetryPolicy
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import Conversation
+from openai_helper.dmo import ChatRequestBuilder
+from openai_helper.dmo import ChatStreamAssembler
 
 
 class RunChatCompletion(BaseObject):
     """ Run a Chat Completion against OpenAI """
 
     def __init__(self,
-                 conn: object):
+                 conn: object,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 max_prompt_tokens: Optional[int] = None):
         """ Change Log
 
         Created:
@@ -36,25 +53,103 @@ class RunChatCompletion(BaseObject):
             28-Mar-2023
             craigtrim@gmail.com
             *   pass model name in dynamically
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   retry transient errors with exponential backoff and jitter
+                and report the number of attempts on each result
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional client-side rate limiter in front of every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional adaptive (AIMD) concurrency limiter around every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional in-memory response cache in front of the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'stream' yields content deltas as they arrive
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   accept a 'conversation' as messages; its running token total replaces a recount
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional 'max_tokens', trimmed to the context window of the model
+                a prompt too long for the model is rejected before the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional prompt token budget; the oldest history is left out to fit it
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   move the pre-flight steps into 'chat-request-builder', shared with the coroutine runner
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'stream' charges the rate limiter on every attempt, not once per call
 
         Args:
             conn (object): a connected instance of OpenAI
             timeout (int, optional): the timeout for the API call. Defaults to 15.
+            retry_policy (RetryPolicy, optional): the retry policy for transient errors. Defaults to None.
+                a default policy (configurable via the environment) is used if none is given
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache; repeated calls are answered without a network call. Defaults to None.
+                either 'response-cache' (in-memory) or 'response-cache-sqlite' (host-wide)
+            max_prompt_tokens (int, optional): the prompt token budget of every call. Defaults to None.
+                the system prompt and the newest messages that fit are sent (see 'chat-message-formatter')
+                if None, this is read from 'OPENAI_MAX_PROMPT_TOKENS'; if that is unset, the full history is sent
         """
         BaseObject.__init__(self, __name__)
+        self._retry = retry_policy if retry_policy else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
         self._completion = conn.ChatCompletion.create
-        self._formatter = ChatMessageFormatter().process
+        self._request = ChatRequestBuilder(max_prompt_tokens=max_prompt_tokens)
+        self._token_counter = InputTokenCounter()
 
     def _process(self,
-                 input_messages: List[str],
-                 model: str) -> Optional[dict]:
-
-        def invoke_call() -> Optional[Any]:
+                 d_request: dict) -> Optional[dict]:
+        input_messages = d_request['messages']
+        model = d_request['model']
+
+        cache_key = None
+        if self._cache:
+            cache_key = self._request.cache_key(self._cache, d_request)
+            d_output = self._cache.get(cache_key)
+            if d_output:
+                return {
+                    'input': input_messages,
+                    'output': d_output,
+                    'attempts': 0
+                }
+
+        tokens = self._request.tokens(d_request) if self._rate_limiter else 0
+
+        def create(**kwargs) -> Any:
+            if self._rate_limiter:
+                self._rate_limiter.process(model=model, tokens=tokens)
+            if not self._concurrency_limiter:
+                return self._completion(**kwargs)
+            with self._concurrency_limiter.slot():
+                return self._completion(**kwargs)
+
+        def invoke_call() -> Tuple[Optional[Any], int]:
             try:
 
-                return self._completion(
-                    model=model,
-                    messages=input_messages
+                return self._retry.process(
+                    create,
+                    **self._request.kwargs(d_request)
                 )
 
                 # DESIGN NOTE
@@ -62,38 +157,45 @@ class RunChatCompletion(BaseObject):
                 # force this on the consumer ...
 
             except RateLimitError as e:
-                self.logger.exception('Rate Limit Error', e)
-                return None
+                self.logger.exception('Rate Limit Error')
+                return None, getattr(e, 'attempts', 1)
 
             except PermissionError as e:
-                self.logger.exception('Permission Error', e)
-                return None
+                self.logger.exception('Permission Error')
+                return None, getattr(e, 'attempts', 1)
 
             except AuthenticationError as e:
-                self.logger.exception('Authentication Error', e)
-                return None
+                self.logger.exception('Authentication Error')
+                return None, getattr(e, 'attempts', 1)
 
             except ServiceUnavailableError as e:
-                self.logger.exception('Service Unavailable Error', e)
-                return None
+                self.logger.exception('Service Unavailable Error')
+                return None, getattr(e, 'attempts', 1)
 
-        response = invoke_call()
+        response, attempts = invoke_call()
 
         if not response:
             return {
                 'input': input_messages,
-                'output': None
+                'output': None,
+                'attempts': attempts
             }
 
+        d_output = dict(response)
+        if cache_key:
+            self._cache.put(cache_key, d_output)
+
         return {
             'input': input_messages,
-            'output': dict(response)
+            'output': d_output,
+            'attempts': attempts
         }
 
     def process(self,
                 input_prompt: str,
-                messages: List[str],
-                model: Optional[str] = 'gpt-3.5-turbo') -> dict:
+                messages: Union[List[str], Conversation],
+                model: Optional[str] = 'gpt-3.5-turbo',
+                max_tokens: Optional[int] = None) -> dict:
         """ Run an OpenAI event
 
         Args:
@@ -102,7 +204,8 @@ class RunChatCompletion(BaseObject):
                 Sample Input Prompt:
                     "You are a helpful assistant."
 
-            messages (List[str]): The messages to execute the chat completion upon
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
+                a 'conversation' supplies its own system prompt ('input_prompt' is ignored)
 
                 Sample Messages:
                     [
@@ -116,9 +219,15 @@ class RunChatCompletion(BaseObject):
                     even-numbered entries as system responses
 
             model (str): the model to use
+            max_tokens (int, optional): The Maximum Number of tokens to generate. Defaults to None.
+                if None, the model may use whatever the context window leaves after the prompt
+                trimmed to what the context window of the model leaves after the prompt (see 'model-registry')
+
+        Raises:
+            InvalidRequestError: the prompt alone exceeds the context window of the model
 
         Returns:
-            dict: an output dictionary with two keys:
+            dict: an output dictionary with three keys:
                 input: the input dictionary with validated parameters and default values where appropriate
                 output: the output event from OpenAI
                     Unless RateLimitError, PermissionError, AuthenticationError, ServiceUnavailableError
@@ -126,17 +235,18 @@ class RunChatCompletion(BaseObject):
                     This service will not catch Exception or Error classes generally
                     -   the door is still left open for these and other error types to be thrown
                         and the consumer must plan for this eventuality
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
         """
 
         sw = Stopwatch()
 
-        input_messages = self._formatter(
+        d_request = self._request.process(
             input_prompt=input_prompt,
-            messages=messages)
-
-        d_result = self._process(
+            messages=messages,
             model=model,
-            input_messages=input_messages)
+            max_tokens=max_tokens)
+
+        d_result = self._process(d_request)
 
         if not d_result:
             self.logger.error('\n'.join([
@@ -155,3 +265,117 @@ class RunChatCompletion(BaseObject):
                 f'\tOutput Result:\n{pformat(d_result)}']))
 
         return d_result
+
+    @contextmanager
+    def _slot(self):
+        if not self._concurrency_limiter:
+            yield
+            return
+        with self._concurrency_limiter.slot():
+            yield
+
+    def stream(self,
+               input_prompt: str,
+               messages: Union[List[str], Conversation],
+               model: Optional[str] = 'gpt-3.5-turbo',
+               on_complete: Optional[Callable] = None,
+               max_tokens: Optional[int] = None) -> Generator[str, None, dict]:
+        """ Run an OpenAI event and Stream the Response
+
+        Args:
+            input_prompt (str): a defined input prompt
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
+                a 'conversation' supplies its own system prompt ('input_prompt' is ignored)
+            model (str): the model to use
+            on_complete (Callable, optional): called with the assembled result once the stream ends. Defaults to None.
+            max_tokens (int, optional): The Maximum Number of tokens to generate. Defaults to None.
+                if None, the model may use whatever the context window leaves after the prompt
+                trimmed to what the context window of the model leaves after the prompt (see 'model-registry')
+
+        Yields:
+            str: each content delta as it arrives
+
+        Returns:
+            dict: the same three keys as 'process'
+                the output is assembled from the stream once it ends, with locally computed usage
+                only the initial request is retried; a stream that breaks part-way raises
+        """
+
+        sw = Stopwatch()
+
+        d_request = self._request.process(
+            input_prompt=input_prompt,
+            messages=messages,
+            model=model,
+            max_tokens=max_tokens)
+        input_messages = d_request['messages']
+
+        tokens = self._request.tokens(d_request) if self._rate_limiter else 0
+
+        def create(**kwargs) -> Any:
+            # every attempt is charged, as in '_process'; a retried request spends the quota again
+            if self._rate_limiter:
+                self._rate_limiter.process(model=model, tokens=tokens)
+            return self._completion(**kwargs)
+
+        assembler = ChatStreamAssembler(
+            model=model,
+            token_counter=self._token_counter)
+
+        attempts = 1
+        d_result = None
+
+        # the slot is held for the whole stream; the connection stays busy until the last chunk
+        try:
+
+            with self._slot():
+                response, attempts = self._retry.process(
+                    create,
+                    stream=True,
+                    **self._request.kwargs(d_request))
+
+                for chunk in response:
+                    delta = assembler.process(chunk)
+                    if delta:
+                        yield delta
+
+            d_result = {
+                'input': input_messages,
+                'output': assembler.output(input_messages),
+                'attempts': attempts
+            }
+
+        except RateLimitError as e:
+            self.logger.exception('Rate Limit Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        except PermissionError as e:
+            self.logger.exception('Permission Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        except AuthenticationError as e:
+            self.logger.exception('Authentication Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        except ServiceUnavailableError as e:
+            self.logger.exception('Service Unavailable Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        if not d_result:
+            d_result = {
+                'input': input_messages,
+                'output': None,
+                'attempts': attempts
+            }
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'OpenAI Stream Completed',
+                f'\tTotal Time: {str(sw)}',
+                f'\tInput Prompt: {input_prompt}',
+                f'\tOutput Result:\n{pformat(d_result)}']))
+
+        if on_complete:
+            on_complete(d_result)
+
+        return d_result
@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Run a Chat Completion against OpenAI using asyncio """
+
+
+from typing import Any
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Callable
+from typing import Optional
+from typing import AsyncIterator
+
+from pprint import pformat
+from contextlib import asynccontextmanager
+
+from baseblock import Enforcer
+from baseblock import Stopwatch
+from baseblock import BaseObject
+
+from openai.error import RateLimitError
+from openai.error import PermissionError
+from openai.error import AuthenticationError
+from openai.error import ServiceUnavailableError
+
+from openai_helper.dmo import RetryPolicy
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import OpenAIConnector
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import Conversation
+from openai_helper.dmo import ChatRequestBuilder
+from openai_helper.dmo import ChatStreamAssembler
+
+
+class RunChatCompletionAsync(BaseObject):
+    """ Run a Chat Completion against OpenAI using asyncio """
+
+    def __init__(self,
+                 conn: object,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 max_prompt_tokens: Optional[int] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   coroutine counterpart to 'run-chat-completion'
+                the event loop is never blocked for the network round trip
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   retry transient errors with exponential backoff and jitter
+                and report the number of attempts on each result
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional client-side rate limiter in front of every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional adaptive (AIMD) concurrency limiter around every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional in-memory response cache in front of the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'stream' yields content deltas as they arrive
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   accept a 'conversation' as messages; its running token total replaces a recount
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional 'max_tokens', trimmed to the context window of the model
+                a prompt too long for the model is rejected before the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional prompt token budget; the oldest history is left out to fit it
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   move the pre-flight steps into 'chat-request-builder', shared with the blocking runner
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'stream' charges the rate limiter on every attempt, not once per call
+
+        Args:
+            conn (object): a connected instance of OpenAI
+            retry_policy (RetryPolicy, optional): the retry policy for transient errors. Defaults to None.
+                a default policy (configurable via the environment) is used if none is given
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache; repeated calls are answered without a network call. Defaults to None.
+                either 'response-cache' (in-memory) or 'response-cache-sqlite' (host-wide)
+            max_prompt_tokens (int, optional): the prompt token budget of every call. Defaults to None.
+                the system prompt and the newest messages that fit are sent (see 'chat-message-formatter')
+                if None, this is read from 'OPENAI_MAX_PROMPT_TOKENS'; if that is unset, the full history is sent
+        """
+        BaseObject.__init__(self, __name__)
+        self._retry = retry_policy if retry_policy else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
+        self._completion = conn.ChatCompletion.acreate
+        self._request = ChatRequestBuilder(max_prompt_tokens=max_prompt_tokens)
+        self._token_counter = InputTokenCounter()
+
+        # only the OpenAI module itself routes through the pooled aiohttp session
+        self._connector = None
+        if hasattr(conn, 'aiosession'):
+            self._connector = OpenAIConnector()
+
+    async def _acreate(self,
+                       **kwargs) -> Any:
+        if not self._connector:
+            return await self._completion(**kwargs)
+
+        async with self._connector.aio_scope():
+            return await self._completion(**kwargs)
+
+    async def _process(self,
+                       d_request: dict) -> Optional[dict]:
+        input_messages = d_request['messages']
+        model = d_request['model']
+
+        cache_key = None
+        if self._cache:
+            cache_key = self._request.cache_key(self._cache, d_request)
+            d_output = self._cache.get(cache_key)
+            if d_output:
+                return {
+                    'input': input_messages,
+                    'output': d_output,
+                    'attempts': 0
+                }
+
+        tokens = self._request.tokens(d_request) if self._rate_limiter else 0
+
+        async def create(**kwargs) -> Any:
+            if self._rate_limiter:
+                await self._rate_limiter.aprocess(model=model, tokens=tokens)
+            if not self._concurrency_limiter:
+                return await self._acreate(**kwargs)
+            async with self._concurrency_limiter.aslot():
+                return await self._acreate(**kwargs)
+
+        async def invoke_call() -> Tuple[Optional[Any], int]:
+            try:
+
+                return await self._retry.aprocess(
+                    create,
+                    **self._request.kwargs(d_request)
+                )
+
+                # DESIGN NOTE
+                # Do not catch Error, Exception, or general error classes
+                # force this on the consumer ...
+
+            except RateLimitError as e:
+                self.logger.exception('Rate Limit Error')
+                return None, getattr(e, 'attempts', 1)
+
+            except PermissionError as e:
+                self.logger.exception('Permission Error')
+                return None, getattr(e, 'attempts', 1)
+
+            except AuthenticationError as e:
+                self.logger.exception('Authentication Error')
+                return None, getattr(e, 'attempts', 1)
+
+            except ServiceUnavailableError as e:
+                self.logger.exception('Service Unavailable Error')
+                return None, getattr(e, 'attempts', 1)
+
+        response, attempts = await invoke_call()
+
+        if not response:
+            return {
+                'input': input_messages,
+                'output': None,
+                'attempts': attempts
+            }
+
+        d_output = dict(response)
+        if cache_key:
+            self._cache.put(cache_key, d_output)
+
+        return {
+            'input': input_messages,
+            'output': d_output,
+            'attempts': attempts
+        }
+
+    async def process(self,
+                      input_prompt: str,
+                      messages: Union[List[str], Conversation],
+                      model: Optional[str] = 'gpt-3.5-turbo',
+                      max_tokens: Optional[int] = None) -> dict:
+        """ Run an OpenAI event
+
+        Args:
+            input_prompt (str): a defined input prompt
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
+                a 'conversation' supplies its own system prompt ('input_prompt' is ignored)
+            model (str): the model to use
+            max_tokens (int, optional): The Maximum Number of tokens to generate. Defaults to None.
+                if None, the model may use whatever the context window leaves after the prompt
+                trimmed to what the context window of the model leaves after the prompt (see 'model-registry')
+
+        Raises:
+            InvalidRequestError: the prompt alone exceeds the context window of the model
+
+        Returns:
+            dict: an output dictionary with three keys:
+                input: the input dictionary with validated parameters and default values where appropriate
+                output: the output event from OpenAI
+                    the same error handling as 'run-chat-completion' applies
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
+        """
+
+        sw = Stopwatch()
+
+        d_request = self._request.process(
+            input_prompt=input_prompt,
+            messages=messages,
+            model=model,
+            max_tokens=max_tokens)
+
+        d_result = await self._process(d_request)
+
+        if not d_result:
+            self.logger.error('\n'.join([
+                'OpenAI Event Execution Failed',
+                f'\tTotal Time: {str(sw)}',
+                f'\tInput Prompt: {input_prompt}',
+                f'\tMessages:\n{pformat(messages)}']))
+
+        if self.isEnabledForDebug:
+            Enforcer.is_dict(d_result)
+            self.logger.debug('\n'.join([
+                'OpenAI Event Execution Completed',
+                f'\tTotal Time: {str(sw)}',
+                f'\tInput Prompt: {input_prompt}',
+                f'\tMessages:\n{pformat(messages)}',
+                f'\tOutput Result:\n{pformat(d_result)}']))
+
+        return d_result
+
+    @asynccontextmanager
+    async def _aslot(self):
+        if not self._concurrency_limiter:
+            yield
+            return
+        async with self._concurrency_limiter.aslot():
+            yield
+
+    async def stream(self,
+                     input_prompt: str,
+                     messages: Union[List[str], Conversation],
+                     model: Optional[str] = 'gpt-3.5-turbo',
+                     on_complete: Optional[Callable] = None,
+                     max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """ Run an OpenAI event and Stream the Response
+
+        Args:
+            input_prompt (str): a defined input prompt
+            messages (List[str] or Conversation): The messages to execute the chat completion upon
+                a 'conversation' supplies its own system prompt ('input_prompt' is ignored)
+            model (str): the model to use
+            on_complete (Callable, optional): called with the assembled result once the stream ends. Defaults to None.
+                an async generator cannot return a value, so this is the only way to receive it
+            max_tokens (int, optional): The Maximum Number of tokens to generate. Defaults to None.
+                if None, the model may use whatever the context window leaves after the prompt
+                trimmed to what the context window of the model leaves after the prompt (see 'model-registry')
+
+        Yields:
+            str: each content delta as it arrives
+        """
+
+        sw = Stopwatch()
+
+        d_request = self._request.process(
+            input_prompt=input_prompt,
+            messages=messages,
+            model=model,
+            max_tokens=max_tokens)
+        input_messages = d_request['messages']
+
+        tokens = self._request.tokens(d_request) if self._rate_limiter else 0
+
+        async def create(**kwargs) -> Any:
+            # every attempt is charged, as in '_process'; a retried request spends the quota again
+            if self._rate_limiter:
+                await self._rate_limiter.aprocess(model=model, tokens=tokens)
+            return await self._acreate(**kwargs)
+
+        assembler = ChatStreamAssembler(
+            model=model,
+            token_counter=self._token_counter)
+
+        attempts = 1
+        d_result = None
+
+        # the slot is held for the whole stream; the connection stays busy until the last chunk
+        try:
+
+            async with self._aslot():
+                response, attempts = await self._retry.aprocess(
+                    create,
+                    stream=True,
+                    **self._request.kwargs(d_request))
+
+                async for chunk in response:
+                    delta = assembler.process(chunk)
+                    if delta:
+                        yield delta
+
+            d_result = {
+                'input': input_messages,
+                'output': assembler.output(input_messages),
+                'attempts': attempts
+            }
+
+        except RateLimitError as e:
+            self.logger.exception('Rate Limit Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        except PermissionError as e:
+            self.logger.exception('Permission Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        except AuthenticationError as e:
+            self.logger.exception('Authentication Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        except ServiceUnavailableError as e:
+            self.logger.exception('Service Unavailable Error')
+            attempts = getattr(e, 'attempts', 1)
+
+        if not d_result:
+            d_result = {
+                'input': input_messages,
+                'output': None,
+                'attempts': attempts
+            }
+
+        if self.isEnabledForDebug:
+            self.logger.debug('\n'.join([
+                'OpenAI Stream Completed',
+                f'\tTotal Time: {str(sw)}',
+                f'\tInput Prompt: {input_prompt}',
+                f'\tOutput Result:\n{pformat(d_result)}']))
+
+        if on_complete:
+            on_complete(d_result)
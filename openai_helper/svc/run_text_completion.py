@@ -4,6 +4,7 @@
 
 
 from typing import Any
+from typing import Tuple
 from typing import Optional
 
 from pprint import pformat
@@ -18,8 +19,11 @@ from openai.error import PermissionError
 from openai.error import AuthenticationError
 from openai.error import ServiceUnavailableError
 
-from openai_helper.dmo import InputTokenCounter
-from openai_helper.dmo import CompletionEventExtractor
+from openai_helper.dmo import RetryPolicy
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import TextRequestBuilder
 
 
 class RunTextCompletion(BaseObject):
@@ -27,7 +31,11 @@ class RunTextCompletion(BaseObject):
 
     def __init__(self,
                  conn: object,
-                 timeout: int = 5):
+                 timeout: int = 5,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
         """ Change Log
 
         Created:
@@ -53,67 +61,128 @@ class RunTextCompletion(BaseObject):
             craigtrim@gmail.com
             *   fix max-tokens defect
                 https://github.com/craigtrim/openai-helper/issues/10
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   retry transient errors with exponential backoff and jitter
+                and report the number of attempts on each result
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional client-side rate limiter in front of every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional adaptive (AIMD) concurrency limiter around every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional in-memory response cache in front of the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   size 'max_tokens' from a token estimate; count exactly only near the limit
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'max_tokens' is the completion alone, trimmed to the context window of the engine
+                a prompt too long for the engine is rejected before the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   move the pre-flight steps into 'text-request-builder', shared with the coroutine runner
 
         Args:
             conn (object): a connected instance of OpenAI
             timeout (int, optional): the timeout for the API call. Defaults to 15.
+            retry_policy (RetryPolicy, optional): the retry policy for transient errors. Defaults to None.
+                a default policy (configurable via the environment) is used if none is given
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache; repeated calls are answered without a network call. Defaults to None.
+                either 'response-cache' (in-memory) or 'response-cache-sqlite' (host-wide)
         """
         BaseObject.__init__(self, __name__)
+        self._retry = retry_policy if retry_policy else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
         self._completion = conn.Completion.create
-        self._count_tokens = InputTokenCounter().process
-        self._extract_event = CompletionEventExtractor().process
+        self._request = TextRequestBuilder()
         self._timeout = EnvIO.int_or_default(
             'OPENAI_CREATE_TIMEOUT', timeout)  # GRAFFL-380
 
     def _process(self,
-                 d_event: dict) -> Optional[dict]:
-
-        def invoke_call() -> Optional[Any]:
+                 d_request: dict) -> Optional[dict]:
+
+        d_event = d_request['event']
+
+        cache_key = None
+        if self._cache:
+            cache_key = self._request.cache_key(self._cache, d_request)
+            d_output = self._cache.get(cache_key)
+            if d_output:
+                return {
+                    'input': d_event,
+                    'output': d_output,
+                    'attempts': 0
+                }
+
+        tokens = self._request.tokens(d_request)
+
+        def create(**kwargs) -> Any:
+            if self._rate_limiter:
+                self._rate_limiter.process(model=d_event['engine'], tokens=tokens)
+            if not self._concurrency_limiter:
+                return self._completion(**kwargs)
+            with self._concurrency_limiter.slot():
+                return self._completion(**kwargs)
+
+        def invoke_call() -> Tuple[Optional[Any], int]:
             try:
 
-                return self._completion(
-                    engine=d_event['engine'],
-                    prompt=d_event['input_prompt'],
-                    temperature=d_event['temperature'],
-                    max_tokens=d_event['max_tokens'],
-                    top_p=d_event['top_p'],
-                    best_of=d_event['best_of'],
-                    frequency_penalty=d_event['frequency_penalty'],
-                    presence_penalty=d_event['presence_penalty'],
-                    timeout=self._timeout  # GRAFFL-380
-                )
+                return self._retry.process(
+                    create,
+                    timeout=self._timeout,  # GRAFFL-380
+                    **self._request.kwargs(d_request))
 
             # DESIGN NOTE
             # Do not catch Error, Exception, or general error classes
             # force this on the consumer ...
 
             except RateLimitError as e:
-                self.logger.exception('Rate Limit Error', e)
-                return None
+                self.logger.exception('Rate Limit Error')
+                return None, getattr(e, 'attempts', 1)
 
             except PermissionError as e:
-                self.logger.exception('Rate Limit Error', e)
-                return None
+                self.logger.exception('Permission Error')
+                return None, getattr(e, 'attempts', 1)
 
             except AuthenticationError as e:
-                self.logger.exception('Rate Limit Error', e)
-                return None
+                self.logger.exception('Authentication Error')
+                return None, getattr(e, 'attempts', 1)
 
             except ServiceUnavailableError as e:
-                self.logger.exception('Rate Limit Error', e)
-                return None
+                self.logger.exception('Service Unavailable Error')
+                return None, getattr(e, 'attempts', 1)
 
-        response = invoke_call()
+        response, attempts = invoke_call()
 
         if not response:
             return {
                 'input': d_event,
-                'output': None
+                'output': None,
+                'attempts': attempts
             }
 
+        d_output = dict(response)
+        if cache_key:
+            self._cache.put(cache_key, d_output)
+
         return {
             'input': d_event,
-            'output': dict(response)
+            'output': d_output,
+            'attempts': attempts
         }
 
     def process(self,
@@ -144,7 +213,8 @@ class RunTextCompletion(BaseObject):
                 Higher values are more engaging but also less predictable
                 Use High Values cautiously
             max_tokens (int, optional): The Maximum Number of tokens to generate. Defaults to None.
-                Requests can use up to 4,000 tokens (this takes the length of the input prompt into account)
+                if None, three times the prompt tokens
+                trimmed to what the context window of the engine leaves after the prompt (see 'model-registry')
                 The higher this value, the more each request will cost.
             top_p (float, optional): Controls Diversity via Nucleus Sampling. Defaults to None.
                 no idea what this means
@@ -152,8 +222,11 @@ class RunTextCompletion(BaseObject):
                 Scale: 0.0 - 2.0.
             presence_penalty (int, optional): Seems similar to frequency penalty. Defaults to None.
 
+        Raises:
+            InvalidRequestError: the prompt alone exceeds the context window of the engine
+
         Returns:
-            dict: an output dictionary with two keys:
+            dict: an output dictionary with three keys:
                 input: the input dictionary with validated parameters and default values where appropriate
                 output: the output event from OpenAI
                     Unless RateLimitError, PermissionError, AuthenticationError, ServiceUnavailableError
@@ -161,43 +234,12 @@ class RunTextCompletion(BaseObject):
                     This service will not catch Exception or Error classes generally
                     -   the door is still left open for these and other error types to be thrown
                         and the consumer must plan for this eventuality
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
         """
 
         sw = Stopwatch()
 
-        prompt_tokens = self._count_tokens(
-            messages=[input_prompt],
-            model=engine)
-
-        if not max_tokens:
-            max_tokens = prompt_tokens * 3
-        else:
-            max_tokens += prompt_tokens
-
-        if max_tokens > 4096:
-            max_tokens = 4096
-
-        # if not max_tokens:
-        #     max_tokens = 4096
-
-        # if not max_tokens or not type(max_tokens) == int:
-        #     max_tokens = len(input_prompt) * 2
-
-        # if max_tokens and max_tokens > 4096:
-        #     max_tokens = EnvIO.int_or_default('OPENAI_MAXTOKENS_LIMIT', 4096)
-
-        # # guard against errors like this:
-        # #       This model's maximum context length is 4097 tokens,
-        # #       however you requested 4143 tokens (2607 in your prompt; 1536 for the completion).
-        # #       Please reduce your prompt; or completion length.
-        # if max_tokens and len(input_prompt) + max_tokens > 4096:
-        #     max_tokens = EnvIO.int_or_default('OPENAI_MAXTOKENS_LIMIT', 4096)
-        #     self.logger.debug('\n'.join([
-        #         'Model Token Limit',
-        #         f'\tMax Tokens: {max_tokens}',
-        #         f'\tLength of Input Prompt: {len(input_prompt)}']))
-
-        d_params = self._extract_event(
+        d_request = self._request.process(
             input_prompt=input_prompt,
             engine=engine,
             best_of=best_of,
@@ -207,7 +249,8 @@ class RunTextCompletion(BaseObject):
             frequency_penalty=frequency_penalty,
             presence_penalty=presence_penalty)
 
-        d_result = self._process(d_params)
+        d_params = d_request['event']
+        d_result = self._process(d_request)
 
         if not d_result:
             self.logger.error('\n'.join([
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+""" Run a TextCompletion against OpenAI using asyncio """
+
+
+from typing import Any
+from typing import Tuple
+from typing import Optional
+
+from pprint import pformat
+
+from baseblock import EnvIO
+from baseblock import Enforcer
+from baseblock import Stopwatch
+from baseblock import BaseObject
+
+from openai.error import RateLimitError
+from openai.error import PermissionError
+from openai.error import AuthenticationError
+from openai.error import ServiceUnavailableError
+
+from openai_helper.dmo import RetryPolicy
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import OpenAIConnector
+from openai_helper.dmo import TextRequestBuilder
+
+
+class RunTextCompletionAsync(BaseObject):
+    """ Run a TextCompletion against OpenAI using asyncio """
+
+    def __init__(self,
+                 conn: object,
+                 timeout: int = 5,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
+        """ Change Log
+
+        Created:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   coroutine counterpart to 'run-text-completion'
+                the event loop is never blocked for the network round trip
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   retry transient errors with exponential backoff and jitter
+                and report the number of attempts on each result
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional client-side rate limiter in front of every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional adaptive (AIMD) concurrency limiter around every attempt
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   optional in-memory response cache in front of the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   size 'max_tokens' from a token estimate; count exactly only near the limit
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   'max_tokens' is the completion alone, trimmed to the context window of the engine
+                a prompt too long for the engine is rejected before the network call
+        Updated:
+            18-Oct-2026
+            craigtrim@gmail.com
+            *   move the pre-flight steps into 'text-request-builder', shared with the blocking runner
+
+        Args:
+            conn (object): a connected instance of OpenAI
+            timeout (int, optional): the timeout for the API call. Defaults to 5.
+            retry_policy (RetryPolicy, optional): the retry policy for transient errors. Defaults to None.
+                a default policy (configurable via the environment) is used if none is given
+            rate_limiter (RateLimiter, optional): a client-side rate limiter. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): an adaptive concurrency limiter. Defaults to None.
+            cache (ResponseCache, optional): a response cache; repeated calls are answered without a network call. Defaults to None.
+                either 'response-cache' (in-memory) or 'response-cache-sqlite' (host-wide)
+        """
+        BaseObject.__init__(self, __name__)
+        self._retry = retry_policy if retry_policy else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._cache = cache
+        self._completion = conn.Completion.acreate
+        self._request = TextRequestBuilder()
+        self._timeout = EnvIO.int_or_default(
+            'OPENAI_CREATE_TIMEOUT', timeout)  # GRAFFL-380
+
+        # only the OpenAI module itself routes through the pooled aiohttp session
+        self._connector = None
+        if hasattr(conn, 'aiosession'):
+            self._connector = OpenAIConnector()
+
+    async def _acreate(self,
+                       **kwargs) -> Any:
+        if not self._connector:
+            return await self._completion(**kwargs)
+
+        async with self._connector.aio_scope():
+            return await self._completion(**kwargs)
+
+    async def _process(self,
+                       d_request: dict) -> Optional[dict]:
+
+        d_event = d_request['event']
+
+        cache_key = None
+        if self._cache:
+            cache_key = self._request.cache_key(self._cache, d_request)
+            d_output = self._cache.get(cache_key)
+            if d_output:
+                return {
+                    'input': d_event,
+                    'output': d_output,
+                    'attempts': 0
+                }
+
+        tokens = self._request.tokens(d_request)
+
+        async def create(**kwargs) -> Any:
+            if self._rate_limiter:
+                await self._rate_limiter.aprocess(model=d_event['engine'], tokens=tokens)
+            if not self._concurrency_limiter:
+                return await self._acreate(**kwargs)
+            async with self._concurrency_limiter.aslot():
+                return await self._acreate(**kwargs)
+
+        async def invoke_call() -> Tuple[Optional[Any], int]:
+            try:
+
+                return await self._retry.aprocess(
+                    create,
+                    timeout=self._timeout,  # GRAFFL-380
+                    **self._request.kwargs(d_request))
+
+            # DESIGN NOTE
+            # Do not catch Error, Exception, or general error classes
+            # force this on the consumer ...
+
+            except RateLimitError as e:
+                self.logger.exception('Rate Limit Error')
+                return None, getattr(e, 'attempts', 1)
+
+            except PermissionError as e:
+                self.logger.exception('Permission Error')
+                return None, getattr(e, 'attempts', 1)
+
+            except AuthenticationError as e:
+                self.logger.exception('Authentication Error')
+                return None, getattr(e, 'attempts', 1)
+
+            except ServiceUnavailableError as e:
+                self.logger.exception('Service Unavailable Error')
+                return None, getattr(e, 'attempts', 1)
+
+        response, attempts = await invoke_call()
+
+        if not response:
+            return {
+                'input': d_event,
+                'output': None,
+                'attempts': attempts
+            }
+
+        d_output = dict(response)
+        if cache_key:
+            self._cache.put(cache_key, d_output)
+
+        return {
+            'input': d_event,
+            'output': d_output,
+            'attempts': attempts
+        }
+
+    async def process(self,
+                      input_prompt: str,
+                      engine: str = None,
+                      best_of: int = None,
+                      temperature: float = None,
+                      max_tokens: int = None,
+                      top_p: float = None,
+                      frequency_penalty: int = None,
+                      presence_penalty: int = None) -> dict:
+        """ Run an OpenAI event
+
+        The parameters are identical to those of 'run-text-completion'
+
+        Raises:
+            InvalidRequestError: the prompt alone exceeds the context window of the engine
+
+        Returns:
+            dict: an output dictionary with three keys:
+                input: the input dictionary with validated parameters and default values where appropriate
+                output: the output event from OpenAI
+                attempts: the number of attempts made (retries are attempts - 1; 0 for a cached response)
+        """
+
+        sw = Stopwatch()
+
+        d_request = self._request.process(
+            input_prompt=input_prompt,
+            engine=engine,
+            best_of=best_of,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            frequency_penalty=frequency_penalty,
+            presence_penalty=presence_penalty)
+
+        d_params = d_request['event']
+        d_result = await self._process(d_request)
+
+        if not d_result:
+            self.logger.error('\n'.join([
+                'OpenAI Event Execution Failed',
+                f'\tTotal Time: {str(sw)}',
+                f'\tInput Params:\n{pformat(d_params)}']))
+
+        if self.isEnabledForDebug:
+            Enforcer.is_dict(d_result)
+            self.logger.debug('\n'.join([
+                'OpenAI Event Execution Completed',
+                f'\tTotal Time: {str(sw)}',
+                f'\tInput Params:\n{pformat(d_params)}',
+                f'\tOutput Result:\n{pformat(d_result)}']))
+
+        return d_result
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import asyncio
+
+from openai.error import RateLimitError
+
+from openai_helper.dmo import AdaptiveConcurrencyLimiter
+
+
+def test_additive_increase():
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=8)
+    assert limiter.limit == 2
+
+    # one call at a time never fills the limit, so it does not grow
+    for _ in range(20):
+        with limiter.slot():
+            pass
+
+    assert limiter.limit == 2
+    assert limiter.metrics()['increases'] == 0
+
+    # calls that fill every slot raise it
+    async def call() -> None:
+        async with limiter.aslot():
+            await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        await asyncio.gather(*[call() for _ in range(20)])
+
+    asyncio.run(run())
+
+    assert limiter.limit > 2
+    assert limiter.metrics()['increases'] > 0
+    assert limiter.metrics()['in_flight'] == 0
+
+
+def test_multiplicative_decrease():
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+
+    try:
+        with limiter.slot():
+            raise RateLimitError('slow down')
+    except RateLimitError:
+        pass
+
+    assert limiter.limit == 4
+
+    d_metrics = limiter.metrics()
+    assert d_metrics['decreases'] == 1
+    assert d_metrics['decisions'][-1]['reason'] == 'RateLimitError'
+
+
+def test_latency_target():
+
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=8, max_limit=8, latency_target=1e-9, window=20)
+
+    for _ in range(20):
+        with limiter.slot():
+            pass
+
+    assert limiter.limit == 4
+
+
+def test_async_slots():
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    peak = []
+
+    async def call() -> None:
+        async with limiter.aslot():
+            peak.append(limiter.metrics()['in_flight'])
+            await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        await asyncio.gather(*[call() for _ in range(10)])
+
+    asyncio.run(run())
+
+    assert max(peak) == 2
+    assert limiter.metrics()['in_flight'] == 0
+
+
+def main():
+    test_additive_increase()
+    test_multiplicative_decrease()
+    test_latency_target()
+    test_async_slots()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import time
+from random import random
+
+from openai_helper.dmo import BatchExecutor
+
+
+def echo(value: int) -> int:
+    time.sleep(random() / 100)
+    if value == 3:
+        raise ValueError(value)
+    return value
+
+
+def test_component():
+
+    dmo = BatchExecutor(max_concurrency=4)
+    assert dmo
+
+    progress = []
+
+    results = dmo.process(
+        function=echo,
+        items=[{'value': i} for i in range(10)],
+        progress=lambda completed, total: progress.append((completed, total)))
+
+    assert [x['input']['value'] for x in results] == list(range(10))
+    assert [x['output'] for x in results] == [0, 1, 2, None, 4, 5, 6, 7, 8, 9]
+
+    assert type(results[3]['error']) == ValueError
+    assert len([x for x in results if x['error']]) == 1
+
+    assert progress[-1] == (10, 10)
+
+
+def main():
+    test_component()
+
+
+if __name__ == '__main__':
+    main()
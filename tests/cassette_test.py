@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import io
+import os
+import json
+import tempfile
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from openai_helper.dmo import Cassette
+from openai_helper.dmo import CassetteAdapter
+
+
+class FakeTransport(HTTPAdapter):
+    """ Stands in for the network while recording """
+
+    def send(self, request, **kwargs) -> requests.Response:
+        d_request = json.loads(request.body)
+        messages = d_request['messages']
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.request = request
+
+        if d_request.get('stream'):
+            # like the real transport: the body is only read from 'raw' on demand
+            response.headers['Content-Type'] = 'text/event-stream'
+            response.raw = io.BytesIO(''.join([
+                *[f'data: {json.dumps({"choices": [{"index": 0, "delta": {"content": x}}]})}\n\n'
+                  for x in messages[-1]['content'].upper()],
+                'data: [DONE]\n\n']).encode('utf-8'))
+            return response
+
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps({
+            'object': 'chat.completion',
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': messages[-1]['content'].upper()},
+                'finish_reason': 'stop'}],
+        }).encode('utf-8')
+        return response
+
+
+def session(adapter: HTTPAdapter) -> requests.Session:
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+
+def chat(session: requests.Session,
+         content: str) -> str:
+    response = session.post(
+        'https://api.openai.com/v1/chat/completions',
+        json={'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': content}]})
+    return response.json()['choices'][0]['message']['content']
+
+
+def chat_stream(session: requests.Session,
+                content: str) -> str:
+    response = session.post(
+        'https://api.openai.com/v1/chat/completions',
+        json={'model': 'gpt-3.5-turbo', 'stream': True, 'messages': [{'role': 'user', 'content': content}]},
+        stream=True)
+
+    deltas = []
+    for line in response.iter_lines():
+        if line and line != b'data: [DONE]':
+            deltas.append(json.loads(line[len(b'data: '):])['choices'][0]['delta']['content'])
+    return ''.join(deltas)
+
+
+def test_record_and_replay():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, 'openai.cassette')
+
+        recorder = session(CassetteAdapter(
+            Cassette(file_path), mode='record', transport=FakeTransport()))
+        assert chat(recorder, 'hello') == 'HELLO'
+        assert chat(recorder, 'world') == 'WORLD'
+
+        # a fresh cassette indexes the file without decompressing it
+        cassette = Cassette(file_path)
+        assert len(cassette) == 2
+
+        player = session(CassetteAdapter(
+            cassette, mode='replay', latency_scale=0.0))
+        assert chat(player, 'world') == 'WORLD'
+        assert chat(player, 'hello') == 'HELLO'
+
+        try:
+            chat(player, 'never recorded')
+            assert False
+        except requests.ConnectionError:
+            pass
+
+
+def test_record_and_replay_stream():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, 'openai.cassette')
+
+        recorder = session(CassetteAdapter(
+            Cassette(file_path), mode='record', transport=FakeTransport()))
+        assert chat_stream(recorder, 'hello') == 'HELLO'
+
+        player = session(CassetteAdapter(
+            Cassette(file_path), mode='replay', latency_scale=0.0))
+        assert chat_stream(player, 'hello') == 'HELLO'
+
+        response = player.post(
+            'https://api.openai.com/v1/chat/completions',
+            json={'model': 'gpt-3.5-turbo', 'stream': True, 'messages': [{'role': 'user', 'content': 'hello'}]},
+            stream=True)
+        assert response.raw.read().startswith(b'data: ')
+
+
+def test_key():
+
+    key = Cassette.key('POST', 'https://api.openai.com/v1/chat/completions', b'{"a": 1, "b": 2}')
+    assert key == Cassette.key('post', 'http://localhost:8080/v1/chat/completions', b'{"b":2,"a":1}')
+    assert key != Cassette.key('POST', 'https://api.openai.com/v1/completions', b'{"a": 1, "b": 2}')
+
+
+def main():
+    test_record_and_replay()
+    test_record_and_replay_stream()
+    test_key()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 # -*- coding: UTF-8 -*-
 
 
+from openai_helper.dmo import InputTokenCounter
 from openai_helper.dmo import ChatMessageFormatter
 
 
@@ -38,8 +39,34 @@ def test_service():
     ]
 
 
+def test_fit():
+
+    input_prompt = 'You are a helpful assistant.'
+    messages = [f'Message number {i}.' for i in range(9)]
+    counter = InputTokenCounter()
+
+    for max_tokens in range(0, 150, 5):
+        formatted, prompt_tokens = ChatMessageFormatter().fit(
+            input_prompt=input_prompt,
+            messages=messages,
+            max_tokens=max_tokens)
+
+        kept = [x['content'] for x in formatted[1:]]
+        assert formatted[0]['content'] == input_prompt
+        assert formatted[1]['role'] == 'user'
+        assert kept == messages[len(messages) - len(kept):]
+        assert len(kept) % 2 == 1
+        assert prompt_tokens == counter.process([input_prompt] + kept)
+        assert prompt_tokens <= max_tokens or len(kept) == 1
+
+        # the next (older) pair would not have fit
+        if len(kept) < len(messages):
+            assert counter.process([input_prompt] + messages[-len(kept) - 2:]) > max_tokens
+
+
 def main():
     test_service()
+    test_fit()
 
 
 if __name__ == '__main__':
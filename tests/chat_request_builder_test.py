@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import pytest
+
+from openai.error import InvalidRequestError
+
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import Conversation
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import ChatRequestBuilder
+
+
+def test_request():
+
+    builder = ChatRequestBuilder()
+
+    d_request = builder.process(
+        input_prompt='You are a helpful assistant.',
+        messages=['Who won the world series in 2020?'],
+        model='gpt-4')
+
+    assert d_request['messages'][0] == {'role': 'system', 'content': 'You are a helpful assistant.'}
+    assert d_request['max_tokens'] is None
+    assert d_request['prompt_tokens'] is None  # estimated only; far from the context window
+
+    assert builder.kwargs(d_request) == {'model': 'gpt-4', 'messages': d_request['messages']}
+    assert builder.cache_key(ResponseCache(), d_request) == ResponseCache.key(
+        model='gpt-4', messages=d_request['messages'])
+
+    prompt_tokens = InputTokenCounter().process(
+        [x['content'] for x in d_request['messages']], model='gpt-4')
+    assert builder.tokens(d_request) == prompt_tokens + 256
+    assert d_request['prompt_tokens'] == prompt_tokens
+
+
+def test_budget():
+
+    builder = ChatRequestBuilder()
+
+    d_request = builder.process(
+        input_prompt='You are a helpful assistant.',
+        messages=['Hello?'],
+        model='gpt-4-turbo',
+        max_tokens=10000)
+    assert builder.kwargs(d_request)['max_tokens'] == 4096
+
+    with pytest.raises(InvalidRequestError):
+        builder.process(
+            input_prompt='You are a helpful assistant.',
+            messages=['Hello? ' * 5000],
+            model='gpt-4')
+
+
+def test_budget_code():
+    """ code is far denser in tokens than prose; a token estimate would let these through untrimmed """
+
+    builder = ChatRequestBuilder()
+    code = "def f(x):\n    return {'a': [x[i] ** 2 for i in range(len(x))]}\n"
+
+    d_request = builder.process(
+        input_prompt='You are a helpful assistant.',
+        messages=[code * 150],
+        model='gpt-3.5-turbo',
+        max_tokens=1000)
+
+    prompt_tokens = InputTokenCounter().process(
+        [x['content'] for x in d_request['messages']], model='gpt-3.5-turbo')
+    assert d_request['prompt_tokens'] == prompt_tokens
+    assert prompt_tokens + d_request['max_tokens'] <= 4096
+
+    with pytest.raises(InvalidRequestError):
+        builder.process(
+            input_prompt='You are a helpful assistant.',
+            messages=[code * 180],
+            model='gpt-3.5-turbo')
+
+
+def test_conversation():
+
+    conversation = Conversation('You are a helpful assistant.', model='gpt-4')
+    conversation.append('Who won the world series in 2020?')
+
+    d_request = ChatRequestBuilder().process(
+        input_prompt='ignored',
+        messages=conversation,
+        model='gpt-4')
+
+    assert d_request['messages'] == conversation.formatted()
+    assert d_request['prompt_tokens'] == conversation.total_tokens
+
+
+def main():
+    test_request()
+    test_budget()
+    test_budget_code()
+    test_conversation()
+
+
+if __name__ == '__main__':
+    main()
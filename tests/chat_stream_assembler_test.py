@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+from openai_helper.dmo import ChatStreamAssembler
+
+
+class TokenCounter:
+
+    @staticmethod
+    def process(messages: list, model: str) -> int:
+        return len(' '.join(messages).split())
+
+    @staticmethod
+    def encoded_length(input_text: str, model: str) -> int:
+        return len(input_text.split())
+
+
+def chunk(delta: dict, finish_reason: str = None) -> dict:
+    return {
+        'id': 'chatcmpl-1',
+        'object': 'chat.completion.chunk',
+        'created': 1680000000,
+        'model': 'gpt-3.5-turbo-0301',
+        'choices': [{
+            'index': 0,
+            'delta': delta,
+            'finish_reason': finish_reason
+        }]
+    }
+
+
+def test_assembler():
+
+    assembler = ChatStreamAssembler(
+        model='gpt-3.5-turbo',
+        token_counter=TokenCounter())
+
+    chunks = [
+        chunk({'role': 'assistant'}),
+        chunk({'content': 'It was played '}),
+        chunk({'content': 'in Arlington, Texas.'}),
+        chunk({}, finish_reason='stop'),
+    ]
+
+    deltas = [assembler.process(x) for x in chunks]
+    assert deltas == [None, 'It was played ', 'in Arlington, Texas.', None]
+
+    input_messages = [
+        {'role': 'system', 'content': 'You are a helpful assistant.'},
+        {'role': 'user', 'content': 'Where was it played?'},
+    ]
+
+    d_output = assembler.output(input_messages)
+    assert d_output['id'] == 'chatcmpl-1'
+    assert d_output['model'] == 'gpt-3.5-turbo-0301'
+
+    d_choice = d_output['choices'][0]
+    assert d_choice['message']['role'] == 'assistant'
+    assert d_choice['message']['content'] == 'It was played in Arlington, Texas.'
+    assert d_choice['finish_reason'] == 'stop'
+
+    assert d_output['usage'] == {
+        'prompt_tokens': 9,
+        'completion_tokens': 6,
+        'total_tokens': 15,
+    }
+
+
+def test_assembler_without_usage():
+
+    assembler = ChatStreamAssembler(model='gpt-3.5-turbo')
+    assembler.process(chunk({'content': 'Hello'}))
+
+    d_output = assembler.output([])
+    assert d_output['choices'][0]['message']['content'] == 'Hello'
+    assert 'usage' not in d_output
+
+
+def main():
+    test_assembler()
+    test_assembler_without_usage()
+
+
+if __name__ == '__main__':
+    main()
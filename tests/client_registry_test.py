@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import os
+import tempfile
+
+from openai_helper.bp import ClientRegistry
+
+
+def test_registry():
+
+    registry = ClientRegistry()
+    assert registry
+
+    extractor = registry.output_extractor_chat()
+    assert extractor is registry.output_extractor_chat()
+    assert extractor is not registry.output_extractor_text()
+
+    registry.reset()
+    assert extractor is not registry.output_extractor_chat()
+
+
+def test_fork_after_warmup():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        d_env = {
+            'OPENAI_RESPONSE_CACHE': 'true',
+            'OPENAI_RESPONSE_CACHE_DB': os.path.join(tmp, 'cache.db'),
+            'OPENAI_RATE_LIMITS': '{"default": {"rpm": 1000, "tpm": 100000}}',
+            'OPENAI_RATE_LIMITS_DB': os.path.join(tmp, 'limits.db'),
+        }
+        os.environ.update(d_env)
+
+        try:
+            registry = ClientRegistry()
+            registry.warmup()
+
+            cache = registry.response_cache()
+            limiter = registry.rate_limiter()
+            parent_conn = cache._conn()
+
+            pid = os.fork()
+            if pid == 0:
+                ok = False
+                try:
+                    # the worker opens its own connection instead of using the inherited one
+                    ok = cache._conn() is not parent_conn
+                    cache.put(cache.key(worker=True), {'text': 'from the worker'})
+                    ok = ok and limiter.process('gpt-3.5-turbo', 100) == 0.0
+                finally:
+                    os._exit(0 if ok else 1)
+
+            assert os.waitpid(pid, 0)[1] == 0
+
+            assert cache._conn() is parent_conn
+            cache._refresh()
+            assert cache.get(cache.key(worker=True)) == {'text': 'from the worker'}
+            assert limiter.process('gpt-3.5-turbo', 100) == 0.0
+            assert parent_conn.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+
+        finally:
+            for key in d_env:
+                del os.environ[key]
+
+
+def main():
+    test_registry()
+    test_fork_after_warmup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+from openai_helper.dmo import Conversation
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import ChatMessageFormatter
+from openai_helper.dmo import SyntheticConnection
+from openai_helper.svc.run_chat_completion import RunChatCompletion
+
+INPUT_PROMPT = 'You are a helpful assistant.'
+MESSAGES = [
+    'Who won the world series in 2020?',
+    'The Los Angeles Dodgers won the World Series in 2020.',
+    'Where was it played?'
+]
+
+
+def test_ledger():
+
+    conversation = Conversation(INPUT_PROMPT, keep_token_ids=True)
+    counter = InputTokenCounter()
+
+    for i, message in enumerate(MESSAGES):
+        conversation.append(message)
+        assert conversation.total_tokens == counter.process(
+            [INPUT_PROMPT] + MESSAGES[:i + 1])
+
+    assert len(conversation) == 3
+    assert conversation.tokens_per_message == 4
+    assert conversation.token_counts()[-1] == len(conversation.token_ids(3))
+    assert conversation.formatted() == ChatMessageFormatter().process(
+        input_prompt=INPUT_PROMPT, messages=MESSAGES)
+
+
+def test_extend():
+
+    conversation = Conversation(INPUT_PROMPT, messages=MESSAGES, model='gpt-4')
+
+    assert conversation.tokens_per_message == 3
+    assert conversation.total_tokens == InputTokenCounter().process(
+        [INPUT_PROMPT] + MESSAGES, model='gpt-4')
+
+    try:
+        conversation.token_ids(0)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_fit_and_trim():
+
+    messages = [f'Message number {i}.' for i in range(9)]
+    conversation = Conversation(INPUT_PROMPT, messages=messages, keep_token_ids=True)
+
+    for max_tokens in range(0, 150, 5):
+        assert conversation.fit(max_tokens) == ChatMessageFormatter().fit(
+            input_prompt=INPUT_PROMPT,
+            messages=messages,
+            max_tokens=max_tokens)
+
+    formatted, prompt_tokens = conversation.fit(60)
+    assert conversation.trim(60) == len(messages) + 1 - len(formatted)
+    assert conversation.formatted() == formatted
+    assert conversation.total_tokens == prompt_tokens
+    assert len(conversation.token_ids(1)) == conversation.token_counts()[1]
+
+    # roles still alternate after the trim
+    conversation.append('An answer.')
+    assert conversation.formatted()[-1]['role'] == 'assistant'
+    assert conversation.trim(10000) == 0
+
+
+def test_history_budget():
+
+    messages = [f'Message number {i}.' for i in range(9)]
+    runner = RunChatCompletion(SyntheticConnection(), max_prompt_tokens=60)
+
+    d_result = runner.process(input_prompt=INPUT_PROMPT, messages=messages)
+    assert d_result['input'] == ChatMessageFormatter().fit(
+        input_prompt=INPUT_PROMPT,
+        messages=messages,
+        max_tokens=60)[0]
+    assert len(d_result['input']) < len(messages) + 1
+
+    conversation = Conversation(INPUT_PROMPT, messages=messages)
+    d_result = runner.process(input_prompt=INPUT_PROMPT, messages=conversation)
+    assert d_result['input'] == conversation.fit(60)[0]
+    assert len(conversation) == len(messages)
+
+
+def main():
+    test_ledger()
+    test_extend()
+    test_fit_and_trim()
+    test_history_budget()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+from openai_helper.dmo import EtlRemovePromptIndicators
+
+
+def test_component():
+
+    remove = EtlRemovePromptIndicators().process
+    assert remove
+
+    def process(output_text: str) -> str:
+        return remove(input_text='Tell me something', output_text=output_text)
+
+    assert process('AI: The Dodgers won.') == ' The Dodgers won.'
+    assert process('Human: Hi there Assistant: Hello') == ' Hi there  Hello'
+    assert process("I'm an AI language model designed by OpenAI and I like it.") == "I'm a bot and I like it."
+    assert process("Well, I'm an AI language model.") == "Well, I'm an AI language model."
+    assert process("Marv's right") == "it's right"
+    assert process('user:') == ''
+
+    # whole matches only, and the surrounding text keeps its case
+    assert process('The OpenAI AI:s are Fine') == 'The OpenAI AI:s are Fine'
+    assert process('user: User: Fine') == '  Fine'
+
+
+def test_configured_indicators():
+
+    remove = EtlRemovePromptIndicators(indicators={'Bot:': '', 'AI:': 'Bot'}).process
+
+    assert remove(input_text='', output_text='Bot: Hello AI: there') == ' Hello Bot there'
+    assert EtlRemovePromptIndicators.lookahead() == len("I'm an AI language model designed by OpenAI")
+
+
+def main():
+    test_component()
+    test_configured_indicators()
+
+
+if __name__ == '__main__':
+    main()
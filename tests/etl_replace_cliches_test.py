@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import os
+import tempfile
+
+from openai_helper.dmo import PhraseMatcher
+from openai_helper.dmo import EtlReplaceCliches
+
+
+def test_component():
+
+    replace = EtlReplaceCliches(file_paths=[]).process
+    assert replace
+
+    def process(output_text: str) -> str:
+        return replace(input_text='Tell me something', output_text=output_text)
+
+    # both phrases are matched on their own (they were once joined by a missing comma)
+    assert process('Loqi is a chatbot that reluctantly answers questions in a mocking tone.') == '.'
+    assert process('Marv is a chatbot that responds to questions with sarcasm.') == 'Marv  sarcasm.'
+
+    # the longest cliche wins where cliches overlap
+    assert process('Loqi is a chatbot that reluctantly answers questions, reluctantly.') == 'Loqi , reluctantly.'
+
+    # a cliche never starts in the middle of a word
+    assert process('This is a chatbot that responds to questions with ease.') == 'This  ease.'
+    assert process('Thisis a chatbot that responds to questions with ease.') == \
+        'Thisis a chatbot that responds to questions with ease.'
+
+    assert EtlReplaceCliches.lookahead() == len(
+        "If you're looking for a chatbot that will give you sassy responses to your questions")
+
+
+def test_dictionary_files():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, 'cliches.txt')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(['# brand cliches', '', 'I hope this helps!', 'Happy to help.']))
+
+        replace = EtlReplaceCliches(file_paths=[file_path]).process
+        assert replace(input_text='', output_text='Done. I hope this helps!') == 'Done. '
+        assert PhraseMatcher.load([file_path]) == ['I hope this helps!', 'Happy to help.']
+
+
+def test_matcher():
+
+    matcher = PhraseMatcher(['a b', 'a b c', 'b c d', '(note)'])
+
+    assert len(matcher) == 4
+    assert matcher.lookahead == 6
+    assert matcher.findall('x a b c d (note)') == ['a b c', '(note)']
+    assert matcher.process('a b c d', replacement='_') == '_ d'
+    assert PhraseMatcher([]).process('anything') == 'anything'
+
+
+def main():
+    test_component()
+    test_dictionary_files()
+    test_matcher()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import time
+
+from openai_helper.dmo import ResponseCache
+from openai_helper.svc import ExtractPrimaryTopic
+
+
+class FakeExtractPrimaryTopic(ExtractPrimaryTopic):
+    calls = []
+    results = {}
+
+    @classmethod
+    def _extract_topic(cls, input_text: str) -> str:
+        cls.calls.append(input_text)
+        return cls.results.get(input_text)
+
+
+def test_cache():
+
+    FakeExtractPrimaryTopic.results = {'Who won the world series?': 'Baseball'}
+
+    extract = FakeExtractPrimaryTopic(
+        cache=ResponseCache(),
+        negative_ttl=0.05)
+
+    assert extract.process('Who won the world series?') == 'Baseball'
+    assert extract.process('Who won the world series?') == 'Baseball'
+    assert FakeExtractPrimaryTopic.calls == ['Who won the world series?']
+
+    # a failed extraction is only cached briefly
+    assert extract.process('Hello') is None
+    assert extract.process('Hello') is None
+    assert FakeExtractPrimaryTopic.calls.count('Hello') == 1
+
+    time.sleep(0.1)
+    FakeExtractPrimaryTopic.results['Hello'] = 'Greetings'
+    assert extract.process('Hello') == 'Greetings'
+
+    extract.invalidate('Who won the world series?')
+    assert extract.process('Who won the world series?') == 'Baseball'
+    assert FakeExtractPrimaryTopic.calls.count('Who won the world series?') == 2
+
+    d_stats = extract.stats()
+    assert d_stats['entries'] == 2
+    assert d_stats['hits'] == 2
+
+    extract.invalidate()
+    assert extract.stats()['entries'] == 0
+
+
+def main():
+    test_cache()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import sys
+import json
+import subprocess
+
+HEAVY_MODULES = ('openai', 'tiktoken', 'baseblock', 'aiohttp', 'requests')
+
+
+def loaded_after(statement: str) -> dict:
+    """ Run a statement in a fresh interpreter; report which heavy modules it imported """
+    script = '\n'.join([
+        'import sys, json',
+        statement,
+        f'print(json.dumps({{x: x in sys.modules for x in {HEAVY_MODULES!r}}}))'])
+
+    output = subprocess.check_output([sys.executable, '-c', script], text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_is_lazy():
+
+    d_loaded = loaded_after('import openai_helper')
+    assert not any(d_loaded.values()), d_loaded
+
+
+def test_first_use_loads_only_what_it_needs():
+
+    d_loaded = loaded_after('from openai_helper import num_of_tokens')
+    assert not any(d_loaded.values()), d_loaded
+
+    d_loaded = loaded_after('from openai_helper import InputTokenCounter')
+    assert d_loaded['tiktoken']
+    assert not d_loaded['openai']
+
+    d_loaded = loaded_after('from openai_helper.dmo import OutputExtractorChat')
+    assert not d_loaded['openai']
+    assert not d_loaded['tiktoken']
+
+    d_loaded = loaded_after('from openai_helper import OpenAIChatCompletion')
+    assert d_loaded['openai']
+
+
+def main():
+    test_import_is_lazy()
+    test_first_use_loads_only_what_it_needs()
+
+
+if __name__ == '__main__':
+    main()
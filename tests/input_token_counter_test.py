@@ -2,7 +2,15 @@
 # -*- coding: UTF-8 -*-
 
 
+import os
+import tempfile
+
+import pytest
+from tiktoken import get_encoding
+from tiktoken.load import read_file_cached
+
 from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo.input_token_counter import LOCAL_ENCODINGS
 
 
 def test_service():
@@ -13,8 +21,138 @@ def test_service():
     print (counter('the quick brown fox jumps over the lazy dog'))
 
 
+def test_linear():
+
+    counter = InputTokenCounter()
+
+    message = 'the quick brown fox jumps over the lazy dog'
+    single = counter.process([message])
+
+    # each message adds its own tokens once; the reply priming is added once
+    assert counter.process([message] * 10) == (single - 3) * 10 + 3
+
+
+def test_process_many():
+
+    counter = InputTokenCounter()
+
+    conversations = [
+        ['Who won the world series in 2020?', 'The Los Angeles Dodgers.', 'Where was it played?'],
+        'the quick brown fox jumps over the lazy dog',
+        [],
+    ]
+
+    assert counter.process_many(conversations) == [
+        counter.process(x) for x in conversations]
+
+
+def test_unknown_model():
+
+    encoding = InputTokenCounter().encoding('not-an-openai-model')
+    assert encoding.name == 'cl100k_base'
+
+
+def test_warmup():
+
+    encoding_names = InputTokenCounter().warmup(['gpt-3.5-turbo', 'gpt-4', 'text-davinci-003'])
+    assert encoding_names == ['cl100k_base', 'p50k_base']
+
+
+def test_special_tokens():
+
+    counter = InputTokenCounter()
+    input_text = 'the end <|endoftext|>'
+
+    # special-token strings are plain text in every counting path
+    assert counter.encoded_length(input_text) == \
+        len(counter.encoding('gpt-3.5-turbo').encode_ordinary(input_text))
+    assert counter.process(input_text) == counter.process_many([input_text])[0]
+
+
+def test_encoding_dir():
+
+    url = 'https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken'
+    environ = dict(os.environ)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = InputTokenCounter(encoding_dir=tmp)
+
+        # a missing file is an error, not a silent download
+        with pytest.raises(FileNotFoundError):
+            counter._load('cl100k_base')
+
+        with open(os.path.join(tmp, 'cl100k_base.tiktoken'), 'wb') as f:
+            f.write(read_file_cached(url))
+
+        encoding = counter._load('cl100k_base')
+        expected = get_encoding('cl100k_base')
+
+        assert encoding.name == 'cl100k_base'
+        assert encoding.special_tokens_set == expected.special_tokens_set
+        assert encoding.encode('the quick brown fox <|endoftext|>', allowed_special='all') == \
+            expected.encode('the quick brown fox <|endoftext|>', allowed_special='all')
+
+    assert dict(os.environ) == environ
+
+
+def test_local_encodings():
+    """ every locally built encoding matches the one tiktoken builds itself """
+    text = "Hello, World! \U0001F642 def f(x):\n    return x ** 2  # 12345 <|endoftext|> \u041f\u0440\u0438\u0432\u0435\u0442"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = InputTokenCounter(encoding_dir=tmp)
+
+        for encoding_name, d_encoding in LOCAL_ENCODINGS.items():
+            try:
+                data = read_file_cached(d_encoding['file'])
+            except OSError:  # offline, and not in the tiktoken cache
+                continue
+
+            with open(os.path.join(tmp, os.path.basename(d_encoding['file'])), 'wb') as f:
+                f.write(data)
+
+            encoding = counter._load(encoding_name)
+            expected = get_encoding(encoding_name)
+
+            assert encoding.n_vocab == expected.n_vocab
+            assert encoding.special_tokens_set == expected.special_tokens_set
+            assert encoding.encode(text, allowed_special='all') == expected.encode(text, allowed_special='all')
+
+
+def test_upper_bound():
+    counter = InputTokenCounter()
+
+    for text in ['Hello, World!',
+                 "def f(x):\n    return {'a': [x[i] ** 2 for i in range(len(x))]}\n",
+                 'https://example.com/api/v1/items?id=12345&sort=desc',
+                 '\U0001F642\U0001F680 \u041f\u0440\u0438\u0432\u0435\u0442 ' + ' ' * 64 + '0123456789' * 8]:
+        for model in ['gpt-3.5-turbo', 'gpt-4', 'text-davinci-003']:
+            assert counter.upper_bound([text, text], model) >= counter.process([text, text], model)
+
+
+def test_registry_encoding():
+    counter = InputTokenCounter()
+
+    assert counter.encoding('gpt-4o').name == 'o200k_base'
+    assert counter.encoding('gpt-4o-mini').name == 'o200k_base'
+    assert counter.encoding('gpt-4').name == 'cl100k_base'
+    assert counter.encoding('text-davinci-003').name == 'p50k_base'
+
+    text = 'Привет, мир! 你好，世界！'
+    assert counter.encoded_length(text, 'gpt-4o') == len(get_encoding('o200k_base').encode_ordinary(text))
+
+
 def main():
     test_service()
+    test_linear()
+    test_process_many()
+    test_unknown_model()
+    test_warmup()
+    test_special_tokens()
+    test_encoding_dir()
+    test_local_encodings()
+    test_upper_bound()
+    test_registry_encoding()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+from openai_helper.dmo import RetryPolicy
+from openai_helper.dmo import OpenAIConnector
+from openai_helper.dmo import MockOpenAIServer
+from openai_helper.svc.run_chat_completion import RunChatCompletion
+
+
+def test_chat_completion():
+
+    with MockOpenAIServer(reply='Hello from the mock') as server:
+        conn = OpenAIConnector(api_base=server.base_url).process()
+
+        d_result = RunChatCompletion(conn).process(
+            input_prompt='You are a helpful assistant.',
+            messages=['Hello?'])
+
+        assert d_result['attempts'] == 1
+        assert d_result['output']['choices'][0]['message']['content'] == 'Hello from the mock'
+        assert d_result['output']['usage']['completion_tokens'] == 4
+
+        response = conn.Completion.create(
+            model='text-davinci-003', prompt='Hello?', max_tokens=2)
+        assert response['choices'][0]['text'] == 'Hello from'
+        assert response['choices'][0]['finish_reason'] == 'length'
+
+
+def test_streaming():
+
+    with MockOpenAIServer(reply='one two three', tokens_per_second=100) as server:
+        conn = OpenAIConnector(api_base=server.base_url).process()
+
+        deltas = [x['choices'][0]['delta'].get('content', '') for x in conn.ChatCompletion.create(
+            model='gpt-3.5-turbo',
+            messages=[{'role': 'user', 'content': 'count'}],
+            stream=True)]
+
+        assert deltas == ['', 'one', ' two', ' three', '']
+        assert server.stats()['streams'] == 1
+
+
+def test_injected_errors():
+
+    with MockOpenAIServer(rate_429=1.0, retry_after=0.01) as server:
+        conn = OpenAIConnector(api_base=server.base_url).process()
+
+        d_result = RunChatCompletion(conn, retry_policy=RetryPolicy(
+            max_attempts=3, base_delay=0.01)).process(
+            input_prompt='You are a helpful assistant.',
+            messages=['Hello?'])
+
+        assert d_result['output'] is None
+        assert d_result['attempts'] == 3
+        assert server.stats()['status_429'] == 3
+
+
+def main():
+    test_chat_completion()
+    test_streaming()
+    test_injected_errors()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import pytest
+
+from openai.error import InvalidRequestError
+
+from openai_helper.dmo import ModelRegistry
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import SyntheticConnection
+from openai_helper.svc.run_text_completion import RunTextCompletion
+from openai_helper.svc.run_chat_completion import RunChatCompletion
+
+
+def test_lookup():
+    registry = ModelRegistry(models={})
+
+    assert registry.process('gpt-4-0613')['context_window'] == 8192
+    assert registry.process('gpt-4-32k-0613')['context_window'] == 32768
+    assert registry.process('gpt-4o-mini')['model'] == 'gpt-4o-mini'
+    assert registry.process('ft:gpt-3.5-turbo-0613:acme::abc123')['model'] == 'gpt-3.5-turbo'
+    assert registry.process('davinci:ft-acme-2023-01-01')['model'] == 'davinci'
+    assert registry.process('text-davinci-003')['encoding'] == 'p50k_base'
+    assert registry.process('my-deployment') is None
+    assert registry.process(None) is None
+
+    registry = ModelRegistry(models={'my-deployment': {'context_window': 1000}})
+    assert registry.process('my-deployment')['context_window'] == 1000
+    assert registry.cost('my-deployment', 100, 100) is None
+
+
+def test_cost():
+    registry = ModelRegistry(models={})
+
+    assert registry.cost('gpt-4', 1000, 500) == pytest.approx(0.06)
+    assert registry.cost('my-deployment', 1000, 500) is None
+
+
+def test_budget():
+    registry = ModelRegistry(models={})
+
+    assert registry.budget('gpt-4', 1000, 500) == 500
+    assert registry.budget('gpt-4', 8000, 500) == 192
+    assert registry.budget('gpt-4', 8000) is None
+    assert registry.budget('gpt-4-turbo', 1000, 10000) == 4096
+    assert registry.budget('my-deployment', 100000, 500) == 500
+
+    with pytest.raises(InvalidRequestError):
+        registry.budget('gpt-4', 8192, 500)
+
+
+def test_text_completion():
+    conn = SyntheticConnection()
+    runner = RunTextCompletion(conn)
+
+    input_prompt = 'Hello? ' * 1500
+    prompt_tokens = len(InputTokenCounter().encoding(
+        'text-davinci-003').encode_ordinary(input_prompt))
+
+    d_result = runner.process(input_prompt=input_prompt,
+                              engine='text-davinci-003',
+                              max_tokens=2000)
+    assert d_result['input']['max_tokens'] == 4097 - prompt_tokens
+
+    d_result = runner.process(input_prompt='Hello?',
+                              engine='text-davinci-003',
+                              max_tokens=16)
+    assert d_result['input']['max_tokens'] == 16
+
+    with pytest.raises(InvalidRequestError):
+        runner.process(input_prompt='Hello? ' * 3000,
+                       engine='text-davinci-003')
+
+    assert conn.calls == 2
+
+
+def test_chat_completion():
+    conn = SyntheticConnection()
+    runner = RunChatCompletion(conn)
+
+    d_result = runner.process(input_prompt='You are a helpful assistant.',
+                              messages=['Hello?'],
+                              model='gpt-4',
+                              max_tokens=16)
+    assert len(d_result['output']['choices'][0]['message']['content'].split(' ')) == 16
+
+    with pytest.raises(InvalidRequestError):
+        runner.process(input_prompt='You are a helpful assistant.',
+                       messages=['Hello? ' * 5000],
+                       model='gpt-4')
+
+    assert conn.calls == 1
+
+
+def main():
+    test_lookup()
+    test_cost()
+    test_budget()
+    test_text_completion()
+    test_chat_completion()
+
+
+if __name__ == '__main__':
+    main()
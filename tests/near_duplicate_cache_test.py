@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import os
+import sys
+import subprocess
+from unittest import mock
+
+from openai_helper.dmo import NearDuplicateCache
+
+
+def test_near_duplicates():
+
+    cache = NearDuplicateCache(threshold=0.8)
+    cache.put('gpt-3.5-turbo', 'How do I reset my password on the mobile app?', 'Tap Settings.')
+
+    # punctuation and casing
+    assert cache.get('gpt-3.5-turbo', 'how do i reset my password on the mobile app') == 'Tap Settings.'
+
+    # a trailing word
+    assert cache.get('gpt-3.5-turbo', 'How do I reset my password on the mobile app today?') == 'Tap Settings.'
+
+    # a different question
+    assert cache.get('gpt-3.5-turbo', 'How do I change my email address?') is None
+
+    # a different namespace
+    assert cache.get('gpt-4', 'How do I reset my password on the mobile app?') is None
+
+    d_stats = cache.stats()
+    assert d_stats['hits'] == 2
+    assert d_stats['misses'] == 2
+
+
+def test_exact_verification():
+
+    cache = NearDuplicateCache(threshold=0.8)
+    cache.put('', 'Who won the world series in 2020?', 'The Dodgers.')
+
+    # a Jaccard similarity of ~0.73; a 32-permutation estimate alone would pass about 1 time in 4
+    assert cache.jaccard(cache.features('Who won the world series in 2020?'),
+                         cache.features('Who won the world series in 2021?')) < 0.8
+    assert cache.get('', 'Who won the world series in 2021?') is None
+
+
+def test_signature():
+
+    cache = NearDuplicateCache()
+
+    signature = cache.signature('Where was it played?')
+    assert len(signature) == 32
+    assert cache.similarity(signature, cache.signature('WHERE was it played')) == 1.0
+
+    # signatures do not depend on the (per-process) string hash seed
+    code = 'from openai_helper.dmo import NearDuplicateCache; ' \
+        'print(NearDuplicateCache().signature("Where was it played?").hex())'
+    for seed in ('1', '2'):
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env={**os.environ, 'PYTHONHASHSEED': seed}, text=True)
+        assert output.strip().splitlines()[-1] == signature.hex()
+
+
+def test_eviction():
+
+    cache = NearDuplicateCache(max_entries=2)
+    cache.put('', 'the first question', 1)
+    cache.put('', 'the second question', 2)
+    cache.put('', 'the third question', 3)
+
+    assert cache.get('', 'the first question') is None
+    assert cache.get('', 'the third question') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_expired_best_match():
+
+    cache = NearDuplicateCache(threshold=0.8, ttl=60)
+
+    with mock.patch('time.monotonic', return_value=0.0):
+        cache.put('', 'How do I reset my password on the mobile app?', 'stale')
+    with mock.patch('time.monotonic', return_value=50.0):
+        cache.put('', 'How do I reset my password on the mobile app today?', 'fresh')
+
+    # the exact (but expired) match is removed, and the fresh near duplicate is served
+    with mock.patch('time.monotonic', return_value=90.0):
+        assert cache.get('', 'How do I reset my password on the mobile app?') == 'fresh'
+    assert cache.stats()['entries'] == 1
+
+
+def test_replace():
+
+    cache = NearDuplicateCache()
+    cache.put('', 'the first question', 1)
+    cache.put('', 'the second question', 2)
+
+    # the same namespace and features replace the entry rather than adding one
+    cache.put('', 'The first question?', 10)
+    assert cache.get('', 'the first question') == 10
+    assert cache.stats()['entries'] == 2
+
+    # another namespace is a separate entry
+    cache.put('gpt-4', 'the first question', 4)
+    assert cache.get('gpt-4', 'the first question') == 4
+    assert cache.get('', 'the first question') == 10
+    assert cache.stats()['entries'] == 3
+
+
+def main():
+    test_near_duplicates()
+    test_exact_verification()
+    test_signature()
+    test_eviction()
+    test_expired_best_match()
+    test_replace()
+
+
+if __name__ == '__main__':
+    main()
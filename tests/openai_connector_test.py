@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 
+import asyncio
+
 from openai_helper.dmo import OpenAIConnector
 
 
@@ -10,8 +12,55 @@ def test_component():
     assert dmo
 
 
+def test_shared_sessions():
+
+    session = OpenAIConnector(pool_size=4).session()
+    assert session is OpenAIConnector().session()
+
+    async def aio_sessions() -> bool:
+        first = await OpenAIConnector().aio_session()
+        second = await OpenAIConnector().aio_session()
+        await OpenAIConnector.aclose()
+        return first is second
+
+    assert asyncio.run(aio_sessions())
+
+    OpenAIConnector.close()
+
+
+def test_sessions_per_loop():
+
+    sessions = OpenAIConnector._OpenAIConnector__aiosessions
+
+    async def aio_session():
+        return await OpenAIConnector().aio_session()
+
+    async def replaced() -> bool:
+        first = await aio_session()
+        await first.close()
+        second = await aio_session()
+        await OpenAIConnector.aclose()
+        return first is not second and second.closed
+
+    # a closed session is replaced on the same loop
+    assert asyncio.run(replaced())
+
+    # each loop gets its own session; the session of a closed loop is dropped
+    first = asyncio.run(aio_session())
+    second = asyncio.run(aio_session())
+    assert first is not second
+    assert list(sessions.values()) == [second]
+    assert first.closed
+
+    asyncio.run(OpenAIConnector.aclose())
+    assert second.closed
+    assert not sessions
+
+
 def main():
     test_component()
+    test_shared_sessions()
+    test_sessions_per_loop()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+from openai_helper.dmo import OutputExtractorStream
+
+
+def stream(output_text: str,
+           chunk_size: int) -> list:
+    extractor = OutputExtractorStream(input_text='Tell me something')
+
+    deltas = [
+        extractor.process(output_text[i:i + chunk_size])
+        for i in range(0, len(output_text), chunk_size)
+    ]
+    deltas.append(extractor.flush())
+
+    return [x for x in deltas if x]
+
+
+def test_prompt_indicator_across_chunks():
+
+    output_text = ' '.join([
+        'As an AI language model, I do not have opinions.',
+        ' '.join(['But this sentence is long enough to release text early.'] * 4)])
+
+    for chunk_size in [1, 3, 8]:
+        deltas = stream(output_text, chunk_size)
+
+        # cleaned text is released before the stream ends
+        assert len(deltas) > 2
+        assert ''.join(deltas).startswith('I do not have opinions.')
+        assert 'language model' not in ''.join(deltas)
+
+
+def test_list_indicators_and_emojis():
+
+    output_text = '\n'.join([
+        'Here is a list :smile:',
+        '1. the first item',
+        '- the second item',
+    ])
+
+    for chunk_size in [1, 5]:
+        assert ''.join(stream(output_text, chunk_size)) == '\n'.join([
+            'Here is a list',
+            'the first item',
+            'the second item',
+        ])
+
+
+def main():
+    test_prompt_indicator_across_chunks()
+    test_list_indicators_and_emojis()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+
+from openai_helper.dmo import RateLimiter
+from openai_helper.dmo import BucketStoreMemory
+from openai_helper.dmo import BucketStoreSqlite
+
+
+def test_bucket_store():
+
+    for store in [BucketStoreMemory(),
+                  BucketStoreSqlite(os.path.join(tempfile.mkdtemp(), 'buckets.db'))]:
+
+        # a capacity of 60/min refills at 1/sec
+        assert store.process({'rpm': (60, 60)}) == 0.0
+
+        wait = store.process({'rpm': (60, 1), 'tpm': (6000, 10)})
+        assert 0.0 < wait <= 1.0
+
+        # nothing is taken from either bucket unless both can cover the call
+        assert store.process({'tpm': (6000, 6000)}) == 0.0
+
+
+def test_rate_limiter():
+
+    limiter = RateLimiter(
+        limits={
+            'gpt-3.5-turbo': {'rpm': 600, 'tpm': 60000},
+        },
+        store=BucketStoreMemory())
+
+    # unknown models are not throttled
+    assert limiter.process(model='text-davinci-003', tokens=10) == 0.0
+
+    for _ in range(600):
+        assert limiter.process(model='gpt-3.5-turbo-0301', tokens=1) == 0.0
+
+    # at 600 rpm the bucket refills one request every 100ms
+    start = time.monotonic()
+    limiter.process(model='gpt-3.5-turbo', tokens=1)
+    assert time.monotonic() - start >= 0.05
+
+
+def test_aprocess_does_not_block_the_loop():
+
+    file_path = os.path.join(tempfile.mkdtemp(), 'buckets.db')
+    limiter = RateLimiter(
+        limits={'default': {'rpm': 600}},
+        store=BucketStoreSqlite(file_path))
+
+    # another process holds the database write lock
+    blocker = sqlite3.connect(file_path, isolation_level=None)
+    blocker.execute('BEGIN IMMEDIATE')
+
+    async def run() -> int:
+        task = asyncio.ensure_future(limiter.aprocess(model='gpt-3.5-turbo', tokens=1))
+
+        ticks = 0
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not task.done()
+
+        blocker.execute('COMMIT')
+        assert await task == 0.0
+        return ticks
+
+    assert asyncio.run(run()) == 20
+
+
+def main():
+    test_bucket_store()
+    test_rate_limiter()
+    test_aprocess_does_not_block_the_loop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import os
+import time
+import tempfile
+
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import ResponseCacheSqlite
+
+
+def test_shared_across_instances():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, 'cache.db')
+
+        cache_1 = ResponseCacheSqlite(file_path)
+        cache_2 = ResponseCacheSqlite(file_path, refresh_interval=0)
+
+        key = cache_1.key(model='gpt-3.5-turbo', messages=['a'])
+        assert key == ResponseCache.key(model='gpt-3.5-turbo', messages=['a'])
+
+        # the bloom filter answers the miss without a disk read
+        assert cache_1.get(key) is None
+        assert cache_1.stats()['filtered'] == 1
+
+        cache_1.put(key, {'text': 'a' * 1000})
+        assert cache_1.get(key) == {'text': 'a' * 1000}
+
+        # another process picks up the key on its next filter refresh
+        assert cache_2.get(key) == {'text': 'a' * 1000}
+
+        # responses are stored compressed
+        assert cache_1.stats()['bytes'] < 1000
+
+
+def test_eviction_and_ttl():
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, 'cache.db')
+
+        cache = ResponseCacheSqlite(file_path, max_bytes=200)
+
+        keys = [cache.key(i=i) for i in range(20)]
+        for i, key in enumerate(keys):
+            cache.put(key, {'text': f'response {i}'})
+
+        d_stats = cache.stats()
+        assert d_stats['bytes'] <= 200
+        assert d_stats['evictions'] > 0
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[-1]) == {'text': 'response 19'}
+
+        cache = ResponseCacheSqlite(file_path)
+        cache.put(keys[0], {'text': 'expired'}, ttl=0.05)
+        entries = cache.stats()['entries']
+        time.sleep(0.1)
+
+        # an expired response found on read is deleted and counted
+        assert cache.get(keys[0]) is None
+        d_stats = cache.stats()
+        assert d_stats['expirations'] == 1
+        assert d_stats['entries'] == entries - 1
+
+
+def main():
+    test_shared_across_instances()
+    test_eviction_and_ttl()
+
+
+if __name__ == '__main__':
+    main()
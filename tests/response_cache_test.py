@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import time
+
+from openai_helper.dmo import ResponseCache
+from openai_helper.svc import RunChatCompletion
+
+
+def test_lru_and_counters():
+
+    cache = ResponseCache(max_entries=2)
+
+    key_1 = cache.key(model='gpt-3.5-turbo', messages=['a'])
+    key_2 = cache.key(model='gpt-3.5-turbo', messages=['b'])
+    key_3 = cache.key(model='gpt-3.5-turbo', messages=['c'])
+
+    # the key covers every parameter and ignores argument order
+    assert key_1 == cache.key(messages=['a'], model='gpt-3.5-turbo')
+    assert key_1 != cache.key(model='gpt-4', messages=['a'])
+
+    assert cache.get(key_1) is None
+
+    cache.put(key_1, {'text': 'a'})
+    cache.put(key_2, {'text': 'b'})
+    assert cache.get(key_1) == {'text': 'a'}
+
+    # key_2 is now the least recently used entry
+    cache.put(key_3, {'text': 'c'})
+    assert cache.get(key_2) is None
+    assert cache.get(key_3) == {'text': 'c'}
+
+    d_stats = cache.stats()
+    assert d_stats['entries'] == 2
+    assert d_stats['hits'] == 2
+    assert d_stats['misses'] == 2
+    assert d_stats['evictions'] == 1
+    assert d_stats['bytes'] == len('{"text":"a"}') + len('{"text":"c"}')
+
+
+def test_bytes_and_ttl():
+
+    cache = ResponseCache(max_bytes=30, ttl=0.05)
+
+    cache.put('a', {'text': 'aaaaaaaaaa'})
+    cache.put('b', {'text': 'bbbbbbbbbb'})
+    assert cache.stats()['entries'] == 1
+    assert cache.get('b')
+
+    # a cached response cannot be mutated by the caller
+    cache.get('b')['text'] = 'changed'
+    assert cache.get('b') == {'text': 'bbbbbbbbbb'}
+
+    time.sleep(0.1)
+    assert cache.get('b') is None
+    assert cache.stats()['expirations'] == 1
+
+
+class ChatCompletion:
+    calls = 0
+
+    @classmethod
+    def create(cls, model: str, messages: list) -> dict:
+        cls.calls += 1
+        return {'choices': [{'message': {'role': 'assistant', 'content': 'Arlington'}}]}
+
+
+class Connection:
+    ChatCompletion = ChatCompletion
+
+
+def test_runner_cache_hit():
+
+    run = RunChatCompletion(Connection(), cache=ResponseCache()).process
+
+    d_first = run(input_prompt='You are a helpful assistant.',
+                  messages=['Where was it played?'])
+    d_second = run(input_prompt='You are a helpful assistant.',
+                   messages=['Where was it played?'])
+
+    assert ChatCompletion.calls == 1
+    assert d_first['attempts'] == 1
+    assert d_second['attempts'] == 0
+    assert d_second['output'] == d_first['output']
+
+
+def main():
+    test_lru_and_counters()
+    test_bytes_and_ttl()
+    test_runner_cache_hit()
+
+
+if __name__ == '__main__':
+    main()
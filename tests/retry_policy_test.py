@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import asyncio
+
+from openai.error import RateLimitError
+from openai.error import AuthenticationError
+
+from openai_helper.dmo import RetryPolicy
+
+
+class FlakyCall:
+
+    def __init__(self, failures: int, error: type = RateLimitError):
+        self._failures = failures
+        self._error = error
+
+    def __call__(self, value: str) -> str:
+        if self._failures:
+            self._failures -= 1
+            raise self._error('try again', headers={'retry-after-ms': '1'})
+        return value
+
+
+def test_retry():
+
+    policy = RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.01)
+
+    result, attempts = policy.process(FlakyCall(2), value='done')
+    assert result == 'done'
+    assert attempts == 3
+
+    try:
+        policy.process(FlakyCall(10), value='done')
+        assert False
+    except RateLimitError as e:
+        assert e.attempts == 4
+
+    try:
+        policy.process(FlakyCall(1, AuthenticationError), value='done')
+        assert False
+    except AuthenticationError as e:
+        assert e.attempts == 1
+
+
+def test_retry_async():
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+    async def call(value: str, flaky=FlakyCall(1)) -> str:
+        return flaky(value)
+
+    result, attempts = asyncio.run(policy.aprocess(call, value='done'))
+    assert result == 'done'
+    assert attempts == 2
+
+
+def test_retry_after():
+
+    error = RateLimitError('slow down', headers={'retry-after': '2'})
+    assert RetryPolicy._retry_after(error) == 2.0
+
+    error = RateLimitError('slow down', headers={'retry-after-ms': '250'})
+    assert RetryPolicy._retry_after(error) == 0.25
+
+    assert RetryPolicy._retry_after(RateLimitError('slow down')) is None
+
+
+def test_deadline():
+
+    policy = RetryPolicy(max_attempts=10, base_delay=0.001, deadline=0.5)
+
+    try:
+        policy.process(FlakyCall(1, RateLimitError), value='done')
+    except RateLimitError:
+        assert False
+
+    error = RateLimitError('slow down', headers={'retry-after': '5'})
+    try:
+        policy.process(lambda: (_ for _ in ()).throw(error))
+        assert False
+    except RateLimitError as e:
+        assert e.attempts == 1
+
+
+def main():
+    test_retry()
+    test_retry_async()
+    test_retry_after()
+    test_deadline()
+
+
+if __name__ == '__main__':
+    main()
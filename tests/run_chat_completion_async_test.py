@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import asyncio
+
+from openai.error import RateLimitError
+
+from openai_helper.dmo import RetryPolicy
+from openai_helper.svc import RunChatCompletionAsync
+
+
+class ChatCompletion:
+
+    failures = 0
+
+    @classmethod
+    async def acreate(cls, model: str, messages: list, stream: bool = False) -> dict:
+        if cls.failures:
+            cls.failures -= 1
+            raise RateLimitError('try again', headers={'retry-after-ms': '1'})
+
+        if stream:
+            async def chunks():
+                for x in messages[-1]['content'].split():
+                    yield {'choices': [{'index': 0, 'delta': {'content': x}}]}
+            return chunks()
+
+        return {
+            'choices': [{
+                'message': {
+                    'role': 'assistant',
+                    'content': messages[-1]['content']
+                }
+            }]
+        }
+
+
+class Connection:
+    ChatCompletion = ChatCompletion
+
+
+class CountingLimiter:
+
+    def __init__(self):
+        self.charges = 0
+
+    async def aprocess(self, model: str, tokens: int) -> None:
+        self.charges += 1
+
+
+def test_service():
+
+    run = RunChatCompletionAsync(Connection()).process
+    assert run
+
+    d_result = asyncio.run(run(
+        input_prompt='You are a helpful assistant.',
+        messages=['Where was it played?']))
+
+    assert d_result['input'][-1]['content'] == 'Where was it played?'
+    assert d_result['output']['choices'][0]['message']['content'] == 'Where was it played?'
+
+
+def test_stream_charges_every_attempt():
+
+    limiter = CountingLimiter()
+    run = RunChatCompletionAsync(
+        Connection(),
+        retry_policy=RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.01),
+        rate_limiter=limiter)
+
+    async def stream() -> list:
+        return [x async for x in run.stream(
+            input_prompt='You are a helpful assistant.',
+            messages=['Where was it played?'])]
+
+    ChatCompletion.failures = 2
+    assert asyncio.run(stream()) == ['Where', 'was', 'it', 'played?']
+    assert limiter.charges == 3
+
+
+def main():
+    test_service()
+    test_stream_charges_every_attempt()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+from openai.error import RateLimitError
+
+from openai_helper.dmo import RetryPolicy
+from openai_helper.svc import RunChatCompletion
+
+
+class ChatCompletion:
+
+    failures = 0
+
+    @classmethod
+    def create(cls, model: str, messages: list, stream: bool = False) -> dict:
+        if cls.failures:
+            cls.failures -= 1
+            raise RateLimitError('try again', headers={'retry-after-ms': '1'})
+
+        content = messages[-1]['content']
+        if stream:
+            return iter([{'choices': [{'index': 0, 'delta': {'content': x}}]} for x in content.split()])
+
+        return {
+            'choices': [{
+                'message': {
+                    'role': 'assistant',
+                    'content': content
+                }
+            }]
+        }
+
+
+class Connection:
+    ChatCompletion = ChatCompletion
+
+
+class CountingLimiter:
+
+    def __init__(self):
+        self.charges = 0
+
+    def process(self, model: str, tokens: int) -> None:
+        self.charges += 1
+
+
+def test_service():
+
+    d_result = RunChatCompletion(Connection()).process(
+        input_prompt='You are a helpful assistant.',
+        messages=['Where was it played?'])
+
+    assert d_result['output']['choices'][0]['message']['content'] == 'Where was it played?'
+
+
+def test_stream_charges_every_attempt():
+
+    limiter = CountingLimiter()
+    run = RunChatCompletion(
+        Connection(),
+        retry_policy=RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.01),
+        rate_limiter=limiter)
+
+    ChatCompletion.failures = 2
+    deltas = list(run.stream(
+        input_prompt='You are a helpful assistant.',
+        messages=['Where was it played?']))
+
+    assert deltas == ['Where', 'was', 'it', 'played?']
+    assert limiter.charges == 3
+
+
+def main():
+    test_service()
+    test_stream_charges_every_attempt()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import os
+import asyncio
+
+from openai_helper.dmo import SyntheticConnection
+from openai_helper.dmo import OutputExtractorChat
+from openai_helper.bp import OpenAIChatCompletion
+from openai_helper.svc import RunChatCompletionAsync
+
+
+def test_chat_completion():
+
+    os.environ['USE_OPENAI'] = 'true'
+    try:
+        conn = SyntheticConnection(reply='The Dodgers won in 2020.')
+
+        d_result = OpenAIChatCompletion(conn=conn).run(
+            input_prompt='You are a helpful assistant.',
+            messages=['Who won the world series in 2020?'])
+
+        assert d_result['attempts'] == 1
+        assert conn.calls == 1
+
+        output_text = OutputExtractorChat().process(
+            input_text='Who won the world series in 2020?',
+            d_result=d_result)
+        assert output_text == 'The Dodgers won in 2020.'
+
+    finally:
+        del os.environ['USE_OPENAI']
+
+
+def test_size_and_stream():
+
+    conn = SyntheticConnection(completion_tokens=100, choices=3)
+
+    response = conn.Completion.create(engine='text-davinci-003', prompt='hi', max_tokens=10)
+    assert len(response['choices']) == 3
+    assert len(response['choices'][0]['text'].split()) == 10
+
+    chunks = list(conn.ChatCompletion.create(
+        model='gpt-3.5-turbo', messages=[], stream=True, max_tokens=5))
+    assert ''.join(x['choices'][0]['delta']['content'] for x in chunks) == 'the quick brown fox jumps'
+
+
+def test_async():
+
+    run = RunChatCompletionAsync(SyntheticConnection(reply='pong')).process
+
+    d_result = asyncio.run(run(
+        input_prompt='You are a helpful assistant.',
+        messages=['ping']))
+
+    assert d_result['output']['choices'][0]['message']['content'] == 'pong'
+
+
+def main():
+    test_chat_completion()
+    test_size_and_stream()
+    test_async()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import pytest
+
+from openai.error import InvalidRequestError
+
+from openai_helper.dmo import ResponseCache
+from openai_helper.dmo import InputTokenCounter
+from openai_helper.dmo import TextRequestBuilder
+
+
+def test_request():
+
+    builder = TextRequestBuilder()
+
+    d_request = builder.process(
+        input_prompt='Write a tagline for an ice cream shop.',
+        engine='text-davinci-003',
+        max_tokens=64)
+
+    d_event = d_request['event']
+    assert d_event['max_tokens'] == 64
+
+    d_kwargs = builder.kwargs(d_request)
+    assert d_kwargs['engine'] == 'text-davinci-003'
+    assert d_kwargs['prompt'] == 'Write a tagline for an ice cream shop.'
+    assert 'timeout' not in d_kwargs
+
+    assert builder.cache_key(ResponseCache(), d_request) == ResponseCache.key(**{
+        k: v for k, v in d_event.items() if k != 'timeout'})
+    assert builder.tokens(d_request) == d_request['prompt_tokens'] + 64
+
+
+def test_budget():
+
+    builder = TextRequestBuilder()
+
+    d_request = builder.process(
+        input_prompt='Hello?',
+        engine='text-davinci-003',
+        max_tokens=10000)
+    assert d_request['event']['max_tokens'] < 4097
+
+    with pytest.raises(InvalidRequestError):
+        builder.process(
+            input_prompt='Hello? ' * 5000,
+            engine='text-davinci-003')
+
+
+def test_budget_code():
+    """ code is far denser in tokens than prose; a token estimate would let this through untrimmed """
+
+    builder = TextRequestBuilder()
+    code = "def f(x):\n    return {'a': [x[i] ** 2 for i in range(len(x))]}\n"
+
+    d_request = builder.process(
+        input_prompt=code * 110,
+        engine='text-davinci-003',
+        max_tokens=1000)
+
+    prompt_tokens = InputTokenCounter().encoded_length(code * 110, model='text-davinci-003')
+    assert d_request['prompt_tokens'] == prompt_tokens
+    assert prompt_tokens + d_request['event']['max_tokens'] <= 4097
+
+
+def main():
+    test_request()
+    test_budget()
+    test_budget_code()
+
+
+if __name__ == '__main__':
+    main()
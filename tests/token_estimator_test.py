@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+
+import base64
+
+from openai_helper import num_of_tokens
+from openai_helper.dmo import TokenEstimator
+from openai_helper.dmo import InputTokenCounter
+
+INPUT_TEXT = ' '.join([
+    'The Los Angeles Dodgers won the World Series in 2020.',
+    'The series was played at Globe Life Field in Arlington, Texas,',
+    'the first World Series played at a neutral site since 1944.'])
+
+
+def test_features():
+
+    assert TokenEstimator.features('aB 1, é中🙂') == (1, 1, 2, 1, 1, 1, 1, 1, 1)
+    assert TokenEstimator.estimate('') == 0.0
+
+
+def test_estimate():
+
+    d_estimate = TokenEstimator().process([INPUT_TEXT], model='gpt-3.5-turbo')
+    assert d_estimate['encoding'] == 'cl100k_base'
+    assert d_estimate['error'] > 0
+
+    exact = InputTokenCounter().process([INPUT_TEXT], model='gpt-3.5-turbo')
+    assert abs(d_estimate['tokens'] - exact) <= d_estimate['error']
+
+    assert TokenEstimator().process(INPUT_TEXT, model='text-davinci-003')['encoding'] == 'p50k_base'
+
+
+def test_estimate_non_prose():
+    """ text unlike prose must still fall within the reported error """
+    samples = {
+        'emoji': '🙂👍🎉 great job team 🚀🔥 ' * 40,
+        'base64': base64.b64encode(bytes(range(256)) * 8).decode(),
+        'code': ''.join([
+            'def fib(n: int) -> int:\n',
+            '    if n < 2:\n',
+            '        return n\n',
+            '    return fib(n - 1) + fib(n - 2)\n\n',
+            'print({k: fib(k) for k in range(10)})\n']) * 20,
+        'urls': ' '.join(f'https://example.org/search?q=token+{i}&page={i * 7}#r{i}' for i in range(60)),
+        'digits': ''.join(str(i * 7919 % 100000) for i in range(400)),
+        'russian': 'Съешь же ещё этих мягких французских булок, да выпей чаю. ' * 20,
+        'whitespace': ('x' + ' ' * 60 + '\n' + '\t' * 6) * 12,
+    }
+
+    counter = InputTokenCounter()
+    estimator = TokenEstimator()
+
+    for model in ['gpt-3.5-turbo', 'text-davinci-003']:
+        for name, text in samples.items():
+            d_estimate = estimator.process([text], model=model)
+            exact = counter.process([text], model=model)
+            assert abs(d_estimate['tokens'] - exact) <= d_estimate['error'], (model, name, d_estimate, exact)
+
+
+def test_num_of_tokens():
+
+    assert num_of_tokens(INPUT_TEXT, mode='approx') == TokenEstimator().process(INPUT_TEXT)['tokens']
+
+    try:
+        num_of_tokens(INPUT_TEXT, mode='fast')
+        assert False
+    except ValueError:
+        pass
+
+
+def main():
+    test_features()
+    test_estimate()
+    test_estimate_non_prose()
+    test_num_of_tokens()
+
+
+if __name__ == '__main__':
+    main()